@@ -10,7 +10,10 @@ from typing import List
 
 from backend.shared.database import get_db
 from backend.shared.models import User
-from backend.admin_backend.services.admin_driver_service import AdminDriverService
+from backend.shared.serialization import fast_json
+from backend.admin_backend.services.admin_driver_service import (
+    AdminDriverService, DRIVER_PROJECTION
+)
 from backend.admin_backend.schemas.admin_driver_schema import DriverResponse, DriverStatusUpdate
 from backend.admin_backend.dependencies import get_current_admin
 
@@ -60,7 +63,8 @@ class AdminDriverController:
         db: Session = Depends(get_db)
     ):
         """Get all drivers"""
-        return self.admin_driver_service.get_all_drivers(db)
+        drivers = self.admin_driver_service.get_all_drivers(db)
+        return fast_json([DRIVER_PROJECTION(d) for d in drivers])
 
     async def get_driver(
         self,
@@ -0,0 +1,128 @@
+# ================================================================
+# FILE: admin_backend/controllers/admin_job_controller.py
+# ================================================================
+"""
+Admin Background Job Controller
+Submit heavy work (exports, bulk pricing) and poll it: POST returns 202 with
+the QUEUED job, GET /admin/jobs/{job_id} shows its status and result.
+"""
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+
+from backend.shared.database import get_db
+from backend.shared.models import JobStatus, User
+from backend.shared.serialization import fast_json
+from backend.admin_backend.services.admin_job_service import (
+    AdminJobService, JOB_PROJECTION, JOB_LIST_PROJECTION, JOB_LIST_LIMIT
+)
+from backend.admin_backend.schemas.admin_job_schema import (
+    JobSubmitRequest, JobResponse, JobSummaryResponse, JobTypeResponse
+)
+from backend.admin_backend.dependencies import get_current_admin
+
+
+class AdminJobController:
+    def __init__(self, admin_job_service: AdminJobService):
+        self.router = APIRouter(prefix="/admin/jobs", tags=["Admin Background Jobs"])
+        self.admin_job_service = admin_job_service
+        self._register_routes()
+
+    def _register_routes(self):
+        """Register background job routes"""
+        self.router.add_api_route(
+            "/types",
+            self.get_job_types,
+            methods=["GET"],
+            response_model=List[JobTypeResponse]
+        )
+        self.router.add_api_route(
+            "",
+            self.submit_job,
+            methods=["POST"],
+            response_model=JobResponse,
+            status_code=status.HTTP_202_ACCEPTED
+        )
+        self.router.add_api_route(
+            "",
+            self.get_jobs,
+            methods=["GET"],
+            response_model=List[JobSummaryResponse]
+        )
+        self.router.add_api_route(
+            "/{job_id}",
+            self.get_job,
+            methods=["GET"],
+            response_model=JobResponse
+        )
+        self.router.add_api_route(
+            "/{job_id}/cancel",
+            self.cancel_job,
+            methods=["POST"],
+            response_model=JobResponse
+        )
+        self.router.add_api_route(
+            "/{job_id}/download",
+            self.download_job_file,
+            methods=["GET"],
+            response_class=FileResponse
+        )
+
+    async def get_job_types(self, current_admin: User = Depends(get_current_admin)):
+        """List job types and their params"""
+        return self.admin_job_service.get_job_types()
+
+    async def submit_job(
+        self,
+        request: JobSubmitRequest,
+        current_admin: User = Depends(get_current_admin),
+        db: Session = Depends(get_db)
+    ):
+        """Queue a background job"""
+        # Enqueueing talks to the broker (and runs the job itself in JOBS_EAGER mode): keep it off the loop
+        job = await run_in_threadpool(
+            self.admin_job_service.submit_job, request.job_type, request.params, current_admin.id, db
+        )
+        return fast_json(JOB_PROJECTION(job), status_code=status.HTTP_202_ACCEPTED)
+
+    def get_jobs(
+        self,
+        job_status: Optional[JobStatus] = Query(None, alias="status"),
+        job_type: Optional[str] = None,
+        limit: int = Query(JOB_LIST_LIMIT, ge=1, le=JOB_LIST_LIMIT),
+        current_admin: User = Depends(get_current_admin),
+        db: Session = Depends(get_db)
+    ):
+        """Get recent jobs (without results: get the job for its result)"""
+        jobs = self.admin_job_service.get_jobs(db, job_status, job_type, limit)
+        return fast_json([JOB_LIST_PROJECTION(j) for j in jobs])
+
+    def get_job(
+        self,
+        job_id: int,
+        current_admin: User = Depends(get_current_admin),
+        db: Session = Depends(get_db)
+    ):
+        """Get job status and result"""
+        return fast_json(JOB_PROJECTION(self.admin_job_service.get_job_by_id(job_id, db)))
+
+    def cancel_job(
+        self,
+        job_id: int,
+        current_admin: User = Depends(get_current_admin),
+        db: Session = Depends(get_db)
+    ):
+        """Cancel a queued job"""
+        return fast_json(JOB_PROJECTION(self.admin_job_service.cancel_job(job_id, db)))
+
+    def download_job_file(
+        self,
+        job_id: int,
+        current_admin: User = Depends(get_current_admin),
+        db: Session = Depends(get_db)
+    ):
+        """Download an export job's file"""
+        path = self.admin_job_service.get_job_file(job_id, db)
+        return FileResponse(path, filename=path.name)
@@ -0,0 +1,52 @@
+# ================================================================
+# FILE: admin_backend/controllers/admin_profile_controller.py
+# ================================================================
+"""
+Admin Request Profile Controller
+"""
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.models import User
+from backend.admin_backend.services.admin_profile_service import AdminProfileService
+from backend.admin_backend.dependencies import get_current_admin
+
+
+class AdminProfileController:
+    def __init__(self, admin_profile_service: AdminProfileService):
+        self.router = APIRouter(prefix="/admin/profiles", tags=["Admin Profiling"])
+        self.admin_profile_service = admin_profile_service
+        self._register_routes()
+
+    def _register_routes(self):
+        """Register profile routes"""
+        self.router.add_api_route(
+            "",
+            self.list_profiles,
+            methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/{profile_id}",
+            self.get_profile,
+            methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/{profile_id}/collapsed",
+            self.get_collapsed_stacks,
+            methods=["GET"],
+            response_class=PlainTextResponse
+        )
+
+    async def list_profiles(self, current_admin: User = Depends(get_current_admin)):
+        """List captured request profiles"""
+        return await run_in_threadpool(self.admin_profile_service.list_profiles)
+
+    async def get_profile(self, profile_id: str, current_admin: User = Depends(get_current_admin)):
+        """Get one profile (X-Profile-Id of the profiled response)"""
+        return await run_in_threadpool(self.admin_profile_service.get_profile, profile_id)
+
+    async def get_collapsed_stacks(self, profile_id: str, current_admin: User = Depends(get_current_admin)):
+        """Get one profile as collapsed stacks for flame graph tools"""
+        stacks = await run_in_threadpool(self.admin_profile_service.get_collapsed_stacks, profile_id)
+        return PlainTextResponse(stacks)
@@ -11,7 +11,10 @@ from typing import List
 
 from backend.shared.database import get_db
 from backend.shared.models import User
-from backend.admin_backend.services.admin_shipment_service import AdminShipmentService
+from backend.shared.serialization import fast_json
+from backend.admin_backend.services.admin_shipment_service import (
+    AdminShipmentService, SHIPMENT_LIST_PROJECTION
+)
 from backend.admin_backend.schemas.admin_shipment_schema import (
     ShipmentListResponse, AssignDriverRequest, UpdateShipmentStatusRequest
 )
@@ -57,7 +60,8 @@ class AdminShipmentController:
         db: Session = Depends(get_db)
     ):
         """Get all shipments"""
-        return self.admin_shipment_service.get_all_shipments(db)
+        shipments = self.admin_shipment_service.get_all_shipments(db)
+        return fast_json([SHIPMENT_LIST_PROJECTION(s) for s in shipments])
 
     async def get_shipment(
         self,
@@ -5,26 +5,35 @@
 Admin Backend - Main Application
 Handles admin operations: shipment management, driver management, system oversight
 """
+import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from backend.shared.database import engine
-from backend.shared.models import Base
+from backend.shared.database import init_db
+from backend.shared.serialization import FastJSONResponse
+from backend.shared.db_instrumentation import install_db_instrumentation
+from backend.shared.metrics import install_metrics
+from backend.shared.health import install_health
+from backend.shared.profiling import install_profiling
+from backend.shared.loop_watchdog import install_loop_watchdog
 from backend.admin_backend.services.admin_auth_service import AdminAuthService
 from backend.admin_backend.services.admin_shipment_service import AdminShipmentService
 from backend.admin_backend.services.admin_driver_service import AdminDriverService
+from backend.admin_backend.services.admin_profile_service import AdminProfileService
+from backend.admin_backend.services.admin_job_service import AdminJobService
 from backend.admin_backend.controllers.admin_auth_controller import AdminAuthController
 from backend.admin_backend.controllers.admin_shipment_controller import AdminShipmentController
 from backend.admin_backend.controllers.admin_driver_controller import AdminDriverController
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
+from backend.admin_backend.controllers.admin_profile_controller import AdminProfileController
+from backend.admin_backend.controllers.admin_job_controller import AdminJobController
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Admin Backend API",
     version="1.0.0",
-    description="Admin portal for logistics system management"
+    description="Admin portal for logistics system management",
+    default_response_class=FastJSONResponse
 )
 
 # CORS Configuration
@@ -36,20 +45,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics + GET /metrics, then per-request DB stats (Server-Timing, slow-query log, N+1 guard)
+install_metrics(app, "admin")
+install_db_instrumentation(app)
+
+# GET /health/live, /health/ready (and /health)
+install_health(app, "admin_backend")
+
+# Opt-in request profiling (PROFILING_TOKEN / PROFILING_SAMPLE_RATE)
+install_profiling(app, "admin_backend")
+
+# Event-loop lag histogram + stall stacks (LOOP_STRICT_MODE: fail sync SQL on the loop)
+install_loop_watchdog(app)
+
 # Initialize services
 admin_auth_service = AdminAuthService()
 admin_shipment_service = AdminShipmentService()
 admin_driver_service = AdminDriverService()
+admin_profile_service = AdminProfileService()
+admin_job_service = AdminJobService()
 
 # Initialize controllers
 admin_auth_controller = AdminAuthController(admin_auth_service)
 admin_shipment_controller = AdminShipmentController(admin_shipment_service)
 admin_driver_controller = AdminDriverController(admin_driver_service)
+admin_profile_controller = AdminProfileController(admin_profile_service)
+admin_job_controller = AdminJobController(admin_job_service)
 
 # Register routers
 app.include_router(admin_auth_controller.router)
 app.include_router(admin_shipment_controller.router)
 app.include_router(admin_driver_controller.router)
+app.include_router(admin_profile_controller.router)
+app.include_router(admin_job_controller.router)
+
+
+@app.on_event("startup")
+async def create_schema():
+    """Create missing tables off the event loop (no-op after the first app in a process)"""
+    await run_in_threadpool(init_db)
 
 
 @app.get("/")
@@ -63,5 +97,5 @@ async def root():
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
\ No newline at end of file
+    from backend.shared.server import main
+    main(["admin", *sys.argv[1:]], app=app)
@@ -0,0 +1,37 @@
+# ================================================================
+# FILE: admin_backend/schemas/admin_job_schema.py
+# ================================================================
+"""
+Admin Background Job Schemas
+"""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class JobSubmitRequest(BaseModel):
+    job_type: str
+    params: Dict[str, Any] = {}
+
+
+class JobSummaryResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Dict[str, Any]
+    error: Optional[str]
+    attempts: int
+    submitted_by: Optional[int]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+class JobResponse(JobSummaryResponse):
+    result: Optional[Dict[str, Any]]
+
+
+class JobTypeResponse(BaseModel):
+    name: str
+    description: str
+    params_schema: Dict[str, Any]
@@ -9,19 +9,27 @@ from fastapi import HTTPException, status
 from typing import List
 
 from backend.shared.models import User, UserRole
+from backend.shared.serialization import projection, enum_value
+from backend.shared.read_models import DriverRow, fetch_rows
+
+# Row -> dict projection matching DriverResponse
+DRIVER_PROJECTION = projection(
+    "id", "email", "full_name", "phone", "is_active", "created_at",
+    role=enum_value
+)
 
 
 class AdminDriverService:
     def __init__(self):
         pass
 
-    def get_all_drivers(self, db: Session) -> List[User]:
-        """Get all drivers in the system"""
-        drivers = db.query(User).filter(
-            User.role == UserRole.DRIVER
-        ).order_by(User.created_at.desc()).all()
-        
-        return drivers
+    def get_all_drivers(self, db: Session) -> List[DriverRow]:
+        """Get all drivers in the system (read-only rows)"""
+        return fetch_rows(
+            db, DriverRow,
+            User.role == UserRole.DRIVER,
+            order_by=User.created_at.desc()
+        )
 
     def get_driver_by_id(self, driver_id: int, db: Session) -> User:
         """Get specific driver by ID"""
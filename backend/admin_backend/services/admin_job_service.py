@@ -0,0 +1,121 @@
+# ================================================================
+# FILE: admin_backend/services/admin_job_service.py
+# ================================================================
+"""
+Admin Background Job Service
+Submitting only stores and enqueues the job; it runs in a job worker
+(python -m backend.shared.jobs worker), never in the admin API process.
+"""
+import json
+from pathlib import Path
+from sqlalchemy.orm import Session, defer
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from typing import Dict, List, Optional
+
+from backend.shared.jobs import JOB_TYPES, JobError, cancel_job, export_path, submit_job
+from backend.shared.models import Job, JobStatus
+from backend.shared.serialization import projection, enum_value
+
+
+def _json_or_none(value: Optional[str]):
+    return json.loads(value) if value else None
+
+
+JOB_FIELDS = ("id", "job_type", "error", "attempts", "submitted_by", "created_at", "started_at", "finished_at")
+
+# Row -> dict projection matching JobResponse
+JOB_PROJECTION = projection(*JOB_FIELDS, status=enum_value, params=json.loads, result=_json_or_none)
+
+# List rows leave the result out (a bulk_pricing result can be megabytes): poll the job for it
+JOB_LIST_PROJECTION = projection(*JOB_FIELDS, status=enum_value, params=json.loads)
+
+JOB_LIST_LIMIT = 100
+
+
+class AdminJobService:
+    def __init__(self):
+        pass
+
+    def get_job_types(self) -> List[Dict]:
+        """Registered job types with the JSON schema of their params"""
+        return [
+            {"name": spec.name, "description": spec.description, "params_schema": spec.params.model_json_schema()}
+            for spec in JOB_TYPES.values()
+        ]
+
+    def submit_job(self, job_type: str, params: Dict, admin_id: int, db: Session) -> Job:
+        """Validate, store and enqueue a job"""
+        try:
+            return submit_job(db, job_type, params, submitted_by=admin_id)
+        except ValidationError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=json.loads(exc.json(include_url=False))
+            )
+        except JobError as exc:
+            unknown = job_type not in JOB_TYPES
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST if unknown else status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(exc)
+            )
+
+    def get_jobs(self, db: Session, job_status: Optional[JobStatus] = None,
+                 job_type: Optional[str] = None, limit: int = JOB_LIST_LIMIT) -> List[Job]:
+        """Newest jobs first, optionally by status and type"""
+        query = db.query(Job).options(defer(Job.result))
+        if job_status is not None:
+            query = query.filter(Job.status == job_status)
+        if job_type is not None:
+            query = query.filter(Job.job_type == job_type)
+        return query.order_by(Job.created_at.desc(), Job.id.desc()).limit(min(limit, JOB_LIST_LIMIT)).all()
+
+    def get_job_by_id(self, job_id: int, db: Session) -> Job:
+        """Get specific job by ID"""
+        job = db.get(Job, job_id)
+
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+
+        return job
+
+    def cancel_job(self, job_id: int, db: Session) -> Job:
+        """Cancel a job that has not started yet"""
+        job = self.get_job_by_id(job_id, db)
+
+        if not cancel_job(db, job_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job is already {job.status.value}"
+            )
+
+        db.refresh(job)
+        return job
+
+    def get_job_file(self, job_id: int, db: Session) -> Path:
+        """File produced by a finished export job, read from the shared JOBS_EXPORT_DIR"""
+        job = self.get_job_by_id(job_id, db)
+        name = (_json_or_none(job.result) or {}).get("file")
+
+        if job.status != JobStatus.SUCCEEDED or not name:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job has no downloadable file"
+            )
+
+        try:
+            path = export_path(name)
+        except JobError as exc:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+        if not path.is_file():
+            # The worker wrote it, so this process does not see the same JOBS_EXPORT_DIR
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Export file not found: JOBS_EXPORT_DIR must be a volume shared with the job workers"
+            )
+
+        return path
@@ -0,0 +1,38 @@
+# ================================================================
+# FILE: admin_backend/services/admin_profile_service.py
+# ================================================================
+"""
+Admin Request Profile Service
+Reads profiles captured by the profiling middleware of any backend
+(they share PROFILING_DIR).
+"""
+from fastapi import HTTPException, status
+from typing import Dict, List, Optional
+
+from backend.shared.profiling import ProfileStore
+
+
+class AdminProfileService:
+    def __init__(self, store: Optional[ProfileStore] = None):
+        self.store = store or ProfileStore()
+
+    def list_profiles(self) -> List[Dict]:
+        """Profile summaries, newest first"""
+        return self.store.list()
+
+    def get_profile(self, profile_id: str) -> Dict:
+        """Full profile: top functions and collapsed stacks"""
+        profile = self.store.get(profile_id)
+
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+
+        return profile
+
+    def get_collapsed_stacks(self, profile_id: str) -> str:
+        """Profile in collapsed-stack text format (flamegraph.pl / speedscope)"""
+        profile = self.get_profile(profile_id)
+        return "\n".join(f"{stack} {count}" for stack, count in profile["stacks"].items()) + "\n"
@@ -9,17 +9,27 @@ from fastapi import HTTPException, status
 from typing import List
 
 from backend.shared.models import Shipment, User, UserRole
+from backend.shared.outbox import record_shipment_status
 from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.serialization import projection, enum_value
+from backend.shared.read_models import AdminShipmentRow, fetch_rows
+
+# Row -> dict projection matching ShipmentListResponse
+SHIPMENT_LIST_PROJECTION = projection(
+    "id", "shipment_number", "customer_id", "driver_id", "pickup_location",
+    "delivery_location", "cargo_type", "weight", "estimated_delivery",
+    "actual_delivery", "total_price", "created_at",
+    status=enum_value
+)
 
 
 class AdminShipmentService:
     def __init__(self):
         pass
 
-    def get_all_shipments(self, db: Session) -> List[Shipment]:
-        """Get all shipments in the system"""
-        shipments = db.query(Shipment).order_by(Shipment.created_at.desc()).all()
-        return shipments
+    def get_all_shipments(self, db: Session) -> List[AdminShipmentRow]:
+        """Get all shipments in the system (read-only rows, selected columns only)"""
+        return fetch_rows(db, AdminShipmentRow, order_by=Shipment.created_at.desc())
 
     def get_shipment_by_id(self, shipment_id: int, db: Session) -> Shipment:
         """Get specific shipment by ID"""
@@ -62,6 +72,8 @@ class AdminShipmentService:
         # Update status if still pending
         if shipment.status == ShipmentStatus.PENDING:
             shipment.status = ShipmentStatus.PICKED_UP
+            # Same transaction as the state change
+            record_shipment_status(db, shipment)
 
         db.commit()
         db.refresh(shipment)
@@ -81,6 +93,7 @@ class AdminShipmentService:
                 detail=f"Invalid status. Valid options: {[s.value for s in ShipmentStatus]}"
             )
 
+        changed = shipment.status != status_enum
         shipment.status = status_enum
 
         # If marked as delivered, set actual delivery time
@@ -88,7 +101,10 @@ class AdminShipmentService:
             from datetime import datetime
             shipment.actual_delivery = datetime.utcnow()
 
+        if changed:
+            # Same transaction as the state change
+            record_shipment_status(db, shipment)
         db.commit()
         db.refresh(shipment)
 
-        return shipment
\ No newline at end of file
+        return shipment
@@ -0,0 +1,431 @@
+"""
+Base Agent - tool-calling runtime shared by the customer, driver and dispatch agents
+This file runs a conversation between a language model and the backend services, exposed to the model as typed tools.
+
+A tool is an agent method marked with @tool; its signature becomes a pydantic model, so the model sees a JSON schema and every call is validated.
+
+Tools that take a `db` argument get their own SessionLocal session and run in the threadpool, because the services are synchronous.
+
+All read-only calls the model asks for in one turn run concurrently; calls that change data run after them, one by one, in the order asked.
+
+Read-only results are memoized per Conversation, so asking the same thing twice in a chat never touches the database twice; any write clears the memo.
+
+run() streams events as they happen (text deltas, tool calls, tool results, done) and stops at the token, time or step budget.
+
+StubAgentModel is a deterministic offline model driven by per-agent regex rules, for tests and development without an API key.
+
+In simple words — this file lets an AI assistant use the same shipment, driver and pricing logic as the API, quickly and within limits.
+"""
+import asyncio
+import inspect
+import json
+import logging
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError, create_model
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.database import SessionLocal
+from backend.shared.metrics import counter, histogram, record_cache
+
+logger = logging.getLogger(__name__)
+
+AGENT_TOOL_SECONDS = histogram(
+    "agent_tool_seconds", "Agent tool call latency", ("agent", "tool"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+AGENT_RUNS = counter("agent_runs_total", "Agent turns by stop reason", ("agent", "reason"))
+
+
+# ==================== TOOLS ====================
+class Tool:
+    """A service call the model may make: name, description, validated arguments"""
+
+    def __init__(self, func: Callable, name: str, description: str, read_only: bool,
+                 summary: Optional[str] = None):
+        self.func = func
+        self.name = name
+        self.description = description
+        self.read_only = read_only
+        self.summary = summary  # str.format template the stub model uses to word the result
+
+        parameters = inspect.signature(func).parameters
+        self.needs_db = "db" in parameters
+        fields = {}
+        for param in list(parameters.values())[1:]:  # skip self
+            if param.name == "db":
+                continue
+            annotation = Any if param.annotation is inspect.Parameter.empty else param.annotation
+            default = ... if param.default is inspect.Parameter.empty else param.default
+            fields[param.name] = (annotation, default)
+        self.arguments: type[BaseModel] = create_model(f"{name}_arguments", **fields)
+
+    def schema(self) -> Dict:
+        """OpenAI function-tool definition"""
+        parameters = self.arguments.model_json_schema()
+        parameters.pop("title", None)
+        return {
+            "type": "function",
+            "function": {"name": self.name, "description": self.description, "parameters": parameters}
+        }
+
+
+def tool(description: str, read_only: bool = True, name: Optional[str] = None, summary: Optional[str] = None):
+    """Mark an agent method as a tool (read_only=False for anything that changes data)"""
+    def mark(func):
+        func._tool_spec = {"name": name or func.__name__, "description": description,
+                           "read_only": read_only, "summary": summary}
+        return func
+    return mark
+
+
+class ToolCall(NamedTuple):
+    id: str
+    name: str
+    arguments: Dict[str, Any]
+
+
+class Usage(NamedTuple):
+    """Token usage reported by a model at the end of its stream"""
+    prompt_tokens: int
+    completion_tokens: int
+
+
+# Yielded by AgentModel.stream: text deltas, tool calls, and at most one Usage
+ModelEvent = Union[str, ToolCall, Usage]
+
+
+class AgentBudget(NamedTuple):
+    max_tokens: int
+    max_seconds: float
+    max_steps: int  # model turns per user message
+
+    @classmethod
+    def default(cls) -> "AgentBudget":
+        return cls(settings.AGENT_MAX_TOKENS, settings.AGENT_MAX_SECONDS, settings.AGENT_MAX_STEPS)
+
+
+class Conversation:
+    """Messages (OpenAI chat format) plus the read-only tool memo and token spend"""
+
+    def __init__(self, system_prompt: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.messages: List[Dict[str, Any]] = []
+        if system_prompt:
+            self.messages.append({"role": "system", "content": system_prompt})
+        self.memo: Dict[Tuple[str, str], Any] = {}
+        self.tokens_used = 0
+
+
+def estimate_tokens(messages: Sequence[Dict[str, Any]]) -> int:
+    """~4 characters per token; used when a model reports no usage"""
+    return sum(len(str(message.get("content") or "")) + len(json.dumps(message.get("tool_calls") or ""))
+               for message in messages) // 4 + 1
+
+
+# ==================== MODELS ====================
+class AgentModel:
+    """Streams one assistant turn: text deltas and/or tool calls"""
+
+    name = "base"
+
+    def stream(self, messages: List[Dict[str, Any]], tools: List[Tool]) -> AsyncIterator[ModelEvent]:
+        raise NotImplementedError
+
+
+class OpenAIAgentModel(AgentModel):
+    """Chat Completions with function tools, streamed"""
+
+    name = "openai"
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or settings.AGENT_LLM_MODEL
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            if not settings.OPENAI_API_KEY:
+                raise HTTPException(status_code=503, detail="OPENAI_API_KEY is not configured")
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=1)
+        return self._client
+
+    async def stream(self, messages: List[Dict[str, Any]], tools: List[Tool]) -> AsyncIterator[ModelEvent]:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            tools=[t.schema() for t in tools] or None,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        pending: Dict[int, Dict[str, str]] = {}  # index -> id/name/arguments fragments
+        async for chunk in response:
+            if chunk.usage:
+                yield Usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                yield delta.content
+            for fragment in delta.tool_calls or []:
+                call = pending.setdefault(fragment.index, {"id": "", "name": "", "arguments": ""})
+                call["id"] = fragment.id or call["id"]
+                if fragment.function:
+                    call["name"] += fragment.function.name or ""
+                    call["arguments"] += fragment.function.arguments or ""
+        for call in pending.values():
+            try:
+                arguments = json.loads(call["arguments"] or "{}")
+            except json.JSONDecodeError:
+                arguments = {"_invalid": call["arguments"]}
+            yield ToolCall(call["id"], call["name"], arguments)
+
+
+# A stub rule: (pattern, tool name, match -> arguments)
+StubRule = Tuple[re.Pattern, str, Callable[[re.Match], Dict[str, Any]]]
+
+
+class StubAgentModel(AgentModel):
+    """
+    Deterministic offline model. For a user message it calls every tool whose
+    rule matches (several matches = one concurrent batch); after tool results
+    it answers from the tools' summary templates.
+    """
+
+    name = "stub"
+
+    def __init__(self, rules: Sequence[StubRule], chunk_words: int = 4):
+        self.rules = list(rules)
+        self.chunk_words = chunk_words
+
+    async def stream(self, messages: List[Dict[str, Any]], tools: List[Tool]) -> AsyncIterator[ModelEvent]:
+        last = messages[-1]
+        if last["role"] == "user":
+            calls = [
+                ToolCall(f"call_{index}", name, build(match))
+                for index, (pattern, name, build) in enumerate(self.rules)
+                for match in [pattern.search(last["content"])] if match
+            ]
+            if calls:
+                for call in calls:
+                    yield call
+                return
+            text = "I can help with: " + "; ".join(t.description for t in tools) + "."
+        else:
+            by_name = {t.name: t for t in tools}
+            results = []
+            for message in reversed(messages):
+                if message["role"] != "tool":
+                    names = {c["id"]: c["function"]["name"] for c in message.get("tool_calls") or []}
+                    break
+                results.append(message)
+            text = " ".join(
+                _summarize(by_name.get(names.get(m["tool_call_id"])), json.loads(m["content"]))
+                for m in reversed(results)
+            )
+
+        words = text.split(" ")
+        for start in range(0, len(words), self.chunk_words):
+            yield " ".join(words[start:start + self.chunk_words]) + (" " if start + self.chunk_words < len(words) else "")
+            await asyncio.sleep(0)
+        yield Usage(estimate_tokens(messages), len(text) // 4 + 1)
+
+
+def _summarize(spec: Optional[Tool], result: Any) -> str:
+    if isinstance(result, dict) and "error" in result:
+        return f"Sorry, {result['error'][0].lower() + result['error'][1:]}."
+    if spec and spec.summary and isinstance(result, dict):
+        try:
+            return spec.summary.format(**result)
+        except (KeyError, IndexError, ValueError):
+            pass
+    return json.dumps(result, default=str)
+
+
+# ==================== AGENT ====================
+class BaseAgent:
+    """Runs conversations against the tools defined on a subclass"""
+
+    name = "base"
+    system_prompt = "You are a helpful logistics assistant. Use the tools; never guess shipment data."
+    stub_rules: Sequence[StubRule] = ()
+
+    def __init__(self, model: Optional[AgentModel] = None, budget: Optional[AgentBudget] = None):
+        self.model = model or self._default_model()
+        self.budget = budget or AgentBudget.default()
+        self.tools: Dict[str, Tool] = {}
+        for attribute in dir(type(self)):
+            spec = getattr(getattr(type(self), attribute), "_tool_spec", None)
+            if spec:
+                self.tools[spec["name"]] = Tool(getattr(type(self), attribute), **spec)
+
+    def _default_model(self) -> AgentModel:
+        if settings.AGENT_MODEL_PROVIDER == "stub":
+            return StubAgentModel(self.stub_rules)
+        return OpenAIAgentModel()
+
+    def new_conversation(self) -> Conversation:
+        return Conversation(self.system_prompt)
+
+    async def ask(self, conversation: Conversation, text: str) -> Dict[str, Any]:
+        """run() collected: {"answer", "tool_calls", "reason", "tokens", "seconds"}"""
+        answer, calls, done = [], [], {}
+        async for event in self.run(conversation, text):
+            if event["type"] == "text":
+                answer.append(event["text"])
+            elif event["type"] == "tool_call":
+                calls.append(event)
+            elif event["type"] == "done":
+                done = event
+        return {"answer": "".join(answer), "tool_calls": calls, **{k: v for k, v in done.items() if k != "type"}}
+
+    async def run(self, conversation: Conversation, text: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream one user turn:
+        {"type": "text", "text"} | {"type": "tool_call", "name", "arguments", "cached"} |
+        {"type": "tool_result", "name", "result"} | {"type": "done", "reason", "tokens", "seconds"}
+        """
+        started = time.monotonic()
+        deadline = started + self.budget.max_seconds
+        conversation.messages.append({"role": "user", "content": text})
+        reason = "max_steps"
+        try:
+            for _ in range(self.budget.max_steps):
+                if conversation.tokens_used >= self.budget.max_tokens:
+                    reason = "token_budget"
+                    break
+                text_parts: List[str] = []
+                calls: List[ToolCall] = []
+                usage: Optional[Usage] = None
+                # The deadline covers each wait for the model, never the caller's time at a yield
+                stream = self.model.stream(conversation.messages, list(self.tools.values()))
+                try:
+                    while (event := await _next_event(stream, deadline)) is not None:
+                        if isinstance(event, Usage):
+                            usage = event
+                        elif isinstance(event, ToolCall):
+                            calls.append(event)
+                        else:
+                            text_parts.append(event)
+                            yield {"type": "text", "text": event}
+                finally:
+                    await stream.aclose()
+
+                reply: Dict[str, Any] = {"role": "assistant", "content": "".join(text_parts) or None}
+                if calls:
+                    reply["tool_calls"] = [
+                        {"id": c.id, "type": "function",
+                         "function": {"name": c.name, "arguments": json.dumps(c.arguments, default=str)}}
+                        for c in calls
+                    ]
+                conversation.messages.append(reply)
+                conversation.tokens_used += (
+                    usage.prompt_tokens + usage.completion_tokens if usage
+                    else estimate_tokens(conversation.messages)
+                )
+                if not calls:
+                    reason = "complete"
+                    break
+
+                for call in calls:
+                    yield {"type": "tool_call", "name": call.name, "arguments": call.arguments,
+                           "cached": self._memo_key(call) in conversation.memo}
+                async with asyncio.timeout_at(_loop_time(deadline)):
+                    results = await self._run_tools(conversation, calls)
+                for call, result in zip(calls, results):
+                    yield {"type": "tool_result", "name": call.name, "result": result}
+                    conversation.messages.append({
+                        "role": "tool", "tool_call_id": call.id,
+                        "content": json.dumps(result, default=str)
+                    })
+        except TimeoutError:
+            reason = "time_budget"
+        except HTTPException as exc:
+            yield {"type": "error", "detail": exc.detail}
+            reason = "error"
+        AGENT_RUNS.inc(self.name, reason)
+        yield {"type": "done", "reason": reason, "tokens": conversation.tokens_used,
+               "seconds": round(time.monotonic() - started, 3)}
+
+    # -------------------- TOOL EXECUTION --------------------
+    @staticmethod
+    def _memo_key(call: ToolCall) -> Tuple[str, str]:
+        return call.name, json.dumps(call.arguments, sort_keys=True, default=str)
+
+    async def _run_tools(self, conversation: Conversation, calls: List[ToolCall]) -> List[Any]:
+        """Read-only calls concurrently, then writes in order; results in call order"""
+        results: Dict[int, Any] = {}
+        reads = [i for i, c in enumerate(calls) if c.name in self.tools and self.tools[c.name].read_only]
+        read_results = await asyncio.gather(*(self._run_tool(conversation, calls[i]) for i in reads))
+        results.update(zip(reads, read_results))
+        for index, call in enumerate(calls):
+            if index not in results:
+                results[index] = await self._run_tool(conversation, call)
+        return [results[index] for index in range(len(calls))]
+
+    async def _run_tool(self, conversation: Conversation, call: ToolCall) -> Any:
+        spec = self.tools.get(call.name)
+        if spec is None:
+            return {"error": f"Unknown tool {call.name}"}
+        key = self._memo_key(call)
+        if spec.read_only:
+            cached = key in conversation.memo
+            record_cache("agent_tool", cached)
+            if cached:
+                return conversation.memo[key]
+        try:
+            arguments = spec.arguments.model_validate(call.arguments).model_dump()
+        except ValidationError as exc:
+            return {"error": f"Invalid arguments: {exc.errors(include_url=False)}"}
+
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(spec.func):
+                result = await spec.func(self, **arguments)
+            else:
+                result = await run_in_threadpool(self._call_sync, spec, arguments)
+        except HTTPException as exc:
+            return {"error": str(exc.detail)}  # Business rule said no: the model should explain it
+        except Exception:
+            logger.exception("Agent tool %s failed", call.name)
+            return {"error": f"{call.name} failed"}
+        finally:
+            AGENT_TOOL_SECONDS.observe(time.perf_counter() - started, self.name, call.name)
+
+        result = jsonable_encoder(result)  # Memo and messages hold plain JSON
+        if spec.read_only:
+            conversation.memo[key] = result
+        else:
+            conversation.memo.clear()  # Data changed: earlier reads may be stale
+        return result
+
+    def _call_sync(self, spec: Tool, arguments: Dict[str, Any]) -> Any:
+        if not spec.needs_db:
+            return spec.func(self, **arguments)
+        db = SessionLocal()  # Own session per call: concurrent tools must not share one
+        try:
+            return spec.func(self, db=db, **arguments)
+        finally:
+            db.close()
+
+
+async def _next_event(stream: AsyncIterator[ModelEvent], deadline: float) -> Optional[ModelEvent]:
+    """The model's next event, or None at the end of its turn; TimeoutError past the deadline"""
+    async with asyncio.timeout_at(_loop_time(deadline)):
+        try:
+            return await anext(stream)
+        except StopAsyncIteration:
+            return None
+
+
+def _loop_time(deadline: float) -> float:
+    """time.monotonic() deadline -> event loop clock"""
+    loop = asyncio.get_running_loop()
+    return loop.time() + (deadline - time.monotonic())
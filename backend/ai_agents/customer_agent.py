@@ -0,0 +1,116 @@
+"""
+Customer Agent - chat assistant for customers tracking and pricing their shipments
+This file gives a customer's chat assistant three tools: where is my order, list my shipments and quote a price.
+
+where_is_my_order() answers from the tracking snapshot cache, so repeated "where is it now?" turns cost no database work.
+
+Every tool is scoped to the customer the agent was created for; another customer's shipment number reads as not found.
+
+quote_price() runs the same PricingService the driver backend uses, without touching the database.
+
+In simple words — this file is the customer's helpdesk bot: it knows where their parcels are and what a new one would cost.
+"""
+import re
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from backend.ai_agents.base_agent import AgentBudget, AgentModel, BaseAgent, tool
+from backend.ai_agents.tracking_snapshots import get_snapshot_cache
+from backend.driver_backend.services.pricing_service import PricingService
+from backend.user_backend.services.shipment_service import ShipmentService
+
+_NUMBER = r"(?P<number>SHP[0-9A-F]{4,})"
+
+
+def _where_arguments(match: re.Match) -> Dict:
+    number = match.group("number")
+    return {"shipment_number": number.upper()} if number else {}
+
+
+def _quote_arguments(match: re.Match) -> Dict:
+    return {
+        "distance_km": float(match.group("distance")),
+        "weight_kg": float(match.group("weight")),
+        "is_express": bool(match.group("express"))
+    }
+
+
+class CustomerAgent(BaseAgent):
+    name = "customer"
+    system_prompt = (
+        "You help a logistics customer with their own shipments. Use where_is_my_order for any "
+        "tracking question and quote_price for prices. Be brief and never invent shipment data."
+    )
+    stub_rules = (
+        (re.compile(rf"\b(?:where|track|status)\b(?:.*?{_NUMBER})?", re.I), "where_is_my_order", _where_arguments),
+        (re.compile(r"\b(?:my (?:shipments|orders)|list)\b", re.I), "list_my_shipments", lambda m: {}),
+        (re.compile(r"(?P<distance>\d+(?:\.\d+)?)\s*km\b.*?(?P<weight>\d+(?:\.\d+)?)\s*kg\b(?P<express>.*\bexpress\b)?",
+                    re.I), "quote_price", _quote_arguments),
+    )
+
+    def __init__(self, customer_id: int, model: Optional[AgentModel] = None, budget: Optional[AgentBudget] = None):
+        super().__init__(model=model, budget=budget)
+        self.customer_id = customer_id
+        self.shipment_service = ShipmentService()
+        self.pricing_service = PricingService()
+
+    @tool(
+        "Current status, route, ETA and last known location of one of the customer's shipments "
+        "(the most recent active one when no shipment number is given)",
+        summary="Shipment {shipment_number} is {status}, going from {pickup_location} to {delivery_location}; "
+                "estimated delivery {estimated_delivery}. Last seen: {last_seen}."
+    )
+    def where_is_my_order(self, db: Session, shipment_number: Optional[str] = None) -> Dict:
+        cache = get_snapshot_cache()
+        if shipment_number:
+            snapshot = cache.get_by_number(db, shipment_number)
+        else:
+            active = cache.customer_shipment_ids(db, self.customer_id)
+            snapshot = cache.get(db, active[0]) if active else None
+        if snapshot is None or snapshot["customer_id"] != self.customer_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No matching active shipment found" if not shipment_number else "Shipment not found"
+            )
+        location = snapshot["last_location"]
+        snapshot["last_seen"] = (
+            f"{location['location_name'] or (location['latitude'], location['longitude'])} at {location['timestamp']}"
+            if location else "no location reported yet"
+        )
+        return snapshot
+
+    @tool(
+        "The customer's shipments, newest first (number, status, route)",
+        summary="You have {count} shipments: {listing}."
+    )
+    def list_my_shipments(self, db: Session) -> Dict:
+        rows = self.shipment_service.get_user_shipments(self.customer_id, db)
+        shipments: List[Dict] = [
+            {"shipment_number": row.shipment_number, "status": getattr(row.status, "value", row.status),
+             "delivery_location": row.delivery_location}
+            for row in rows
+        ]
+        listing = ", ".join(f"{s['shipment_number']} ({s['status']})" for s in shipments[:10]) or "none"
+        return {"count": len(shipments), "listing": listing, "shipments": shipments}
+
+    @tool(
+        "Price quote for a new shipment",
+        summary="That shipment would cost {total_price} INR."
+    )
+    def quote_price(
+        self,
+        distance_km: float,
+        weight_kg: float,
+        shipment_type: str = "domestic",
+        international_mode: Optional[str] = None,
+        is_express: bool = False
+    ) -> Dict:
+        return self.pricing_service.calculate_price(
+            distance_km=distance_km,
+            weight_kg=weight_kg,
+            shipment_type=shipment_type,
+            international_mode=international_mode,
+            is_express=is_express
+        )
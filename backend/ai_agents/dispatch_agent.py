@@ -0,0 +1,107 @@
+"""
+Dispatch Agent - assistant for operations staff matching shipments to drivers
+This file gives the dispatcher's assistant the admin services as tools: unassigned shipments, active drivers, driver workload, assignment and quotes.
+
+"Who should take the pending shipments?" makes the model ask for unassigned shipments and active drivers in the same turn; both run concurrently.
+
+driver_workload() reuses the driver dashboard numbers, so a dispatcher sees exactly what the driver sees.
+
+assign_driver() goes through AdminShipmentService, so the status event reaches the outbox in the same transaction as the assignment.
+
+In simple words — this file helps a dispatcher see who is free and hand out work, using the same rules as the admin panel.
+"""
+import re
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.admin_backend.services.admin_driver_service import AdminDriverService
+from backend.admin_backend.services.admin_shipment_service import AdminShipmentService
+from backend.ai_agents.base_agent import AgentBudget, AgentModel, BaseAgent, tool
+from backend.driver_backend.services.driver_service import DriverService
+from backend.driver_backend.services.pricing_service import PricingService
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.models import Shipment
+
+UNASSIGNED_LIMIT = 50
+
+
+class DispatchAgent(BaseAgent):
+    name = "dispatch"
+    system_prompt = (
+        "You assist a logistics dispatcher. Look up unassigned shipments, active drivers and their workload "
+        "before proposing assignments; only assign when the dispatcher asks you to."
+    )
+    stub_rules = (
+        (re.compile(r"\b(?:unassigned|pending|who should)\b", re.I), "unassigned_shipments", lambda m: {}),
+        (re.compile(r"\b(?:drivers|who should|available)\b", re.I), "active_drivers", lambda m: {}),
+        (re.compile(r"\bworkload\b.*?\bdriver\s*#?(?P<id>\d+)", re.I), "driver_workload",
+         lambda m: {"driver_id": int(m.group("id"))}),
+        (re.compile(r"\bassign\s+(?:shipment\s*)?#?(?P<shipment>\d+)\s+to\s+(?:driver\s*)?#?(?P<driver>\d+)", re.I),
+         "assign_driver", lambda m: {"shipment_id": int(m.group("shipment")), "driver_id": int(m.group("driver"))}),
+    )
+
+    def __init__(self, model: Optional[AgentModel] = None, budget: Optional[AgentBudget] = None):
+        super().__init__(model=model, budget=budget)
+        self.shipment_service = AdminShipmentService()
+        self.driver_service = AdminDriverService()
+        self.pricing_service = PricingService()
+
+    # -------------------- READS --------------------
+    @tool(
+        "Pending shipments without a driver, oldest first",
+        summary="{count} shipments are waiting for a driver: {listing}."
+    )
+    def unassigned_shipments(self, db: Session) -> Dict:
+        rows = db.query(
+            Shipment.id, Shipment.shipment_number, Shipment.pickup_location, Shipment.delivery_location,
+            Shipment.weight, Shipment.created_at
+        ).filter(
+            Shipment.driver_id.is_(None),
+            Shipment.status == ShipmentStatus.PENDING
+        ).order_by(Shipment.created_at).limit(UNASSIGNED_LIMIT).all()
+        shipments = [row._asdict() for row in rows]
+        listing = ", ".join(f"#{s['id']} {s['pickup_location']} -> {s['delivery_location']}" for s in shipments[:10])
+        return {"count": len(shipments), "listing": listing or "none", "shipments": shipments}
+
+    @tool(
+        "Active drivers (id, name, phone)",
+        summary="{count} drivers are active: {listing}."
+    )
+    def active_drivers(self, db: Session) -> Dict:
+        drivers = [
+            {"id": row.id, "full_name": row.full_name, "phone": row.phone}
+            for row in self.driver_service.get_all_drivers(db) if row.is_active
+        ]
+        listing = ", ".join(f"#{d['id']} {d['full_name']}" for d in drivers[:10])
+        return {"count": len(drivers), "listing": listing or "none", "drivers": drivers}
+
+    @tool(
+        "A driver's workload today: delivered, pending and failed counts, current shipment",
+        summary="That driver has {pending_shipments} pending and delivered {total_deliveries_today} today."
+    )
+    def driver_workload(self, db: Session, driver_id: int) -> Dict:
+        return DriverService(db).get_dashboard_data(driver_id)
+
+    @tool("Price quote for a shipment", summary="Quoted price: {total_price} INR.")
+    def quote_price(self, distance_km: float, weight_kg: float, shipment_type: str = "domestic",
+                    international_mode: Optional[str] = None, is_express: bool = False) -> Dict:
+        return self.pricing_service.calculate_price(
+            distance_km=distance_km, weight_kg=weight_kg, shipment_type=shipment_type,
+            international_mode=international_mode, is_express=is_express
+        )
+
+    # -------------------- WRITES --------------------
+    @tool(
+        "Assign a driver to a shipment",
+        read_only=False,
+        summary="Shipment {shipment_number} is now assigned to driver #{driver_id} ({status})."
+    )
+    def assign_driver(self, db: Session, shipment_id: int, driver_id: int) -> Dict:
+        shipment = self.shipment_service.assign_driver_to_shipment(shipment_id, driver_id, db)
+        return {
+            "shipment_id": shipment.id,
+            "shipment_number": shipment.shipment_number,
+            "driver_id": shipment.driver_id,
+            "status": shipment.status.value
+        }
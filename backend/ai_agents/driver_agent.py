@@ -0,0 +1,99 @@
+"""
+Driver Agent - chat assistant for drivers on the road
+This file gives a driver's assistant the driver backend's own service calls as tools: dashboard, assigned shipments, details and status updates.
+
+Reads (dashboard, shipments, details) are memoized for the conversation; pickups, deliveries and delays are writes and clear that memo.
+
+Every call goes through ShipmentService / DriverService with the agent's driver_id, so the usual access and status-transition rules apply.
+
+A rule the service rejects (wrong status, not your shipment) comes back to the model as an error it can explain to the driver.
+
+In simple words — this file lets a driver ask "what's next?" or say "delivered 12" in plain language and have it done by the normal backend rules.
+"""
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.ai_agents.base_agent import AgentBudget, AgentModel, BaseAgent, tool
+from backend.driver_backend.services.driver_service import DriverService
+from backend.driver_backend.services.shipment_service import ShipmentService
+from backend.driver_backend.utils.enums import DelayReason
+
+_ID = r"(?:shipment\s*)?#?(?P<id>\d+)"
+
+
+def _id_arguments(match: re.Match) -> Dict:
+    return {"shipment_id": int(match.group("id"))}
+
+
+def _delay_arguments(match: re.Match) -> Dict:
+    text = match.group(0).lower()
+    reason = next(
+        (reason for word, reason in (("traffic", DelayReason.TRAFFIC_JAM), ("break", DelayReason.VEHICLE_BREAKDOWN),
+                                     ("rain", DelayReason.WEATHER), ("weather", DelayReason.WEATHER),
+                                     ("accident", DelayReason.ACCIDENT), ("customs", DelayReason.CUSTOMS_DELAY))
+         if word in text),
+        DelayReason.OTHER
+    )
+    return {"shipment_id": int(match.group("id")), "reason": reason.value}
+
+
+class DriverAgent(BaseAgent):
+    name = "driver"
+    system_prompt = (
+        "You assist a delivery driver. Use the tools to read their shipments and to record pickups, "
+        "deliveries and delays. Only act on shipment ids the driver gives you. Answer in one or two sentences."
+    )
+    stub_rules = (
+        (re.compile(r"\b(?:dashboard|today|summary)\b", re.I), "dashboard", lambda m: {}),
+        (re.compile(r"\b(?:my shipments|what'?s next|assigned)\b", re.I), "my_shipments", lambda m: {}),
+        (re.compile(rf"\bdetails?\b.*?{_ID}", re.I), "shipment_details", _id_arguments),
+        (re.compile(rf"\bpicked up\b.*?{_ID}", re.I), "mark_picked_up", _id_arguments),
+        (re.compile(rf"\bdelivered\b.*?{_ID}", re.I), "mark_delivered", _id_arguments),
+        (re.compile(rf"\b(?:late|delay(?:ed)?|stuck)\b.*?{_ID}.*", re.I), "report_delay", _delay_arguments),
+    )
+
+    def __init__(self, driver_id: int, model: Optional[AgentModel] = None, budget: Optional[AgentBudget] = None):
+        super().__init__(model=model, budget=budget)
+        self.driver_id = driver_id
+
+    # -------------------- READS --------------------
+    @tool(
+        "Today's deliveries, pending / completed / failed counts and the current shipment",
+        summary="Today: {total_deliveries_today} delivered, {pending_shipments} pending, "
+                "{failed_shipments} failed."
+    )
+    def dashboard(self, db: Session) -> Dict:
+        return DriverService(db).get_dashboard_data(self.driver_id)
+
+    @tool(
+        "The driver's active shipments (id, number, route, status)",
+        summary="You have {count} active shipments: {listing}."
+    )
+    def my_shipments(self, db: Session) -> Dict:
+        shipments: List[Dict] = ShipmentService(db).get_assigned_shipments(self.driver_id)
+        listing = ", ".join(
+            f"#{s['id']} {s['shipment_number']} to {s['delivery_location']} ({s['status']})" for s in shipments[:10]
+        ) or "none"
+        return {"count": len(shipments), "listing": listing, "shipments": shipments}
+
+    @tool(
+        "Full details of one assigned shipment",
+        summary="Shipment {shipment_number}: {status}, deliver to {delivery_location}."
+    )
+    def shipment_details(self, db: Session, shipment_id: int) -> Dict:
+        return ShipmentService(db).get_shipment_details(shipment_id, self.driver_id)
+
+    # -------------------- WRITES --------------------
+    @tool("Record that the driver picked up a shipment", read_only=False, summary="{message}.")
+    def mark_picked_up(self, db: Session, shipment_id: int, notes: Optional[str] = None) -> Dict:
+        return ShipmentService(db).mark_picked_up(shipment_id, self.driver_id, notes)
+
+    @tool("Record that a shipment was delivered", read_only=False, summary="{message}.")
+    def mark_delivered(self, db: Session, shipment_id: int, notes: Optional[str] = None) -> Dict:
+        return ShipmentService(db).mark_delivered(shipment_id, self.driver_id, None, None, notes)
+
+    @tool("Report a delay on a shipment", read_only=False, summary="{message}.")
+    def report_delay(self, db: Session, shipment_id: int, reason: DelayReason, notes: Optional[str] = None) -> Dict:
+        return ShipmentService(db).report_delay(shipment_id, self.driver_id, reason.value, notes)
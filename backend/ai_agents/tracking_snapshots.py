@@ -0,0 +1,186 @@
+"""
+Tracking Snapshots - in-memory "where is my order" answers for the customer agent
+This file keeps a small, always-fresh summary of each shipment a customer has asked about, so the agent never re-walks the database per turn.
+
+A snapshot is the shipment's number, status, route, ETA and last known GPS point, loaded with two narrow queries on first use.
+
+After that the cache listens to the event bus: status events update the status, tracking events update the last location, in place.
+
+Events only touch shipments already cached; everything else is loaded on demand.
+
+Entries also expire after AGENT_SNAPSHOT_TTL_SECONDS, which bounds staleness when events come from another process on the in-memory bus.
+
+The cache is LRU-bounded to AGENT_SNAPSHOT_MAX_ENTRIES and keeps, per customer, the list of their shipment ids with the same TTL.
+
+In simple words — this file remembers where each parcel is and keeps that memory up to date from live events.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.driver_backend.repositories.shipment_repository import ACTIVE_STATUSES
+from backend.shared.config import settings
+from backend.shared.event_bus import EventBus, get_event_bus
+from backend.shared.metrics import record_cache
+from backend.shared.models import Shipment, TrackingData
+
+
+def _enum_value(value):
+    return getattr(value, "value", value)
+
+
+class TrackingSnapshotCache:
+    """shipment_id -> snapshot dict, kept current by shipment:* events"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries or settings.AGENT_SNAPSHOT_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.AGENT_SNAPSHOT_TTL_SECONDS
+        self._snapshots: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._by_number: Dict[str, int] = {}
+        self._customer_shipments: Dict[int, Tuple[float, List[int]]] = {}
+        self._lock = threading.Lock()
+        self._unsubscribe = None
+
+    # -------------------- LIFECYCLE --------------------
+    def start(self, bus: Optional[EventBus] = None) -> None:
+        if self._unsubscribe is None:
+            self._unsubscribe = (bus or get_event_bus()).subscribe("shipment:*", self._on_event)
+
+    def stop(self) -> None:
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._by_number.clear()
+            self._customer_shipments.clear()
+
+    # -------------------- READS --------------------
+    def get(self, db: Session, shipment_id: int) -> Optional[Dict[str, Any]]:
+        """Snapshot copy (None if the shipment does not exist)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._snapshots.get(shipment_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                self._snapshots.move_to_end(shipment_id)
+                record_cache("tracking_snapshot", True)
+                return dict(entry[1])
+        record_cache("tracking_snapshot", False)
+        snapshot = self._load(db, Shipment.id == shipment_id)
+        return dict(snapshot) if snapshot else None
+
+    def get_by_number(self, db: Session, shipment_number: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            shipment_id = self._by_number.get(shipment_number.upper())
+        if shipment_id is not None:
+            return self.get(db, shipment_id)
+        record_cache("tracking_snapshot", False)
+        snapshot = self._load(db, Shipment.shipment_number == shipment_number.upper())
+        return dict(snapshot) if snapshot else None
+
+    def customer_shipment_ids(self, db: Session, customer_id: int) -> List[int]:
+        """The customer's active shipments, newest first"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._customer_shipments.get(customer_id)
+            if entry and now - entry[0] < self.ttl_seconds:
+                return list(entry[1])
+        ids = [row[0] for row in db.query(Shipment.id).filter(
+            Shipment.customer_id == customer_id,
+            Shipment.status.in_(ACTIVE_STATUSES)
+        ).order_by(Shipment.created_at.desc())]
+        with self._lock:
+            self._customer_shipments[customer_id] = (now, ids)
+        return ids
+
+    def _load(self, db: Session, criterion) -> Optional[Dict[str, Any]]:
+        row = db.query(
+            Shipment.id, Shipment.shipment_number, Shipment.customer_id, Shipment.status,
+            Shipment.pickup_location, Shipment.delivery_location,
+            Shipment.estimated_delivery, Shipment.actual_delivery
+        ).filter(criterion).first()
+        if row is None:
+            return None
+        point = db.query(
+            TrackingData.latitude, TrackingData.longitude, TrackingData.location_name, TrackingData.timestamp
+        ).filter(
+            TrackingData.shipment_id == row.id
+        ).order_by(TrackingData.timestamp.desc()).first()
+
+        snapshot = {
+            "shipment_id": row.id,
+            "shipment_number": row.shipment_number,
+            "customer_id": row.customer_id,
+            "status": _enum_value(row.status),
+            "pickup_location": row.pickup_location,
+            "delivery_location": row.delivery_location,
+            "estimated_delivery": row.estimated_delivery,
+            "actual_delivery": row.actual_delivery,
+            "last_location": {
+                "latitude": point.latitude,
+                "longitude": point.longitude,
+                "location_name": point.location_name,
+                "timestamp": point.timestamp
+            } if point else None,
+        }
+        with self._lock:
+            self._snapshots[row.id] = (time.monotonic(), snapshot)
+            self._snapshots.move_to_end(row.id)
+            self._by_number[row.shipment_number] = row.id
+            while len(self._snapshots) > self.max_entries:
+                _, (_, evicted) = self._snapshots.popitem(last=False)
+                self._by_number.pop(evicted["shipment_number"], None)
+        return snapshot
+
+    # -------------------- EVENTS --------------------
+    def _on_event(self, channel: str, event: dict) -> None:
+        with self._lock:
+            entry = self._snapshots.get(event.get("shipment_id"))
+            if event.get("type") == "status" and event.get("customer_id"):
+                # Active list may have gained or lost this shipment
+                self._customer_shipments.pop(event["customer_id"], None)
+            if entry is None:
+                return
+            snapshot = entry[1]
+            if event["type"] == "status":
+                snapshot["status"] = event["status"]
+                if event["status"] == "DELIVERED":
+                    snapshot["actual_delivery"] = datetime.fromisoformat(event["ts"])
+            elif event["type"] == "tracking":
+                snapshot["last_location"] = {
+                    "latitude": event["lat"],
+                    "longitude": event["lng"],
+                    "location_name": event.get("name"),
+                    "timestamp": datetime.fromisoformat(event["ts"])
+                }
+
+
+_snapshot_cache: Optional[TrackingSnapshotCache] = None
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> TrackingSnapshotCache:
+    """Process-wide cache, subscribed to the event bus on first use"""
+    global _snapshot_cache
+    if _snapshot_cache is None:
+        with _snapshot_cache_lock:
+            if _snapshot_cache is None:
+                cache = TrackingSnapshotCache()
+                cache.start()
+                _snapshot_cache = cache
+    return _snapshot_cache
+
+
+def set_snapshot_cache(cache: Optional[TrackingSnapshotCache]) -> None:
+    """Replace the process-wide cache (tests)"""
+    global _snapshot_cache
+    with _snapshot_cache_lock:
+        if _snapshot_cache is not None:
+            _snapshot_cache.stop()
+        _snapshot_cache = cache
@@ -24,12 +24,13 @@ Driver Controller - Handle driver-related routes
 Driver Controller - Handle driver-related routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import Dict
 
 # Database + Service
 from backend.shared.database import get_db
+from backend.shared.http_cache import conditional_get
 from backend.driver_backend.services.driver_service import DriverService
 
 # Driver Schemas
@@ -74,10 +75,17 @@ def driver_login(
 # ==================== DASHBOARD ====================
 @router.get("/dashboard", response_model=DriverDashboardResponse)
 def get_dashboard(
+    request: Request,
+    response: Response,
     current_driver: Dict = Depends(get_current_driver),
     db: Session = Depends(get_db)
 ):
     service = DriverService(db)
+    not_modified = conditional_get(
+        request, response, service.get_dashboard_version(current_driver["id"])
+    )
+    if not_modified:
+        return not_modified
     return service.get_dashboard_data(current_driver["id"])
 
 
@@ -93,6 +101,7 @@ def update_location(
         latitude=location.latitude,
         longitude=location.longitude,
         shipment_id=location.shipment_id,
-        location_name=location.location_name
+        location_name=location.location_name,
+        driver_id=current_driver["id"]
     )
 
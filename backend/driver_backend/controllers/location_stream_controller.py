@@ -0,0 +1,91 @@
+"""
+Location Stream Controller - Driver location WebSocket
+This file exposes a long-lived WebSocket that driver phones use to stream GPS points.
+
+The JWT is checked once during the handshake (?token=... or an Authorization: Bearer header).
+
+After that each frame carries only coordinates, so there is no per-ping TLS, HTTP or auth cost.
+
+Frames may be JSON ({"s": shipment_id, "lat": .., "lng": .., "n": name}) or packed binary points.
+
+Points are rate limited and queued per connection; a full queue stops reading and applies backpressure.
+
+Batches are written through DriverService and published on the event bus, then acknowledged to the phone.
+
+In simple words — this file is the fast lane for live driver tracking.
+"""
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+
+from backend.driver_backend.utils.dependencies import decode_driver_token
+from backend.driver_backend.services.location_stream_service import (
+    FrameError, LocationStreamSession, parse_location_frame
+)
+
+router = APIRouter()
+
+
+def _extract_token(websocket: WebSocket, token: Optional[str]) -> Optional[str]:
+    if token:
+        return token
+    authorization = websocket.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:]
+    return None
+
+
+@router.websocket("/ws/location")
+async def stream_locations(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None)
+):
+    """
+    Authenticated location stream for the logged-in driver
+    """
+    raw_token = _extract_token(websocket, token)
+    try:
+        if not raw_token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        driver = decode_driver_token(raw_token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    session = LocationStreamSession(driver["id"])
+    await session.load_assignments()
+
+    async def acknowledge(written: int):
+        try:
+            await websocket.send_json({"type": "ack", "written": written})
+        except Exception:
+            pass  # Socket already closed; the points are stored anyway
+
+    writer = asyncio.create_task(session.run_writer(on_flush=acknowledge))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            try:
+                points = parse_location_frame(
+                    text=message.get("text"),
+                    data=message.get("bytes")
+                )
+            except FrameError as e:
+                await websocket.send_json({"type": "error", "detail": str(e)})
+                continue
+
+            rejected = await session.enqueue(points)
+            if rejected:
+                await websocket.send_json({"type": "rejected", "reasons": sorted(set(rejected))})
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
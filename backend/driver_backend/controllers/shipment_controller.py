@@ -16,9 +16,11 @@ There is a dedicated endpoint for reporting traffic delays or issues during tran
 
 In simple words — this file exposes all shipment-related actions a driver can perform while delivering packages.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from backend.shared.database import get_db
+from backend.shared.http_cache import conditional_get
+from backend.shared.serialization import fast_json
 from backend.driver_backend.services.shipment_service import ShipmentService
 from backend.driver_backend.schemas.shipment_schemas import (
     ShipmentListResponse, ShipmentDetailResponse,
@@ -33,14 +35,23 @@ router = APIRouter()
 
 @router.get("/shipments", response_model=List[ShipmentListResponse])
 def get_assigned_shipments(
+    request: Request,
+    response: Response,
     current_driver: Dict = Depends(get_current_driver),
     db: Session = Depends(get_db)
 ):
     """
     Get all shipments assigned to the driver
+    Answers 304 from a version lookup when the client's ETag is current
     """
     service = ShipmentService(db)
-    return service.get_assigned_shipments(current_driver["id"])
+    not_modified = conditional_get(
+        request, response, service.get_assigned_shipments_version(current_driver["id"])
+    )
+    if not_modified:
+        return not_modified
+    # Rows are already shaped by SHIPMENT_LIST_PROJECTION; skip re-validation
+    return fast_json(service.get_assigned_shipments(current_driver["id"]), response)
 
 @router.get("/shipments/{shipment_id}", response_model=ShipmentDetailResponse)
 def get_shipment_details(
@@ -1,36 +1,68 @@
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
+from fastapi import APIRouter, HTTPException, Depends, File, Header, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, Optional
+from backend.shared.config import settings
 from backend.shared.database import get_db
 from backend.driver_backend.schemas.voice_schemas import VoiceCommandResponse, TextToSpeechRequest
-from backend.driver_backend.services.voice_assistant_service import VoiceAssistantService
+from backend.driver_backend.services.voice_assistant_service import VoiceAssistantService, get_voice_service
+from backend.driver_backend.services.intent_classifier import SUPPORTED_COMMANDS
+from backend.driver_backend.services.tts_cache import file_response, tts_cache
+from backend.driver_backend.services.audio_preprocessor import prepare_audio, read_upload
 from backend.driver_backend.services.driver_service import DriverService
 from backend.driver_backend.services.shipment_service import ShipmentService
-from io import BytesIO
-import base64
+from backend.driver_backend.utils.dependencies import get_current_driver
 
 router = APIRouter(prefix="/voice", tags=["Voice Assistant"])
 
+VOICE_NOTE = "Voice command"
+
+# Spoken status -> the ShipmentService transition it asks for
+STATUS_ACTIONS = {
+    "PICKED_UP": lambda service, shipment_id, driver_id: service.mark_picked_up(shipment_id, driver_id, VOICE_NOTE),
+    "IN_TRANSIT": lambda service, shipment_id, driver_id: service.mark_in_transit(shipment_id, driver_id, VOICE_NOTE),
+    "OUT_FOR_DELIVERY": lambda service, shipment_id, driver_id: service.mark_out_for_delivery(
+        shipment_id, driver_id, VOICE_NOTE
+    ),
+    "DELIVERED": lambda service, shipment_id, driver_id: service.mark_delivered(
+        shipment_id, driver_id, None, None, VOICE_NOTE
+    ),
+}
+
+
+def _update_status(shipment_service: ShipmentService, shipment_number: str, new_status: str, driver_id: int) -> Dict:
+    """Run a spoken status change through the same checks as the shipment endpoints"""
+    action = STATUS_ACTIONS.get(new_status)
+    if action is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported status: {new_status}")
+    return action(shipment_service, shipment_service.get_shipment_id(shipment_number), driver_id)
+
+
+def _collect_cod(shipment_service: ShipmentService, shipment_number: str, amount: float, driver_id: int) -> Dict:
+    return shipment_service.collect_cod(shipment_service.get_shipment_id(shipment_number), driver_id, amount)
+
+
 @router.post("/command", response_model=VoiceCommandResponse)
 async def process_voice_command(
-    driver_id: str,
     audio_file: UploadFile = File(...),
-    db: Session = Depends(get_db)  # Only inject database session
+    current_driver: Dict = Depends(get_current_driver),
+    db: Session = Depends(get_db),
+    voice_service: VoiceAssistantService = Depends(get_voice_service)
 ):
     """
     Process voice command from driver
     """
     try:
-        # Instantiate services
-        voice_service = VoiceAssistantService()
         shipment_service = ShipmentService(db)
+        driver_id = current_driver["id"]
         
-        # Read and encode audio
-        audio_bytes = await audio_file.read()
-        audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+        # Raw bytes (size-checked while reading), shrunk in the preprocessing pool
+        audio_bytes = await read_upload(audio_file)
+        prepared = await prepare_audio(audio_bytes, audio_file.filename or "audio.wav")
         
         # Step 1: Transcribe audio
-        transcription = await voice_service.transcribe_audio(audio_base64)
+        transcription = await voice_service.transcribe_audio(prepared.audio, filename=prepared.filename)
         
         if not transcription:
             raise HTTPException(status_code=400, detail="Could not transcribe audio")
@@ -49,8 +81,7 @@ async def process_voice_command(
             status = entities.get("status")
             
             if shipment_id and status:
-                # Call your existing shipment service
-                await shipment_service.update_status(shipment_id, status, driver_id)
+                await run_in_threadpool(_update_status, shipment_service, shipment_id, status, driver_id)
                 action_taken = f"Updated shipment {shipment_id} to {status}"
                 message = f"Got it! Shipment {shipment_id} marked as {status}."
             else:
@@ -59,7 +90,7 @@ async def process_voice_command(
         elif intent == "confirm_pickup":
             shipment_id = entities.get("shipment_id")
             if shipment_id:
-                await shipment_service.confirm_pickup(shipment_id, driver_id)
+                await run_in_threadpool(_update_status, shipment_service, shipment_id, "PICKED_UP", driver_id)
                 action_taken = f"Confirmed pickup for {shipment_id}"
                 message = f"Pickup confirmed for shipment {shipment_id}!"
             else:
@@ -68,7 +99,7 @@ async def process_voice_command(
         elif intent == "confirm_delivery":
             shipment_id = entities.get("shipment_id")
             if shipment_id:
-                await shipment_service.confirm_delivery(shipment_id, driver_id)
+                await run_in_threadpool(_update_status, shipment_service, shipment_id, "DELIVERED", driver_id)
                 action_taken = f"Confirmed delivery for {shipment_id}"
                 message = f"Delivery confirmed for shipment {shipment_id}!"
             else:
@@ -83,7 +114,7 @@ async def process_voice_command(
             shipment_id = entities.get("shipment_id")
             amount = entities.get("amount")
             if shipment_id and amount:
-                # Update COD in your system
+                await run_in_threadpool(_collect_cod, shipment_service, shipment_id, float(amount), driver_id)
                 action_taken = f"Updated COD amount for {shipment_id}"
                 message = f"COD of {amount} recorded for shipment {shipment_id}."
             else:
@@ -100,27 +131,65 @@ async def process_voice_command(
             message=message
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _speech_response(text: str, voice: str, range_header, voice_service: VoiceAssistantService):
+    """Cached audio from disk (Range supported), or provider audio streamed while it is cached"""
+    headers = {"Content-Disposition": "attachment; filename=response.mp3"}
+    if not settings.TTS_CACHE_ENABLED:
+        chunks = await voice_service.stream_speech(text, voice)
+        return StreamingResponse(chunks, media_type="audio/mpeg", headers=headers)
+
+    primary = voice_service.provider.name
+    cached = tts_cache.get(tts_cache.key(primary, settings.VOICE_TTS_MODEL, voice, text))
+    if cached is not None:
+        return file_response(cached, range_header, dict(headers, **{"X-Cache": "HIT"}))
+
+    chunks = await voice_service.stream_speech(text, voice)
+    if chunks.provider != primary:
+        # A fallback answered: never store its voice under the primary's key
+        return StreamingResponse(chunks, media_type="audio/mpeg", headers=dict(headers, **{"X-Cache": "BYPASS"}))
+    return StreamingResponse(
+        tts_cache.tee(tts_cache.key(chunks.provider, settings.VOICE_TTS_MODEL, voice, text), chunks),
+        media_type="audio/mpeg",
+        headers=dict(headers, **{"X-Cache": "MISS"})
+    )
+
+
 @router.post("/text-to-speech")
 async def convert_text_to_speech(
-    request: TextToSpeechRequest
+    request: TextToSpeechRequest,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    voice_service: VoiceAssistantService = Depends(get_voice_service)
 ):
     """
     Convert text to speech for driver feedback
     """
     try:
-        voice_service = VoiceAssistantService()
-        audio_bytes = await voice_service.text_to_speech(request.text, request.voice)
-        
-        return StreamingResponse(
-            BytesIO(audio_bytes),
-            media_type="audio/mpeg",
-            headers={"Content-Disposition": "attachment; filename=response.mp3"}
-        )
-        
+        return await _speech_response(request.text, request.voice, range_header, voice_service)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/text-to-speech")
+async def get_text_to_speech(
+    request: TextToSpeechRequest = Depends(),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    voice_service: VoiceAssistantService = Depends(get_voice_service)
+):
+    """
+    Same audio as POST, addressable by URL (<audio src>, seeking with Range requests)
+    """
+    try:
+        return await _speech_response(request.text, request.voice, range_header, voice_service)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -130,45 +199,4 @@ async def get_supported_commands():
     """
     Return list of supported voice commands
     """
-    return {
-        "commands": [
-            {
-                "intent": "confirm_pickup",
-                "examples": [
-                    "Confirm pickup for shipment SHP123",
-                    "I've picked up order SHP123",
-                    "Pickup done for SHP123"
-                ]
-            },
-            {
-                "intent": "confirm_delivery",
-                "examples": [
-                    "Delivered shipment SHP123",
-                    "Mark SHP123 as delivered",
-                    "Delivery complete for SHP123"
-                ]
-            },
-            {
-                "intent": "update_status",
-                "examples": [
-                    "Update SHP123 to in transit",
-                    "Mark SHP123 as out for delivery"
-                ]
-            },
-            {
-                "intent": "report_delay",
-                "examples": [
-                    "I'm running late due to traffic",
-                    "Delayed because of vehicle issue",
-                    "Traffic jam on highway"
-                ]
-            },
-            {
-                "intent": "update_cod",
-                "examples": [
-                    "Collected 500 rupees for SHP123",
-                    "COD amount 1000 for shipment SHP456"
-                ]
-            }
-        ]
-    }
\ No newline at end of file
+    return {"commands": SUPPORTED_COMMANDS}
@@ -2,27 +2,40 @@
 Driver Backend - FastAPI Application
 Production-grade OOP architecture
 """
+import asyncio
+import sys
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from backend.shared.database import engine, Base  # REVERT: add 'backend.' back
+from starlette.concurrency import run_in_threadpool
+from backend.shared.database import init_db
+from backend.shared.serialization import FastJSONResponse
+from backend.shared.db_instrumentation import install_db_instrumentation
+from backend.shared.metrics import install_metrics
+from backend.shared.health import install_health
+from backend.shared.profiling import install_profiling
+from backend.shared.loop_watchdog import install_loop_watchdog
 from backend.shared.config import settings  # REVERT: add 'backend.' back
+from backend.shared.outbox import outbox_relay
+from backend.driver_backend.services.notification_service import notification_dispatcher
+from backend.driver_backend.services.intent_classifier import intent_classifier
+from backend.driver_backend.services.audio_preprocessor import shutdown_preprocess_pool
 from backend.driver_backend.controllers import (  # REVERT: add 'backend.' back
     driver_controller,
     shipment_controller,
     pricing_controller,
-    voice_controller  # JUST ADD THIS LINE
+    voice_controller,  # JUST ADD THIS LINE
+    location_stream_controller
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Initialize FastAPI app
 app = FastAPI(
     title="Logistics - Driver Backend",
     description="Driver operations, shipment tracking, and delivery management",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse
 )
 
 # CORS Configuration
@@ -34,6 +47,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics + GET /metrics, then per-request DB stats (Server-Timing, slow-query log, N+1 guard)
+install_metrics(app, "driver")
+install_db_instrumentation(app)
+
+# GET /health/live, /health/ready (and /health)
+install_health(app, "driver_backend")
+
+# Opt-in request profiling (PROFILING_TOKEN / PROFILING_SAMPLE_RATE)
+install_profiling(app, "driver_backend")
+
+# Event-loop lag histogram + stall stacks (LOOP_STRICT_MODE: fail sync SQL on the loop)
+install_loop_watchdog(app)
+
 # Include routers
 app.include_router(
     driver_controller.router,
@@ -59,6 +85,31 @@ app.include_router(
     tags=["Voice Assistant"]
 )
 
+app.include_router(
+    location_stream_controller.router,
+    prefix="/api/driver",
+    tags=["Live Tracking"]
+)
+
+@app.on_event("startup")
+async def start_background_services():
+    """Create missing tables, then start workers that must never run inside a request"""
+    await run_in_threadpool(init_db)
+    notification_dispatcher.start()
+    if settings.OUTBOX_RELAY_ENABLED:
+        outbox_relay.start()
+    # Train the voice intent model off the event loop, before the first voice command
+    asyncio.get_running_loop().run_in_executor(None, intent_classifier.warm_up)
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    """Relay committed events and flush pending notifications before the worker exits"""
+    await outbox_relay.stop()
+    await notification_dispatcher.stop()
+    shutdown_preprocess_pool()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -70,21 +121,6 @@ async def root():
         "features": ["Voice Assistant", "Shipment Tracking", "Pricing"]
     }
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "service": "driver_backend",
-        "ai_features": "enabled"
-    }
-
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        app,
-        host=settings.API_HOST,
-        port=settings.API_PORT_DRIVER,
-        reload=True
-    )
\ No newline at end of file
+    from backend.shared.server import main
+    main(["driver", *sys.argv[1:]], app=app)
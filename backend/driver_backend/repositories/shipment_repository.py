@@ -16,13 +16,44 @@ It provides dashboard metrics like today's deliveries, pending count, completed
 
 In simple words — this file is the shipment database helper, enabling the driver backend to read/update shipment information efficiently.
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, case, func, select
 from backend.shared.models import Shipment, User
+from backend.shared.outbox import record_shipment_status
+from backend.shared.read_models import DriverShipmentRow, fetch_rows
 from backend.driver_backend.utils.enums import ShipmentStatus, CustomsStatus, CODStatus
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from datetime import datetime, date
 
+# Statuses shown in the driver's active shipment list
+ACTIVE_STATUSES = [
+    ShipmentStatus.ASSIGNED,
+    ShipmentStatus.PICKED_UP,
+    ShipmentStatus.IN_TRANSIT,
+    ShipmentStatus.OUT_FOR_DELIVERY
+]
+
+# Relationship loading per endpoint. A view that reads a relationship names it here so
+# it arrives with the shipment instead of one lazy load per row (N+1): joinedload for
+# many-to-one (same SELECT), selectinload for one-to-many (one IN query per batch).
+# Only the detail view walks one today; list views read columns (read_models).
+LOAD_DETAIL = (joinedload(Shipment.customer),)
+
+# Version checksum terms. updated_at has one-second resolution on MySQL DATETIME, so two
+# changes within a second need something else to move: the id sum catches rows joining or
+# leaving a list, the status checksum catches status changes of rows that stay in it.
+STATUS_CODE = case(
+    {shipment_status: code for code, shipment_status in enumerate(ShipmentStatus, 1)},
+    value=Shipment.status,
+    else_=0
+)
+VERSION_COLUMNS = (
+    func.max(Shipment.updated_at),
+    func.count(Shipment.id),
+    func.sum(Shipment.id),
+    func.sum(Shipment.id * STATUS_CODE)
+)
+
 class ShipmentRepository:
     """Handle all shipment database operations"""
     
@@ -33,17 +64,52 @@ class ShipmentRepository:
         """Get all shipments assigned to driver"""
         return self.db.query(Shipment).filter(
             Shipment.driver_id == driver_id,
-            Shipment.status.in_([
-                ShipmentStatus.ASSIGNED,
-                ShipmentStatus.PICKED_UP,
-                ShipmentStatus.IN_TRANSIT,
-                ShipmentStatus.OUT_FOR_DELIVERY
-            ])
+            Shipment.status.in_(ACTIVE_STATUSES)
         ).all()
+
+    def get_assigned_shipment_rows(self, driver_id: int, limit: Optional[int] = None) -> List[DriverShipmentRow]:
+        """Read-only list view of the driver's active shipments (selected columns only)"""
+        return fetch_rows(
+            self.db, DriverShipmentRow,
+            Shipment.driver_id == driver_id,
+            Shipment.status.in_(ACTIVE_STATUSES),
+            order_by=Shipment.id,
+            limit=limit
+        )
+
+    def get_assigned_shipment_ids(self, driver_id: int) -> List[int]:
+        """IDs of the driver's active shipments"""
+        return list(self.db.execute(
+            select(Shipment.id).where(
+                Shipment.driver_id == driver_id,
+                Shipment.status.in_(ACTIVE_STATUSES)
+            )
+        ).scalars())
+
+    def get_assigned_version(self, driver_id: int) -> Tuple:
+        """VERSION_COLUMNS of the active list - changes whenever the list does"""
+        return tuple(self.db.query(*VERSION_COLUMNS).filter(
+            Shipment.driver_id == driver_id,
+            Shipment.status.in_(ACTIVE_STATUSES)
+        ).one())
+
+    def get_driver_version(self, driver_id: int) -> Tuple:
+        """VERSION_COLUMNS over every shipment of the driver"""
+        return tuple(self.db.query(*VERSION_COLUMNS).filter(Shipment.driver_id == driver_id).one())
     
-    def get_shipment_by_id(self, shipment_id: int) -> Optional[Shipment]:
-        """Get shipment by ID"""
-        return self.db.query(Shipment).filter(Shipment.id == shipment_id).first()
+    def get_shipment_by_id(self, shipment_id: int, load: tuple = ()) -> Optional[Shipment]:
+        """Get shipment by ID (load: LOAD_* options for the relationships read)"""
+        return self.db.query(Shipment).options(*load).filter(Shipment.id == shipment_id).first()
+
+    def get_shipment_id_by_number(self, shipment_number: str) -> Optional[int]:
+        """ID of the shipment with this tracking number ("SHP123")"""
+        return self.db.execute(
+            select(Shipment.id).where(Shipment.shipment_number == shipment_number)
+        ).scalar_one_or_none()
+
+    def get_shipment_detail(self, shipment_id: int) -> Optional[Shipment]:
+        """Shipment with its customer, for the detail view"""
+        return self.get_shipment_by_id(shipment_id, load=LOAD_DETAIL)
     
     def update_shipment_status(self, shipment_id: int, status: ShipmentStatus) -> bool:
         """Update shipment status"""
@@ -51,6 +117,7 @@ class ShipmentRepository:
         if shipment:
             shipment.status = status
             shipment.updated_at = datetime.utcnow()
+            record_shipment_status(self.db, shipment)
             self.db.commit()
             return True
         return False
@@ -61,6 +128,7 @@ class ShipmentRepository:
         if shipment:
             shipment.status = ShipmentStatus.PICKED_UP
             shipment.pickup_completed_at = datetime.utcnow()
+            record_shipment_status(self.db, shipment)
             self.db.commit()
             return True
         return False
@@ -71,6 +139,7 @@ class ShipmentRepository:
         if shipment:
             shipment.status = ShipmentStatus.DELIVERED
             shipment.actual_delivery = datetime.utcnow()
+            record_shipment_status(self.db, shipment)
             self.db.commit()
             return True
         return False
@@ -83,6 +152,7 @@ class ShipmentRepository:
             shipment.failure_reason = reason
             shipment.failure_notes = notes
             shipment.delivery_attempted_at = datetime.utcnow()
+            record_shipment_status(self.db, shipment)
             self.db.commit()
             return True
         return False
@@ -154,6 +224,8 @@ class ShipmentRepository:
         if shipment:
             shipment.status = new_status
             shipment.updated_at = datetime.utcnow()
+            record_shipment_status(self.db, shipment)
             self.db.commit()
             return True
-        return False
\ No newline at end of file
+        return False
+
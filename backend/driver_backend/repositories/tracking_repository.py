@@ -17,8 +17,10 @@ This helps power live tracking, driver movement history, and customer shipment t
 In simple words — this file is the GPS tracking database helper, saving driver locations and retrieving last known positions.
 """
 from sqlalchemy.orm import Session
-from backend.shared.models import TrackingData
-from typing import Optional
+from sqlalchemy import func
+from backend.shared.models import TrackingData, Shipment
+from backend.shared.event_bus import get_event_bus
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 class TrackingRepository:
@@ -33,7 +35,8 @@ class TrackingRepository:
         latitude: float,
         longitude: float,
         location_name: Optional[str] = None,
-        status_update: Optional[str] = None
+        status_update: Optional[str] = None,
+        driver_id: Optional[int] = None
     ) -> TrackingData:
         """Create new tracking entry"""
         tracking = TrackingData(
@@ -47,10 +50,71 @@ class TrackingRepository:
         self.db.add(tracking)
         self.db.commit()
         self.db.refresh(tracking)
+
+        # Let other processes see the point without polling MySQL
+        get_event_bus().publish_tracking(
+            shipment_id=shipment_id,
+            latitude=latitude,
+            longitude=longitude,
+            location_name=location_name,
+            driver_id=driver_id,
+            timestamp=tracking.timestamp
+        )
         return tracking
     
+    def create_tracking_entries(
+        self,
+        points: List[Dict],
+        driver_id: Optional[int] = None,
+        status_update: Optional[str] = None
+    ) -> int:
+        """
+        Bulk insert GPS points in one transaction.
+        Each point: shipment_id, latitude, longitude, optional location_name/timestamp.
+        """
+        if not points:
+            return 0
+
+        now = datetime.utcnow()
+        points = [dict(point, timestamp=point.get("timestamp") or now) for point in points]
+
+        self.db.add_all([
+            TrackingData(
+                shipment_id=point["shipment_id"],
+                latitude=point["latitude"],
+                longitude=point["longitude"],
+                location_name=point.get("location_name"),
+                status_update=status_update,
+                timestamp=point["timestamp"]
+            )
+            for point in points
+        ])
+        self.db.commit()
+
+        # Publish from the plain dicts: committed ORM rows are expired
+        bus = get_event_bus()
+        for point in points:
+            bus.publish_tracking(
+                shipment_id=point["shipment_id"],
+                latitude=point["latitude"],
+                longitude=point["longitude"],
+                location_name=point.get("location_name"),
+                driver_id=driver_id,
+                timestamp=point["timestamp"]
+            )
+        return len(points)
+
     def get_last_location(self, shipment_id: int) -> Optional[TrackingData]:
         """Get last known location for shipment"""
         return self.db.query(TrackingData).filter(
             TrackingData.shipment_id == shipment_id
-        ).order_by(TrackingData.timestamp.desc()).first()
\ No newline at end of file
+        ).order_by(TrackingData.timestamp.desc()).first()
+
+    def get_driver_tracking_version(self, driver_id: int, statuses: List) -> Tuple:
+        """(newest timestamp, newest id) across the driver's shipments in the given statuses"""
+        return tuple(self.db.query(func.max(TrackingData.timestamp), func.max(TrackingData.id)).join(
+            Shipment, Shipment.id == TrackingData.shipment_id
+        ).filter(
+            Shipment.driver_id == driver_id,
+            Shipment.status.in_(statuses)
+        ).one())
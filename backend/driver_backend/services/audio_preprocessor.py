@@ -0,0 +1,186 @@
+"""
+Audio Preprocessor - shrink driver voice uploads before transcription
+This file prepares a recorded voice command so the speech-to-text call gets the smallest audio that still holds the words.
+
+Upload size (VOICE_MAX_UPLOAD_MB) is checked while the upload is read, and duration (VOICE_MAX_DURATION_SECONDS) right after decoding, before any real work.
+
+The pipeline trims leading/trailing silence, downmixes to mono, resamples to 16 kHz / 16-bit and re-encodes as WAV, Opus or MP3 (VOICE_AUDIO_FORMAT).
+
+Decoding and DSP are CPU work that holds the GIL, so they run in a small process pool (VOICE_PREPROCESS_WORKERS), never on the event loop.
+
+pydub is imported inside the worker; WAV needs nothing else, other input formats and Opus/MP3 output need ffmpeg on the PATH.
+
+If the audio cannot be decoded (pydub or ffmpeg missing, unknown format) the original upload is sent as-is.
+
+In simple words — this file cuts the silence and the excess quality out of voice recordings so Whisper gets them faster.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+from backend.shared.config import settings
+from backend.shared.metrics import histogram
+
+logger = logging.getLogger(__name__)
+
+VOICE_PREPROCESS_SECONDS = histogram(
+    "voice_preprocess_seconds", "Voice upload preprocessing time (pool queueing included)",
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+KEEP_SILENCE_MS = 200  # Margin left around speech so Whisper hears word onsets
+SILENCE_BELOW_AVERAGE_DB = 16.0  # Quieter than average loudness by this much = silence
+
+# format -> (pydub export kwargs, file extension Whisper recognises)
+EXPORT_FORMATS = {
+    "wav": ({"format": "wav"}, "wav"),
+    "opus": ({"format": "ogg", "codec": "libopus", "bitrate": "24k"}, "ogg"),
+    "mp3": ({"format": "mp3", "bitrate": "32k"}, "mp3"),
+}
+
+
+class AudioRejected(Exception):
+    """Upload breaks a limit or holds no speech (pickles across the process pool)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class PreparedAudio(NamedTuple):
+    audio: bytes
+    filename: str
+    original_bytes: int
+    original_seconds: Optional[float]  # None when the upload was passed through undecoded
+    seconds: Optional[float]
+
+
+# ==================== WORKER (runs in the process pool) ====================
+def preprocess_audio(audio: bytes, filename: str, max_seconds: float, sample_rate: int,
+                     output_format: str) -> PreparedAudio:
+    """Decode, check duration, trim silence, mono, resample, re-encode"""
+    try:
+        from pydub import AudioSegment
+        from pydub.silence import detect_leading_silence
+    except ImportError:
+        return PreparedAudio(audio, filename, len(audio), None, None)
+
+    extension = os.path.splitext(filename)[1].lstrip(".").lower() or None
+    try:
+        segment = AudioSegment.from_file(BytesIO(audio), format=extension)
+    except Exception as exc:  # No ffmpeg for this format, or not audio at all
+        logger.info("Voice upload %s not decoded (%s); sending it unprocessed", filename, exc)
+        return PreparedAudio(audio, filename, len(audio), None, None)
+
+    original_seconds = segment.duration_seconds
+    if original_seconds > max_seconds:
+        raise AudioRejected(
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            f"Voice command is {original_seconds:.0f}s long; the limit is {max_seconds:.0f}s"
+        )
+
+    if segment.dBFS != float("-inf"):
+        threshold = segment.dBFS - SILENCE_BELOW_AVERAGE_DB
+        start = max(detect_leading_silence(segment, silence_threshold=threshold) - KEEP_SILENCE_MS, 0)
+        end = len(segment) - max(
+            detect_leading_silence(segment.reverse(), silence_threshold=threshold) - KEEP_SILENCE_MS, 0
+        )
+        segment = segment[start:end] if end > start else segment[:0]
+    if len(segment) == 0 or segment.dBFS == float("-inf"):
+        raise AudioRejected(status.HTTP_400_BAD_REQUEST, "No speech detected in the recording")
+
+    segment = segment.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+
+    export_kwargs, out_extension = EXPORT_FORMATS[output_format]
+    out = BytesIO()
+    try:
+        segment.export(out, **export_kwargs)
+    except Exception as exc:  # Opus/MP3 without ffmpeg: 16 kHz mono WAV is still far smaller
+        logger.warning("Export as %s failed (%s); falling back to WAV", output_format, exc)
+        out = BytesIO()
+        segment.export(out, format="wav")
+        out_extension = "wav"
+
+    stem = os.path.splitext(filename)[0] or "audio"
+    return PreparedAudio(out.getvalue(), f"{stem}.{out_extension}", len(audio), original_seconds,
+                         segment.duration_seconds)
+
+
+# ==================== POOL ====================
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a process that runs threads (threadpool, relays) can deadlock
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.VOICE_PREPROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def shutdown_preprocess_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def read_upload(upload: UploadFile) -> bytes:
+    """Upload bytes, refusing anything over VOICE_MAX_UPLOAD_MB before reading it all"""
+    limit = int(settings.VOICE_MAX_UPLOAD_MB * 1024 * 1024)
+    if upload.size is not None and upload.size > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Voice upload exceeds {settings.VOICE_MAX_UPLOAD_MB:g} MB"
+        )
+    audio = await upload.read(limit + 1)
+    if len(audio) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Voice upload exceeds {settings.VOICE_MAX_UPLOAD_MB:g} MB"
+        )
+    return audio
+
+
+async def prepare_audio(audio: bytes, filename: str) -> PreparedAudio:
+    """Run the preprocessing pipeline in the pool (pass-through when disabled)"""
+    if not settings.VOICE_PREPROCESS_ENABLED:
+        return PreparedAudio(audio, filename, len(audio), None, None)
+    started = time.perf_counter()
+    try:
+        prepared = await asyncio.get_running_loop().run_in_executor(
+            _get_pool(), preprocess_audio, audio, filename,
+            settings.VOICE_MAX_DURATION_SECONDS, settings.VOICE_SAMPLE_RATE, settings.VOICE_AUDIO_FORMAT
+        )
+    except AudioRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    except BrokenProcessPool:
+        # A worker died (OOM, crash): replace the pool, send this upload unprocessed
+        logger.exception("Audio preprocessing pool broke; recreating it")
+        shutdown_preprocess_pool()
+        return PreparedAudio(audio, filename, len(audio), None, None)
+    finally:
+        VOICE_PREPROCESS_SECONDS.observe(time.perf_counter() - started)
+    if prepared.seconds is not None:
+        logger.debug(
+            "Voice upload %s: %d -> %d bytes, %.1fs -> %.1fs", filename, prepared.original_bytes,
+            len(prepared.audio), prepared.original_seconds, prepared.seconds
+        )
+    return prepared
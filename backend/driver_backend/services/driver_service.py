@@ -18,11 +18,14 @@ In simple terms — this service is the brain of the driver backend, managing al
 """
 from sqlalchemy.orm import Session
 from backend.driver_backend.repositories.driver_repository import DriverRepository
-from backend.driver_backend.repositories.shipment_repository import ShipmentRepository
+from backend.driver_backend.repositories.shipment_repository import ShipmentRepository, ACTIVE_STATUSES
 from backend.driver_backend.repositories.tracking_repository import TrackingRepository
 from backend.shared.utils import verify_password, create_access_token
 from fastapi import HTTPException, status
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from datetime import date
+from backend.shared.http_cache import Version
+from backend.shared.metrics import GPS_POINTS
 
 class DriverService:
     """Business logic for driver operations"""
@@ -84,7 +87,7 @@ class DriverService:
         # Get last known location and current shipment
         last_location = None
         current_shipment = None
-        assigned_shipments = self.shipment_repo.get_assigned_shipments(driver_id)
+        assigned_shipments = self.shipment_repo.get_assigned_shipment_rows(driver_id, limit=1)
         
         if assigned_shipments:
             # Get first active shipment as current
@@ -115,25 +118,54 @@ class DriverService:
             "last_known_location": last_location,
             "current_shipment": current_shipment  # Added this field
         }   
+
+    def get_dashboard_version(self, driver_id: int) -> Version:
+        """Cheap version of get_dashboard_data for conditional GETs"""
+        updated_at, *checksums = self.shipment_repo.get_driver_version(driver_id)
+        last_ping, last_ping_id = self.tracking_repo.get_driver_tracking_version(driver_id, ACTIVE_STATUSES)
+        last_modified = max([t for t in (updated_at, last_ping) if t], default=None)
+        # Today's date is part of the version: "deliveries today" resets at midnight
+        return (
+            ("dashboard", driver_id, date.today(), updated_at, *checksums, last_ping, last_ping_id),
+            last_modified
+        )
+
     def update_location(
         self,
         latitude: float,
         longitude: float,
         shipment_id: Optional[int] = None,
-        location_name: Optional[str] = None
+        location_name: Optional[str] = None,
+        driver_id: Optional[int] = None
     ) -> Dict:
         """Update driver location"""
         if shipment_id:
+            GPS_POINTS.inc("http")
             self.tracking_repo.create_tracking_entry(
                 shipment_id=shipment_id,
                 latitude=latitude,
                 longitude=longitude,
                 location_name=location_name,
-                status_update="Location updated by driver"
+                status_update="Location updated by driver",
+                driver_id=driver_id
             )
         
         return {
             "message": "Location updated successfully",
             "latitude": latitude,
             "longitude": longitude
-        }
\ No newline at end of file
+        }
+
+    def update_locations_batch(self, driver_id: int, points: List[Dict]) -> int:
+        """Persist a batch of streamed GPS points (location WebSocket)"""
+        stored = self.tracking_repo.create_tracking_entries(
+            points,
+            driver_id=driver_id,
+            status_update="Location streamed by driver"
+        )
+        GPS_POINTS.inc("ws", amount=stored)
+        return stored
+
+    def get_assigned_shipment_ids(self, driver_id: int) -> List[int]:
+        """IDs of active shipments the driver may report locations for"""
+        return self.shipment_repo.get_assigned_shipment_ids(driver_id)
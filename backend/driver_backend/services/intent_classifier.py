@@ -0,0 +1,254 @@
+"""
+Intent Classifier - local fast path for driver voice commands
+This file resolves most voice commands on the server itself, before (and usually instead of) the GPT call.
+
+SUPPORTED_COMMANDS holds the example utterances per intent; /voice/supported-commands returns it and the classifier learns from it.
+
+Tier 1 is a set of compiled regex grammars ("mark SHP123 as delivered") that also pull out entities: shipment_id, status, amount, reason.
+
+Tier 2 is a small scikit-learn model (character TF-IDF + logistic regression) trained from the examples on first use, in a few milliseconds.
+
+classify() returns intent, entities and a confidence; below VOICE_INTENT_CONFIDENCE_THRESHOLD the voice service asks the LLM instead.
+
+Every supported intent changes a shipment, so only a grammar match may act without the LLM; the model's answer is capped below the threshold and serves as a hint.
+
+A negated or cancelled command ("don't mark SHP9 as delivered", "cancel pickup for SHP7", "I was not able to deliver") is never resolved locally: confidence 0, the LLM decides.
+
+Without scikit-learn installed only the regex tier runs (the LLM covers the rest).
+
+In simple words — this file understands the common driver commands locally in about a millisecond, so GPT is only needed for the unusual ones.
+"""
+import logging
+import re
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Examples per intent: shown to drivers and used as training data
+SUPPORTED_COMMANDS = [
+    {
+        "intent": "confirm_pickup",
+        "examples": [
+            "Confirm pickup for shipment SHP123",
+            "I've picked up order SHP123",
+            "Pickup done for SHP123"
+        ]
+    },
+    {
+        "intent": "confirm_delivery",
+        "examples": [
+            "Delivered shipment SHP123",
+            "Mark SHP123 as delivered",
+            "Delivery complete for SHP123"
+        ]
+    },
+    {
+        "intent": "update_status",
+        "examples": [
+            "Update SHP123 to in transit",
+            "Mark SHP123 as out for delivery"
+        ]
+    },
+    {
+        "intent": "report_delay",
+        "examples": [
+            "I'm running late due to traffic",
+            "Delayed because of vehicle issue",
+            "Traffic jam on highway"
+        ]
+    },
+    {
+        "intent": "update_cod",
+        "examples": [
+            "Collected 500 rupees for SHP123",
+            "COD amount 1000 for shipment SHP456"
+        ]
+    }
+]
+
+# Not shown to drivers: extra phrasings and an explicit "unknown" class so the model
+# can say "none of these" instead of forcing the closest intent
+_EXTRA_EXAMPLES = {
+    "confirm_pickup": ["Picked up SHP123", "Got the package for SHP123", "Collected parcel SHP123 from sender"],
+    "confirm_delivery": ["SHP123 delivered", "Handed over SHP123 to the customer", "Dropped off SHP123"],
+    "update_status": ["SHP123 is in transit now", "Set SHP123 to out for delivery", "Change status of SHP123"],
+    "report_delay": ["Stuck in traffic", "Vehicle broke down", "I will be late because of rain",
+                     "Road is blocked"],
+    "update_cod": ["Received cash 250 for SHP123", "Customer paid 700 rupees", "Cash collected 300"],
+    "unknown": ["What's the weather today", "Play some music", "Hello", "Call my manager",
+                "How far is the next stop", "Thank you",
+                # Negated / cancelled commands look like their intent but must not trigger it
+                "Don't mark SHP123 as delivered", "Cancel pickup for SHP123", "I was not able to deliver SHP123",
+                "Undo delivery for SHP123", "SHP123 is not picked up yet", "Customer was not home for SHP123"],
+}
+
+# Negation or cancellation anywhere in the command: never act on it locally
+NEGATION = re.compile(
+    r"\b(?:not|no|never|don['’]?t|do not|didn['’]?t|did not|doesn['’]?t|can['’]?t|cannot|couldn['’]?t|"
+    r"wasn['’]?t|weren['’]?t|isn['’]?t|haven['’]?t|hasn['’]?t|won['’]?t|unable|failed|"
+    r"cancel(?:l?ed)?|undo|revert|wrong|mistake)\b",
+    re.I
+)
+
+_SHIPMENT = r"(?P<shipment_id>SH(?:I)?P[-_ ]?\d+)"
+_AMOUNT = r"(?P<amount>\d+(?:\.\d+)?)"
+_STATUS = r"(?P<status>in[- ]transit|out for delivery|picked up|delivered)"
+
+# (intent, pattern): first match wins, so the specific grammars come first
+GRAMMARS = [
+    ("update_cod", re.compile(rf"\b(?:collected|received|cod(?: amount)?)\b\D*{_AMOUNT}.*?{_SHIPMENT}", re.I)),
+    ("update_cod", re.compile(rf"{_SHIPMENT}.*?\b(?:cod|cash)\b\D*{_AMOUNT}", re.I)),
+    ("update_status", re.compile(rf"\b(?:update|set|mark|change)\b.*?{_SHIPMENT}.*?\b(?:to|as)\s+"
+                                 rf"(?P<status>in[- ]transit|out for delivery)\b", re.I)),
+    ("confirm_delivery", re.compile(rf"\b(?:mark|set)\s+{_SHIPMENT}\s+as\s+delivered\b", re.I)),
+    ("confirm_delivery", re.compile(rf"\b(?:delivered|delivery (?:complete|done))\b.*?{_SHIPMENT}", re.I)),
+    ("confirm_delivery", re.compile(rf"{_SHIPMENT}\s+(?:is\s+|has been\s+)?delivered\b", re.I)),
+    ("confirm_pickup", re.compile(rf"\b(?:confirm pickup|pickup (?:done|complete)|picked up)\b.*?{_SHIPMENT}", re.I)),
+    ("confirm_pickup", re.compile(rf"{_SHIPMENT}\s+(?:is\s+|has been\s+)?picked up\b", re.I)),
+    ("report_delay", re.compile(r"\b(?:late|delay(?:ed)?|stuck)\b.*?\b(?:due to|because of)\s+(?P<reason>.+)", re.I)),
+    ("report_delay", re.compile(r"\b(?P<reason>traffic jam|traffic|vehicle (?:issue|breakdown)|broke down|accident)\b", re.I)),
+]
+
+_ENTITY_PATTERNS = {
+    "shipment_id": re.compile(_SHIPMENT, re.I),
+    "amount": re.compile(rf"\b{_AMOUNT}\b"),
+    "status": re.compile(_STATUS, re.I),
+}
+
+GRAMMAR_CONFIDENCE = 0.97
+# The model's answer for a state-changing intent stays below VOICE_INTENT_CONFIDENCE_THRESHOLD
+MODEL_WRITE_CONFIDENCE_CAP = 0.5
+# Intents the model may return without the entities their action needs = not confident
+REQUIRED_ENTITIES = {
+    "confirm_pickup": ("shipment_id",),
+    "confirm_delivery": ("shipment_id",),
+    "update_status": ("shipment_id", "status"),
+    "update_cod": ("shipment_id", "amount"),
+}
+# Intents that change a shipment: only a grammar match may resolve them without the LLM
+WRITE_INTENTS = frozenset(("confirm_pickup", "confirm_delivery", "update_status", "update_cod", "report_delay"))
+
+
+def _normalize_entities(entities: Dict[str, str]) -> Dict[str, str]:
+    normalized = {}
+    for key, value in entities.items():
+        if value is None:
+            continue
+        value = value.strip().rstrip(".!")
+        if key == "shipment_id":
+            value = re.sub(r"[-_ ]", "", value.upper()).replace("SHIP", "SHP")
+        elif key == "status":
+            value = re.sub(r"[- ]", "_", value.upper())
+        normalized[key] = value
+    return normalized
+
+
+def extract_entities(text: str) -> Dict[str, str]:
+    """Whatever shipment id / amount / status the utterance mentions"""
+    entities = {}
+    shipment = _ENTITY_PATTERNS["shipment_id"].search(text)
+    if shipment:
+        entities["shipment_id"] = shipment.group("shipment_id")
+        text = text.replace(shipment.group(0), " ")  # "SHP123" is not an amount
+    for key in ("amount", "status"):
+        match = _ENTITY_PATTERNS[key].search(text)
+        if match:
+            entities[key] = match.group(key)
+    return _normalize_entities(entities)
+
+
+def _model_text(text: str) -> str:
+    """Shipment ids and numbers become placeholders so the model learns the phrasing"""
+    text = _ENTITY_PATTERNS["shipment_id"].sub(" shpref ", text.lower())
+    return re.sub(r"\d+(?:\.\d+)?", " num ", text)
+
+
+class IntentClassifier:
+    """Regex grammars, then the TF-IDF model; the model is trained on first use"""
+
+    def __init__(self, commands: Optional[List[Dict]] = None):
+        self.commands = commands or SUPPORTED_COMMANDS
+        self._model = None
+        self._model_ready = False
+        self._lock = threading.Lock()
+
+    def _training_data(self):
+        texts, labels = [], []
+        for command in self.commands:
+            for example in command["examples"]:
+                texts.append(_model_text(example))
+                labels.append(command["intent"])
+        for intent, examples in _EXTRA_EXAMPLES.items():
+            texts.extend(_model_text(example) for example in examples)
+            labels.extend([intent] * len(examples))
+        return texts, labels
+
+    def _get_model(self):
+        if not self._model_ready:
+            with self._lock:
+                if not self._model_ready:
+                    self._model = self._train()
+                    self._model_ready = True
+        return self._model
+
+    def _train(self):
+        try:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            from sklearn.linear_model import LogisticRegression
+            from sklearn.pipeline import make_pipeline
+        except ImportError:
+            logger.warning("scikit-learn not installed; local intent classification uses regex grammars only")
+            return None
+        texts, labels = self._training_data()
+        model = make_pipeline(
+            # Character n-grams tolerate transcription slips ("pick up" / "picked-up")
+            TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True),
+            LogisticRegression(C=20.0, max_iter=1000)
+        )
+        model.fit(texts, labels)
+        return model
+
+    @property
+    def ready(self) -> bool:
+        """Model trained (classify() no longer imports or fits anything)"""
+        return self._model_ready
+
+    def warm_up(self) -> None:
+        """Train now instead of on the first voice command"""
+        self._get_model()
+
+    def classify(self, text: str) -> Dict:
+        """{"intent", "entities", "confidence", "source": "negation" | "grammar" | "model"}"""
+        entities = extract_entities(text)
+
+        if NEGATION.search(text):
+            return {"intent": "unknown", "entities": entities, "confidence": 0.0, "source": "negation"}
+
+        for intent, grammar in GRAMMARS:
+            match = grammar.search(text)
+            if match:
+                found = {key: value for key, value in match.groupdict().items() if value}
+                return {
+                    "intent": intent,
+                    "entities": dict(entities, **_normalize_entities(found)),
+                    "confidence": GRAMMAR_CONFIDENCE,
+                    "source": "grammar"
+                }
+
+        model = self._get_model()
+        if model is None:
+            return {"intent": "unknown", "entities": entities, "confidence": 0.0, "source": "model"}
+        probabilities = model.predict_proba([_model_text(text)])[0]
+        best = probabilities.argmax()
+        intent = model.classes_[best]
+        confidence = float(probabilities[best])
+        missing = [key for key in REQUIRED_ENTITIES.get(intent, ()) if key not in entities]
+        if missing:
+            confidence *= 0.5  # Right intent perhaps, but nothing to act on
+        if intent in WRITE_INTENTS:
+            confidence = min(confidence, MODEL_WRITE_CONFIDENCE_CAP)
+        return {"intent": intent, "entities": entities, "confidence": round(confidence, 3), "source": "model"}
+
+
+intent_classifier = IntentClassifier()
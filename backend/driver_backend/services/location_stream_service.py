@@ -0,0 +1,194 @@
+"""
+Location Stream Service - Long-lived driver location ingest
+This file contains the logic behind the driver location WebSocket.
+
+The driver authenticates once when the socket opens; after that every frame is just a GPS point.
+
+parse_location_frame() accepts compact JSON frames or packed binary frames (several points per frame).
+
+TokenBucket enforces a per-connection rate limit so one phone cannot flood the tracking table.
+
+LocationStreamSession owns a bounded queue between the socket reader and the DB writer.
+
+When the queue is full the reader simply stops reading, so TCP backpressure slows the phone down.
+
+The writer drains the queue in batches and hands them to DriverService in a worker thread.
+
+In simple words — this file turns a stream of tiny GPS frames into batched tracking inserts and event bus updates.
+"""
+import asyncio
+import json
+import logging
+import struct
+import time
+from typing import Dict, List, Optional, Set
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.database import SessionLocal
+from backend.driver_backend.services.driver_service import DriverService
+
+logger = logging.getLogger(__name__)
+
+# Binary frame: repeated (shipment_id: uint32, latitude: float64, longitude: float64), little endian
+BINARY_POINT = struct.Struct("<Idd")
+
+# How often an unknown shipment id may trigger a reload of the driver's assignments
+ASSIGNMENT_REFRESH_SECONDS = 30.0
+
+
+class FrameError(ValueError):
+    """Raised when a frame cannot be decoded into location points"""
+
+
+def _point(shipment_id, latitude, longitude, location_name=None) -> Dict:
+    try:
+        shipment_id = int(shipment_id)
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (TypeError, ValueError):
+        raise FrameError("shipment id and coordinates must be numeric")
+
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise FrameError("coordinates out of range")
+
+    return {
+        "shipment_id": shipment_id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "location_name": location_name
+    }
+
+
+def parse_location_frame(text: Optional[str] = None, data: Optional[bytes] = None) -> List[Dict]:
+    """
+    Decode one WebSocket frame into location points.
+
+    JSON:   {"s": 12, "lat": 19.07, "lng": 72.87, "n": "Andheri"} or a list of those
+    Binary: N x BINARY_POINT packed back to back
+    """
+    if data is not None:
+        if not data or len(data) % BINARY_POINT.size:
+            raise FrameError(f"binary frames must be a multiple of {BINARY_POINT.size} bytes")
+        return [_point(*fields) for fields in BINARY_POINT.iter_unpack(data)]
+
+    try:
+        payload = json.loads(text)
+    except (TypeError, ValueError):
+        raise FrameError("invalid JSON frame")
+
+    items = payload if isinstance(payload, list) else [payload]
+    points = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise FrameError("each point must be an object")
+        points.append(_point(item.get("s"), item.get("lat"), item.get("lng"), item.get("n")))
+    return points
+
+
+class TokenBucket:
+    """Per-connection rate limiter (points per second with a burst allowance)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def consume(self, amount: int = 1) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+
+class LocationStreamSession:
+    """State for one authenticated driver connection"""
+
+    def __init__(self, driver_id: int):
+        self.driver_id = driver_id
+        self.bucket = TokenBucket(settings.WS_LOCATION_MAX_RATE, settings.WS_LOCATION_BURST)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_LOCATION_QUEUE_SIZE)
+        self.allowed_shipments: Set[int] = set()
+        self._assignments_loaded_at = 0.0
+        self.accepted = 0
+        self.dropped = 0
+
+    # -------------------- ASSIGNMENTS --------------------
+    async def load_assignments(self) -> None:
+        self.allowed_shipments = set(await run_in_threadpool(self._fetch_assignments))
+        self._assignments_loaded_at = time.monotonic()
+
+    def _fetch_assignments(self) -> List[int]:
+        db = SessionLocal()
+        try:
+            return DriverService(db).get_assigned_shipment_ids(self.driver_id)
+        finally:
+            db.close()
+
+    async def is_allowed(self, shipment_id: int) -> bool:
+        if shipment_id in self.allowed_shipments:
+            return True
+        if time.monotonic() - self._assignments_loaded_at >= ASSIGNMENT_REFRESH_SECONDS:
+            await self.load_assignments()
+        return shipment_id in self.allowed_shipments
+
+    # -------------------- INGEST --------------------
+    async def enqueue(self, points: List[Dict]) -> List[str]:
+        """
+        Rate-limit, authorize and queue points. Blocks while the queue is full,
+        which stops the socket reader and pushes back on the client.
+        Returns a list of rejection reasons (empty when everything was accepted).
+        """
+        errors = []
+        for point in points:
+            if not self.bucket.consume():
+                self.dropped += 1
+                errors.append("rate_limited")
+                continue
+            if not await self.is_allowed(point["shipment_id"]):
+                self.dropped += 1
+                errors.append(f"shipment {point['shipment_id']} not assigned")
+                continue
+            await self.queue.put(point)
+        return errors
+
+    # -------------------- WRITER --------------------
+    async def run_writer(self, on_flush=None) -> None:
+        """Drain the queue in batches until cancelled; flushes the remainder on cancel"""
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                await self._flush(self._drain(batch), on_flush)
+        except asyncio.CancelledError:
+            while not self.queue.empty():
+                await self._flush(self._drain([]), on_flush)
+            raise
+
+    def _drain(self, batch: List[Dict]) -> List[Dict]:
+        while len(batch) < settings.WS_LOCATION_BATCH_SIZE and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: List[Dict], on_flush) -> None:
+        try:
+            written = await run_in_threadpool(self._write_batch, batch)
+        except Exception:
+            # Losing one batch of GPS points is better than wedging the connection
+            logger.exception("Failed to persist %d streamed points for driver %s", len(batch), self.driver_id)
+            self.dropped += len(batch)
+            return
+        self.accepted += written
+        if on_flush is not None:
+            await on_flush(written)
+
+    def _write_batch(self, batch: List[Dict]) -> int:
+        db = SessionLocal()
+        try:
+            return DriverService(db).update_locations_batch(self.driver_id, batch)
+        finally:
+            db.close()
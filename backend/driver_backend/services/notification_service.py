@@ -0,0 +1,410 @@
+"""
+Notification Service - Customer notifications for shipment status changes
+This file contains the asyncio notification dispatcher used by the driver backend.
+
+Every status transition goes through the transactional outbox; the dispatcher consumes it from the outbox relay of its own process, not from the bus.
+
+Each outbox row is relayed by exactly one process, so with any number of workers (and a Redis bus) a customer is notified once; repeated event_ids are dropped.
+
+Publishing only schedules work on the event loop, so notifications never add latency to a driver's request.
+
+Rapid successive updates for the same customer are coalesced into one message per coalescing window.
+
+Due messages are looked up in one DB query, batched per channel and sent concurrently.
+
+Channels are pluggable: SMS (Twilio), email (pooled aiosmtplib connections), push (HTTP gateway) and a log/file stand-in.
+
+Failed sends are retried with exponential backoff.
+
+In simple words — this file tells customers what happened to their shipment without ever slowing the driver down.
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.database import SessionLocal
+from backend.shared.health import register_queue
+from backend.shared.metrics import gauge
+from backend.shared.models import Shipment, User
+from backend.shared.outbox import OutboxRelay, outbox_relay
+
+logger = logging.getLogger(__name__)
+
+# Recent outbox event ids remembered to drop redeliveries
+SEEN_EVENTS_MAX = 10000
+
+
+class Notification:
+    """One outgoing message on one channel"""
+
+    __slots__ = ("channel", "recipient", "subject", "body", "customer_id")
+
+    def __init__(self, channel: str, recipient: str, subject: str, body: str, customer_id: int):
+        self.channel = channel
+        self.recipient = recipient
+        self.subject = subject
+        self.body = body
+        self.customer_id = customer_id
+
+    def to_dict(self) -> Dict:
+        return {
+            "channel": self.channel,
+            "to": self.recipient,
+            "subject": self.subject,
+            "body": self.body,
+            "customer_id": self.customer_id
+        }
+
+
+# ==================== CHANNELS ====================
+class NotificationChannel:
+    """Base channel; send_batch returns the notifications that failed"""
+
+    name = "base"
+    contact_field = None  # "email" or "phone" on User; None = customer id
+
+    async def send_batch(self, notifications: List[Notification]) -> List[Notification]:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class LogChannel(NotificationChannel):
+    """Local stand-in: appends JSON lines to a file, or to the application log"""
+
+    name = "log"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+
+    async def send_batch(self, notifications: List[Notification]) -> List[Notification]:
+        lines = [json.dumps(n.to_dict()) for n in notifications]
+        if self.path:
+            await run_in_threadpool(self._append, lines)
+        else:
+            for line in lines:
+                logger.info("notification %s", line)
+        return []
+
+    def _append(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class SMSChannel(NotificationChannel):
+    """Twilio SMS; the SDK is synchronous so each send runs in a worker thread"""
+
+    name = "sms"
+    contact_field = "phone"
+
+    def __init__(self, concurrency: int = 8):
+        from twilio.rest import Client
+        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_batch(self, notifications: List[Notification]) -> List[Notification]:
+        results = await asyncio.gather(*(self._send(n) for n in notifications))
+        return [n for n, ok in zip(notifications, results) if not ok]
+
+    async def _send(self, notification: Notification) -> bool:
+        async with self.semaphore:
+            try:
+                await run_in_threadpool(
+                    self.client.messages.create,
+                    to=notification.recipient,
+                    from_=settings.TWILIO_FROM_NUMBER,
+                    body=notification.body
+                )
+                return True
+            except Exception:
+                logger.warning("SMS to %s failed", notification.recipient, exc_info=True)
+                return False
+
+
+class EmailChannel(NotificationChannel):
+    """SMTP email over a small pool of persistent aiosmtplib connections"""
+
+    name = "email"
+    contact_field = "email"
+
+    def __init__(self, pool_size: Optional[int] = None):
+        self.pool_size = pool_size or settings.SMTP_POOL_SIZE
+        self._pool: Optional[asyncio.Queue] = None
+
+    def _new_client(self):
+        import aiosmtplib
+        return aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD
+        )
+
+    def _ensure_pool(self) -> asyncio.Queue:
+        if self._pool is None:
+            self._pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._pool.put_nowait(self._new_client())
+        return self._pool
+
+    async def send_batch(self, notifications: List[Notification]) -> List[Notification]:
+        pool = self._ensure_pool()
+        # Split the batch across pooled connections
+        chunks = [notifications[i::self.pool_size] for i in range(self.pool_size)]
+        results = await asyncio.gather(*(self._send_chunk(pool, c) for c in chunks if c))
+        return [n for failed in results for n in failed]
+
+    async def _send_chunk(self, pool: asyncio.Queue, notifications: List[Notification]) -> List[Notification]:
+        client = await pool.get()
+        failed = []
+        try:
+            for notification in notifications:
+                try:
+                    if not client.is_connected:
+                        await client.connect()
+                    await client.send_message(self._build_message(notification))
+                except Exception:
+                    logger.warning("Email to %s failed", notification.recipient, exc_info=True)
+                    failed.append(notification)
+                    client = self._new_client()  # Drop the broken connection
+        finally:
+            pool.put_nowait(client)
+        return failed
+
+    def _build_message(self, notification: Notification) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = settings.SMTP_FROM
+        message["To"] = notification.recipient
+        message["Subject"] = notification.subject
+        message.set_content(notification.body)
+        return message
+
+    async def close(self) -> None:
+        if self._pool is None:
+            return
+        while not self._pool.empty():
+            client = self._pool.get_nowait()
+            if client.is_connected:
+                try:
+                    await client.quit()
+                except Exception:
+                    pass
+
+
+class PushChannel(NotificationChannel):
+    """Posts each batch to a push gateway (FCM/APNs relay) as one JSON request"""
+
+    name = "push"
+
+    def __init__(self, url: Optional[str] = None):
+        import httpx
+        self.url = url or settings.PUSH_GATEWAY_URL
+        self.client = httpx.AsyncClient(timeout=5.0)
+
+    async def send_batch(self, notifications: List[Notification]) -> List[Notification]:
+        try:
+            response = await self.client.post(self.url, json=[n.to_dict() for n in notifications])
+            response.raise_for_status()
+            return []
+        except Exception:
+            logger.warning("Push batch of %d failed", len(notifications), exc_info=True)
+            return notifications
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+CHANNEL_FACTORIES = {
+    "log": lambda: LogChannel(settings.NOTIFICATION_LOG_PATH),
+    "sms": SMSChannel,
+    "email": EmailChannel,
+    "push": PushChannel,
+}
+
+
+def build_channels(names: Optional[str] = None) -> List[NotificationChannel]:
+    """Instantiate channels from a comma separated list (Settings.NOTIFICATION_CHANNELS)"""
+    names = names if names is not None else settings.NOTIFICATION_CHANNELS
+    return [CHANNEL_FACTORIES[name.strip()]() for name in names.split(",") if name.strip()]
+
+
+# ==================== DISPATCHER ====================
+class NotificationDispatcher:
+    """
+    Coalescing, batching dispatcher.
+    submit() is thread-safe and only schedules work on the dispatcher's loop.
+    """
+
+    def __init__(
+        self,
+        channels: Optional[List[NotificationChannel]] = None,
+        coalesce_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_retries: Optional[int] = None
+    ):
+        self.channels = channels
+        self.coalesce_seconds = coalesce_seconds if coalesce_seconds is not None else settings.NOTIFY_COALESCE_SECONDS
+        self.batch_size = batch_size or settings.NOTIFY_BATCH_SIZE
+        self.max_retries = max_retries if max_retries is not None else settings.NOTIFY_MAX_RETRIES
+
+        # customer_id -> (first_seen, OrderedDict[shipment_id -> status])
+        self._pending: Dict[int, tuple] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._sends: set = set()
+        self._unsubscribe = None
+        self._seen_events: OrderedDict = OrderedDict()
+
+    # -------------------- LIFECYCLE --------------------
+    def start(self, relay: Optional[OutboxRelay] = None) -> None:
+        """Start the flush loop and consume status events from the outbox relay"""
+        if self.channels is None:
+            self.channels = build_channels()
+        self._loop = asyncio.get_running_loop()
+        self._flusher = self._loop.create_task(self._run())
+        self._unsubscribe = (relay or outbox_relay).add_consumer(self._on_event)
+
+    async def stop(self) -> None:
+        """Stop listening, flush everything pending and wait for in-flight sends"""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush(force=True)
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+        for channel in self.channels or []:
+            await channel.close()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    # -------------------- INTAKE --------------------
+    def _on_event(self, event: dict) -> None:
+        if event.get("type") == "status" and event.get("customer_id"):
+            self.submit(event["customer_id"], event["shipment_id"], event["status"], event.get("event_id"))
+
+    def submit(self, customer_id: int, shipment_id: int, status: str, event_id: Optional[int] = None) -> None:
+        """Queue a status update for a customer; safe to call from any thread"""
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._add, customer_id, shipment_id, status, event_id)
+
+    def _add(self, customer_id: int, shipment_id: int, status: str, event_id: Optional[int] = None) -> None:
+        if event_id is not None:
+            if event_id in self._seen_events:
+                return  # Redelivered by the outbox
+            self._seen_events[event_id] = None
+            if len(self._seen_events) > SEEN_EVENTS_MAX:
+                self._seen_events.popitem(last=False)
+        entry = self._pending.get(customer_id)
+        if entry is None:
+            entry = (time.monotonic(), OrderedDict())
+            self._pending[customer_id] = entry
+        updates = entry[1]
+        updates.pop(shipment_id, None)  # Keep only the latest status per shipment
+        updates[shipment_id] = status
+
+    # -------------------- FLUSH --------------------
+    async def _run(self) -> None:
+        tick = max(self.coalesce_seconds / 4, 0.05)
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Notification flush failed")
+
+    async def flush(self, force: bool = False) -> None:
+        """Send every customer whose coalescing window has elapsed (or all, if force)"""
+        now = time.monotonic()
+        due = {
+            customer_id: updates
+            for customer_id, (first_seen, updates) in list(self._pending.items())
+            if force or now - first_seen >= self.coalesce_seconds
+        }
+        if not due or not self.channels:
+            return
+
+        # A failed lookup leaves everything pending for the next flush
+        contacts, numbers = await run_in_threadpool(self._load_contacts, due)
+        for customer_id, updates in due.items():
+            entry = self._pending.get(customer_id)
+            if entry is not None and entry[1] is updates:  # Updates that arrived meanwhile went into `updates`
+                del self._pending[customer_id]
+        for channel in self.channels:
+            notifications = [
+                self._build(channel, customer_id, updates, contacts.get(customer_id), numbers)
+                for customer_id, updates in due.items()
+            ]
+            notifications = [n for n in notifications if n is not None]
+            for i in range(0, len(notifications), self.batch_size):
+                task = asyncio.create_task(self._send_with_retry(channel, notifications[i:i + self.batch_size]))
+                self._sends.add(task)
+                task.add_done_callback(self._sends.discard)
+
+    def _load_contacts(self, due: Dict[int, OrderedDict]):
+        """One query for recipients and one for shipment numbers"""
+        shipment_ids = {sid for updates in due.values() for sid in updates}
+        db = SessionLocal()
+        try:
+            users = db.query(User.id, User.full_name, User.email, User.phone).filter(
+                User.id.in_(list(due))
+            ).all()
+            shipments = db.query(Shipment.id, Shipment.shipment_number).filter(
+                Shipment.id.in_(list(shipment_ids))
+            ).all()
+        finally:
+            db.close()
+        contacts = {u.id: {"full_name": u.full_name, "email": u.email, "phone": u.phone} for u in users}
+        return contacts, {s.id: s.shipment_number for s in shipments}
+
+    def _build(self, channel, customer_id, updates, contact, numbers) -> Optional[Notification]:
+        if channel.contact_field is None:
+            recipient = str(customer_id)
+        else:
+            recipient = (contact or {}).get(channel.contact_field)
+            if not recipient:
+                return None
+
+        lines = [
+            f"Shipment {numbers.get(sid, sid)} is now {str(status).replace('_', ' ').title()}"
+            for sid, status in updates.items()
+        ]
+        subject = lines[0] if len(lines) == 1 else f"{len(lines)} shipment updates"
+        name = (contact or {}).get("full_name")
+        body = (f"Hi {name},\n" if name else "") + "\n".join(lines)
+        return Notification(channel.name, recipient, subject, body, customer_id)
+
+    async def _send_with_retry(self, channel: NotificationChannel, batch: List[Notification]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                batch = await channel.send_batch(batch)
+            except Exception:
+                logger.warning("Channel %s raised while sending", channel.name, exc_info=True)
+            if not batch:
+                return
+            if attempt < self.max_retries:
+                await asyncio.sleep(settings.NOTIFY_RETRY_BASE_SECONDS * (2 ** attempt))
+        logger.error("Giving up on %d %s notifications", len(batch), channel.name)
+
+
+# Process-wide dispatcher, started by the driver backend on startup
+notification_dispatcher = NotificationDispatcher()
+gauge(
+    "notification_queue_depth", "Notifications waiting to be coalesced and sent",
+    lambda: notification_dispatcher.queue_depth
+)
+register_queue("notifications", lambda: notification_dispatcher.queue_depth)
@@ -22,6 +22,16 @@ from backend.driver_backend.repositories.tracking_repository import TrackingRepo
 from backend.driver_backend.utils.enums import ShipmentStatus, CustomsStatus
 from fastapi import HTTPException, status
 from typing import List, Dict, Optional
+from backend.shared.http_cache import Version
+from backend.shared.serialization import projection, enum_value
+
+# Row -> dict for the driver's shipment list (matches ShipmentListResponse)
+SHIPMENT_LIST_PROJECTION = projection(
+    "id", "shipment_number", "pickup_location", "delivery_location",
+    "estimated_delivery", "is_cod", "cod_amount",
+    status=enum_value,
+    shipment_type=enum_value
+)
 
 class ShipmentService:
     """Business logic for shipment operations"""
@@ -33,12 +43,17 @@ class ShipmentService:
     
     def get_assigned_shipments(self, driver_id: int) -> List[Dict]:
         """Get all assigned shipments for driver"""
-        shipments = self.shipment_repo.get_assigned_shipments(driver_id)
+        shipments = self.shipment_repo.get_assigned_shipment_rows(driver_id)
         return [self._format_shipment(s) for s in shipments]
     
+    def get_assigned_shipments_version(self, driver_id: int) -> Version:
+        """Cheap version of get_assigned_shipments for conditional GETs"""
+        updated_at, *checksums = self.shipment_repo.get_assigned_version(driver_id)
+        return ("assigned", driver_id, updated_at, *checksums), updated_at
+    
     def get_shipment_details(self, shipment_id: int, driver_id: int) -> Dict:
         """Get detailed shipment information"""
-        shipment = self.shipment_repo.get_shipment_by_id(shipment_id)
+        shipment = self.shipment_repo.get_shipment_detail(shipment_id)
         
         if not shipment:
             raise HTTPException(
@@ -54,6 +69,16 @@ class ShipmentService:
         
         return self._format_shipment_detail(shipment)
     
+    def get_shipment_id(self, shipment_number: str) -> int:
+        """Resolve a spoken tracking number ("SHP123") to the shipment ID"""
+        shipment_id = self.shipment_repo.get_shipment_id_by_number(shipment_number)
+        if shipment_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Shipment {shipment_number} not found"
+            )
+        return shipment_id
+
     def mark_picked_up(self, shipment_id: int, driver_id: int, notes: Optional[str]) -> Dict:
         """Mark shipment as picked up"""
         shipment = self._validate_shipment_access(shipment_id, driver_id)
@@ -278,17 +303,7 @@ class ShipmentService:
 
     def _format_shipment(self, shipment) -> Dict:
         """Format shipment for list view"""
-        return {
-            "id": shipment.id,
-            "shipment_number": shipment.shipment_number,
-            "pickup_location": shipment.pickup_location,
-            "delivery_location": shipment.delivery_location,
-            "status": shipment.status.value if shipment.status else None,
-            "estimated_delivery": shipment.estimated_delivery,
-            "is_cod": shipment.is_cod,
-            "cod_amount": shipment.cod_amount,
-            "shipment_type": shipment.shipment_type.value if shipment.shipment_type else None
-        }
+        return SHIPMENT_LIST_PROJECTION(shipment)
 
     def _format_shipment_detail(self, shipment) -> Dict:
         """Format shipment for detail view"""
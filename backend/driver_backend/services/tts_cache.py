@@ -0,0 +1,177 @@
+"""
+TTS Cache - disk cache for synthesized voice replies
+This file keeps every text-to-speech result on disk so a repeated sentence is never synthesized twice.
+
+Most replies are templated confirmations ("Pickup confirmed for shipment ..."), so the same audio is requested over and over.
+
+Files are named by a SHA-256 of (provider, model, voice, text): same input, same file, no index to keep in sync.
+
+A cache hit touches the file's mtime; when the directory grows past TTS_CACHE_MAX_MB the least recently used files are deleted.
+
+tee() passes provider chunks to the client while writing them to a temp file; only a complete stream is renamed into the cache.
+
+file_response() serves a cached file with Range support (206 / 416), so audio players can seek without downloading everything again.
+
+In simple words — this file remembers spoken replies and plays them back from disk instead of paying for them again.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_BYTES = 64 * 1024
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class TTSCache:
+    """Content-addressed MP3 files under TTS_CACHE_DIR, size-bounded with LRU eviction"""
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or settings.TTS_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.TTS_CACHE_MAX_MB * 1024 * 1024
+        self._total: Optional[int] = None  # Bytes on disk; scanned on first write
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: str, model: str, voice: str, text: str) -> str:
+        return hashlib.sha256("\0".join((provider, model, voice, text)).encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.mp3"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Cached file (marked as recently used) or None"""
+        path = self.path(key)
+        try:
+            os.utime(path)  # LRU order = mtime
+        except FileNotFoundError:
+            record_cache("tts", False)
+            return None
+        record_cache("tts", True)
+        return path
+
+    async def tee(self, key: str, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Yield chunks to the client and cache them; an interrupted stream leaves nothing behind"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{uuid.uuid4().hex}.part")
+        size = 0
+        complete = False
+        # Buffered writes of provider-sized chunks land in the page cache in microseconds
+        with open(tmp, "wb") as out:
+            try:
+                async for chunk in chunks:
+                    out.write(chunk)
+                    size += len(chunk)
+                    yield chunk
+                complete = True
+            finally:
+                if not complete:
+                    out.close()
+                    tmp.unlink(missing_ok=True)
+        if complete:
+            os.replace(tmp, path)  # Concurrent misses for one key: last complete stream wins
+            await run_in_threadpool(self._added, size)
+
+    # -------------------- EVICTION --------------------
+    def _files(self) -> List[Tuple[float, int, Path]]:
+        files = []
+        for path in self.directory.glob("*/*.mp3"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def _added(self, size: int) -> None:
+        with self._lock:
+            if self._total is None:
+                self._total = sum(file_size for _, file_size, _ in self._files())
+            else:
+                self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used files down to 90% of the limit"""
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        for _, size, path in files:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._total = total
+
+
+# ==================== RESPONSES ====================
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end inclusive) for a single satisfiable byte range; ValueError when unsatisfiable"""
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None  # Multiple or malformed ranges: send the whole file (allowed by RFC 9110)
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)  # Suffix range: the last N bytes
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as audio:
+        audio.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = audio.read(min(READ_CHUNK_BYTES, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(path: Path, range_header: Optional[str], headers: Dict[str, str]) -> Response:
+    """Whole file, or 206 for a single byte range (416 when it is out of bounds)"""
+    headers = dict(headers, **{"Accept-Ranges": "bytes"})
+    size = path.stat().st_size
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers=dict(headers, **{"Content-Range": f"bytes */{size}"}))
+        if byte_range is not None:
+            start, end = byte_range
+            return StreamingResponse(
+                iterate_in_threadpool(_read_range(path, start, end)),
+                status_code=206,
+                media_type="audio/mpeg",
+                headers=dict(headers, **{
+                    "Content-Range": f"bytes {start}-{end}/{size}",
+                    "Content-Length": str(end - start + 1)
+                })
+            )
+    return FileResponse(path, media_type="audio/mpeg", headers=headers)
+
+
+tts_cache = TTSCache()
@@ -1,61 +1,32 @@
-import base64
+"""
+Voice Assistant Service - transcription, intent analysis and TTS for drivers
+Intents are resolved locally first (intent_classifier: regex grammars + TF-IDF model);
+the LLM is asked only below VOICE_INTENT_CONFIDENCE_THRESHOLD.
+Audio travels as raw bytes from the upload to the provider (no base64 round trip).
+Provider calls are awaited (never block the event loop), bounded by
+VOICE_PROVIDER_TIMEOUT_SECONDS and limited to VOICE_MAX_CONCURRENCY per process,
+so a burst of voice commands cannot starve the rest of the driver API.
+"""
+import asyncio
 import json
 import re
-import os
-from pathlib import Path
-from typing import Optional, Tuple
-from openai import OpenAI
-from io import BytesIO
-from dotenv import load_dotenv
+from typing import AsyncIterator, Optional
 
-# Load .env file explicitly
-env_path = Path(__file__).parent.parent.parent / '.env'
-load_dotenv(dotenv_path=env_path)
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 
-# Get API key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+from backend.shared.config import settings
+from backend.shared.metrics import counter
+from backend.driver_backend.services.intent_classifier import intent_classifier
+from backend.driver_backend.services.voice_providers import (
+    SpeechStream, VoiceProvider, VoiceProviderError, get_voice_provider
+)
 
-# Initialize OpenAI client
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY not found in environment variables. Please set it in .env file.")
-
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-class VoiceAssistantService:
-    
-    @staticmethod
-    async def transcribe_audio(audio_base64: str) -> str:
-        """
-        Convert base64 audio to text using OpenAI Whisper
-        """
-        try:
-            # Decode base64 audio
-            audio_bytes = base64.b64decode(audio_base64)
-            audio_file = BytesIO(audio_bytes)
-            audio_file.name = "audio.wav"  # Whisper needs a filename
-            
-            # Transcribe using Whisper
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="en"  # Change if needed
-            )
-            
-            return transcription.text
-            
-        except Exception as e:
-            raise Exception(f"Transcription failed: {str(e)}")
-    
-    @staticmethod
-    async def analyze_intent(transcription: str) -> dict:
-        """
-        Use GPT to understand driver's intent from transcription
-        """
-        system_prompt = """You are a logistics voice assistant for delivery drivers. 
+INTENT_SYSTEM_PROMPT = """You are a logistics voice assistant for delivery drivers.
         Analyze the driver's speech and extract:
         1. Intent (update_status, report_delay, request_help, get_route, report_issue, confirm_pickup, confirm_delivery, update_cod)
         2. Entities (shipment_id, status, reason, amount, etc.)
-        
+
         Respond ONLY in JSON format:
         {
             "intent": "intent_name",
@@ -63,44 +34,133 @@ class VoiceAssistantService:
             "confidence": 0.95
         }
         """
-        
+
+UNKNOWN_INTENT = {"intent": "unknown", "entities": {}, "confidence": 0.0}
+
+# voice_intents_total{source="local"|"llm"|"local_fallback"|"none"}: local / total = LLM calls saved
+VOICE_INTENTS = counter("voice_intents_total", "Voice command intents by resolving tier", ("source",))
+
+# Upper bound on provider calls in flight per process (created on first use)
+_provider_slots: Optional[asyncio.Semaphore] = None
+
+
+def _slots() -> asyncio.Semaphore:
+    global _provider_slots
+    if _provider_slots is None:
+        _provider_slots = asyncio.Semaphore(settings.VOICE_MAX_CONCURRENCY)
+    return _provider_slots
+
+
+class VoiceAssistantService:
+
+    def __init__(self, provider: Optional[VoiceProvider] = None):
+        self.provider = provider or get_voice_provider()
+
+    async def _call(self, what: str, func, *args, **kwargs):
+        """Await provider func(*args) within the concurrency limit and the overall deadline"""
+        async def limited():
+            async with _slots():
+                return await func(*args, **kwargs)
+
+        return await self._bounded(what, limited)
+
+    @staticmethod
+    async def _bounded(what: str, func):
+        """Await func() within the overall deadline; provider failures become 504/503"""
         try:
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Driver said: {transcription}"}
-                ],
-                temperature=0.3
+            return await asyncio.wait_for(func(), timeout=settings.VOICE_PROVIDER_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=f"{what} timed out"
             )
-            
-            result = json.loads(response.choices[0].message.content)
-            return result
-            
+        except VoiceProviderError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    async def transcribe_audio(self, audio: bytes, filename: str = "audio.wav") -> str:
+        """
+        Convert raw audio bytes to text (Whisper needs the filename for the format)
+        """
+        try:
+            return await self._call("Transcription", self.provider.transcribe, audio, filename=filename)
+        except HTTPException:
+            raise
         except Exception as e:
-            return {
-                "intent": "unknown",
-                "entities": {},
-                "confidence": 0.0
-            }
-    
-    @staticmethod
-    async def text_to_speech(text: str, voice: str = "nova") -> bytes:
+            raise Exception(f"Transcription failed: {str(e)}")
+
+    async def classify_locally(self, transcription: str) -> dict:
+        if intent_classifier.ready:
+            return intent_classifier.classify(transcription)  # Well under a millisecond
+        # First call trains the model (and imports scikit-learn): keep it off the loop
+        return await run_in_threadpool(intent_classifier.classify, transcription)
+
+    async def analyze_intent(self, transcription: str) -> dict:
+        """
+        Understand the driver's intent: local classifier first, GPT when it is unsure
+        """
+        local = await self.classify_locally(transcription)
+        if local["intent"] != "unknown" and local["confidence"] >= settings.VOICE_INTENT_CONFIDENCE_THRESHOLD:
+            VOICE_INTENTS.inc("local")
+            return local
+
+        try:
+            content = await self._call("Intent analysis", self.provider.chat, [
+                {"role": "system", "content": INTENT_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Driver said: {transcription}"}
+            ])
+            result = json.loads(content)
+            # Entities the grammar already found fill the gaps in the LLM's answer
+            result["entities"] = dict(local["entities"], **(result.get("entities") or {}))
+            result["source"] = "llm"
+            VOICE_INTENTS.inc("llm")
+            return result
+        except Exception:
+            # Only a grammar match may act without the LLM (never a model guess or a negated command)
+            if local["intent"] != "unknown" and local["source"] == "grammar":
+                VOICE_INTENTS.inc("local_fallback")
+                return local
+            VOICE_INTENTS.inc("none")
+            return dict(UNKNOWN_INTENT, entities={})
+
+    async def text_to_speech(self, text: str, voice: str = "nova") -> bytes:
         """
         Convert text response to speech
         """
         try:
-            response = client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=text
-            )
-            
-            return response.content
-            
+            return await self._call("Text-to-speech", self.provider.speech, text, voice=voice)
+        except HTTPException:
+            raise
         except Exception as e:
             raise Exception(f"TTS failed: {str(e)}")
-    
+
+    async def stream_speech(self, text: str, voice: str = "nova") -> SpeechStream:
+        """
+        Provider audio chunks as they arrive. Waiting for the first chunk is bounded
+        like any other provider call (errors surface before the response starts).
+        The result names the provider that answered (a fallback, possibly).
+        """
+        stream = self.provider.stream_speech(text, voice=voice)
+        chunks = self._limited(stream)
+        try:
+            first = await self._bounded("Text-to-speech", chunks.__anext__)
+        except StopAsyncIteration:
+            first = b""
+        except BaseException:
+            await chunks.aclose()
+            raise
+        provider = getattr(stream, "provider", None) or self.provider.name
+        return SpeechStream(chunks, provider, first=first)
+
+    @staticmethod
+    async def _limited(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """Hold a concurrency slot until the provider stream ends (or the client goes away)"""
+        try:
+            async with _slots():
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            await stream.aclose()
+
     @staticmethod
     def extract_shipment_id(text: str) -> Optional[str]:
         """
@@ -113,10 +173,15 @@ class VoiceAssistantService:
             r'shipment\s+(\w+)',
             r'order\s+(\w+)'
         ]
-        
+
         for pattern in patterns:
             match = re.search(pattern, text, re.IGNORECASE)
             if match:
                 return match.group(0) if '-' in pattern or '_' in pattern else match.group(1)
-        
-        return None
\ No newline at end of file
+
+        return None
+
+
+def get_voice_service() -> VoiceAssistantService:
+    """Dependency: override in tests (app.dependency_overrides) or set_voice_provider()"""
+    return VoiceAssistantService()
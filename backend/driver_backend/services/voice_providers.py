@@ -0,0 +1,429 @@
+"""
+Voice Providers - speech-to-text, intent LLM and text-to-speech backends
+This file hides which AI service the voice assistant talks to behind one small interface.
+
+VoiceProvider has three async calls: transcribe() raw audio bytes, chat() for the intent prompt, and speech() / stream_speech() for TTS audio.
+
+OpenAIVoiceProvider uses the async OpenAI client, so Whisper / GPT / TTS calls wait without blocking the event loop.
+
+OllamaVoiceProvider answers the intent prompt with a local ollama model (chat only) when OpenAI is down or unconfigured.
+
+Clients are created on first use, so the driver backend starts (and every non-voice endpoint works) without OPENAI_API_KEY.
+
+ResilientVoiceProvider wraps them in order: per-attempt deadline, a hedged second attempt, a circuit breaker per provider and
+fallback to the next provider; voice_provider_seconds{provider, operation, outcome} records every attempt.
+
+StubVoiceProvider answers locally and instantly (VOICE_PROVIDER=stub) for tests, load tests and offline development.
+
+get_voice_provider() returns the process-wide provider picked by Settings.VOICE_PROVIDER; set_voice_provider() swaps it (tests).
+
+In simple words — this file is the plug the voice assistant uses to reach an AI service, real or fake.
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from backend.shared.circuit_breaker import CircuitBreaker
+from backend.shared.config import settings
+from backend.shared.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+VOICE_PROVIDER_SECONDS = histogram(
+    "voice_provider_seconds", "Voice provider attempt latency",
+    ("provider", "operation", "outcome"),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0)
+)
+VOICE_PROVIDER_HEDGES = counter(
+    "voice_provider_hedges_total", "Second attempts started while the first was slow or failed",
+    ("provider", "operation")
+)
+
+SPEECH_CHUNK_BYTES = 16 * 1024
+
+
+class VoiceProviderError(RuntimeError):
+    """The provider is not configured or its call failed"""
+
+
+class SpeechStream:
+    """
+    Audio chunks plus the name of the provider producing them. With fallbacks
+    the provider is only known once audio flows: caches key on it, so a
+    fallback's voice is never stored as the primary's.
+    """
+
+    def __init__(self, chunks: Optional[AsyncIterator[bytes]] = None, provider: Optional[str] = None,
+                 first: bytes = b""):
+        self.chunks = chunks
+        self.provider = provider
+        self._first = first  # Already read from chunks (to surface errors early), yielded first
+
+    def __aiter__(self) -> "SpeechStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._first:
+            first, self._first = self._first, b""
+            return first
+        return await self.chunks.__anext__()
+
+    async def aclose(self) -> None:
+        await self.chunks.aclose()
+
+
+class VoiceProvider:
+    """Base provider: every call is async and takes/returns plain bytes and strings"""
+
+    name = "base"
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.wav", language: str = "en") -> str:
+        raise NotImplementedError
+
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        """Completion text for the messages"""
+        raise NotImplementedError
+
+    async def speech(self, text: str, voice: str = "nova") -> bytes:
+        """MP3 audio for text"""
+        raise NotImplementedError
+
+    async def stream_speech(self, text: str, voice: str = "nova") -> AsyncIterator[bytes]:
+        """MP3 audio for text as it is produced (default: one chunk once it is complete)"""
+        yield await self.speech(text, voice=voice)
+
+    async def close(self) -> None:
+        pass
+
+
+# ==================== OPENAI ====================
+class OpenAIVoiceProvider(VoiceProvider):
+    """Whisper, chat completions and TTS through AsyncOpenAI (created lazily)"""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, timeout: Optional[float] = None):
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.timeout = timeout or settings.VOICE_PROVIDER_TIMEOUT_SECONDS
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            if not self.api_key:
+                raise VoiceProviderError("OPENAI_API_KEY is not set; voice commands are unavailable")
+            from openai import AsyncOpenAI
+            # No SDK retries: ResilientVoiceProvider hedges and fails over instead
+            self._client = AsyncOpenAI(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        return self._client
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.wav", language: str = "en") -> str:
+        transcription = await self.client.audio.transcriptions.create(
+            model=settings.VOICE_STT_MODEL,
+            file=(filename, audio),  # Raw bytes; the SDK builds the multipart body
+            language=language
+        )
+        return transcription.text
+
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        response = await self.client.chat.completions.create(
+            model=settings.VOICE_LLM_MODEL,
+            messages=messages,
+            temperature=temperature
+        )
+        return response.choices[0].message.content
+
+    async def speech(self, text: str, voice: str = "nova") -> bytes:
+        response = await self.client.audio.speech.create(
+            model=settings.VOICE_TTS_MODEL,
+            voice=voice,
+            input=text
+        )
+        return response.content
+
+    async def stream_speech(self, text: str, voice: str = "nova") -> AsyncIterator[bytes]:
+        async with self.client.audio.speech.with_streaming_response.create(
+            model=settings.VOICE_TTS_MODEL,
+            voice=voice,
+            input=text,
+            response_format="mp3"
+        ) as response:
+            async for chunk in response.iter_bytes(SPEECH_CHUNK_BYTES):
+                yield chunk
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+
+# ==================== OLLAMA ====================
+class OllamaVoiceProvider(VoiceProvider):
+    """Local LLM for the intent prompt (no speech-to-text or TTS)"""
+
+    name = "ollama"
+
+    def __init__(self, host: Optional[str] = None, model: Optional[str] = None):
+        self.host = host or settings.OLLAMA_HOST
+        self.model = model or settings.OLLAMA_MODEL
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                from ollama import AsyncClient
+            except ImportError:
+                raise VoiceProviderError("ollama package not installed")
+            self._client = AsyncClient(host=self.host, timeout=settings.VOICE_ATTEMPT_TIMEOUT_SECONDS)
+        return self._client
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.wav", language: str = "en") -> str:
+        raise VoiceProviderError("ollama has no speech-to-text")
+
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        response = await self.client.chat(
+            model=self.model,
+            messages=messages,
+            format="json",  # The intent prompt asks for JSON only
+            options={"temperature": temperature}
+        )
+        return response["message"]["content"]
+
+    async def speech(self, text: str, voice: str = "nova") -> bytes:
+        raise VoiceProviderError("ollama has no text-to-speech")
+
+
+# ==================== RESILIENCE ====================
+class ResilientVoiceProvider(VoiceProvider):
+    """
+    Providers in preference order. Per provider: an attempt gets
+    VOICE_ATTEMPT_TIMEOUT_SECONDS; a second (hedged) attempt starts when the first
+    fails or is still running after VOICE_HEDGE_AFTER_SECONDS, and the first success
+    wins. A provider whose circuit is open is skipped; the next one is tried.
+    """
+
+    name = "resilient"
+
+    def __init__(self, providers: Sequence[VoiceProvider]):
+        self.providers = list(providers)
+        self.breakers = {
+            provider.name: CircuitBreaker(
+                f"voice:{provider.name}",
+                failure_threshold=settings.VOICE_BREAKER_FAILURES,
+                reset_seconds=settings.VOICE_BREAKER_RESET_SECONDS
+            )
+            for provider in self.providers
+        }
+        # TTS cache lookups follow the provider that normally answers (SpeechStream.provider says who did)
+        self.name = self.providers[0].name if self.providers else "resilient"
+
+    async def _attempt(self, provider: VoiceProvider, operation: str, args, kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(
+                getattr(provider, operation)(*args, **kwargs), timeout=settings.VOICE_ATTEMPT_TIMEOUT_SECONDS
+            )
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"  # Lost the hedge race
+            raise
+        finally:
+            VOICE_PROVIDER_SECONDS.observe(time.perf_counter() - started, provider.name, operation, outcome)
+
+    async def _hedged(self, provider: VoiceProvider, operation: str, args, kwargs):
+        hedge_after = settings.VOICE_HEDGE_AFTER_SECONDS
+        pending = {asyncio.create_task(self._attempt(provider, operation, args, kwargs))}
+        attempts = 1
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                can_hedge = attempts < 2 and hedge_after > 0
+                done, pending = await asyncio.wait(
+                    pending, timeout=hedge_after if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if can_hedge and (done or pending):
+                    # First attempt failed or is slow: race a second one
+                    VOICE_PROVIDER_HEDGES.inc(provider.name, operation)
+                    pending.add(asyncio.create_task(self._attempt(provider, operation, args, kwargs)))
+                    attempts += 1
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _call(self, operation: str, *args, **kwargs):
+        error: Optional[BaseException] = None
+        for provider in self.providers:
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                VOICE_PROVIDER_SECONDS.observe(0.0, provider.name, operation, "circuit_open")
+                continue
+            outcome = "failure"  # Until this provider's call says otherwise (cancellation included)
+            try:
+                result = await self._hedged(provider, operation, args, kwargs)
+                outcome = "success"
+                return result
+            except VoiceProviderError as exc:
+                outcome = "unsupported"  # Unsupported here / not configured: next provider
+                error = exc
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Voice provider %s failed %s: %r", provider.name, operation, exc)
+                error = exc
+            finally:
+                if outcome == "failure":
+                    breaker.record_failure()  # Never leave a trial call hanging
+                else:
+                    breaker.record_success()  # Unsupported is not unhealthy (and releases a half-open trial)
+        raise VoiceProviderError(f"No voice provider could {operation}") from error
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.wav", language: str = "en") -> str:
+        return await self._call("transcribe", audio, filename=filename, language=language)
+
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        return await self._call("chat", messages, temperature=temperature)
+
+    async def speech(self, text: str, voice: str = "nova") -> bytes:
+        return await self._call("speech", text, voice=voice)
+
+    def stream_speech(self, text: str, voice: str = "nova") -> SpeechStream:
+        """
+        Streams are not hedged: the first provider whose circuit allows it streams.
+        A provider failing before its first chunk falls over to the next one.
+        """
+        stream = SpeechStream()
+        stream.chunks = self._stream_speech(text, voice, stream)
+        return stream
+
+    async def _stream_speech(self, text: str, voice: str, stream: SpeechStream) -> AsyncIterator[bytes]:
+        for provider in self.providers:
+            breaker = self.breakers[provider.name]
+            if not breaker.allow():
+                continue
+            started = time.perf_counter()
+            streaming = False
+            try:
+                async for chunk in provider.stream_speech(text, voice=voice):
+                    streaming = True
+                    stream.provider = provider.name
+                    yield chunk
+            except VoiceProviderError:
+                breaker.record_success()  # Unsupported is not unhealthy
+                continue
+            except BaseException as exc:
+                breaker.record_failure()
+                VOICE_PROVIDER_SECONDS.observe(time.perf_counter() - started, provider.name, "stream_speech", "error")
+                if streaming or not isinstance(exc, Exception):
+                    raise  # Audio already sent (or cancelled): no switching voices mid-reply
+                logger.warning("Voice provider %s failed stream_speech: %r", provider.name, exc)
+                continue
+            breaker.record_success()
+            VOICE_PROVIDER_SECONDS.observe(time.perf_counter() - started, provider.name, "stream_speech", "ok")
+            return
+        raise VoiceProviderError("No voice provider could stream_speech")
+
+    async def close(self) -> None:
+        for provider in self.providers:
+            await provider.close()
+
+
+def build_voice_provider() -> VoiceProvider:
+    """Settings.VOICE_PROVIDER first, then Settings.VOICE_FALLBACK_PROVIDERS"""
+    factories = {"openai": OpenAIVoiceProvider, "ollama": OllamaVoiceProvider, "stub": StubVoiceProvider}
+    names = [settings.VOICE_PROVIDER] + [
+        name.strip() for name in settings.VOICE_FALLBACK_PROVIDERS.split(",") if name.strip()
+    ]
+    providers = [factories[name]() for name in dict.fromkeys(names)]
+    return providers[0] if len(providers) == 1 else ResilientVoiceProvider(providers)
+
+
+# ==================== STUB ====================
+_STUB_INTENTS = [
+    ("confirm_delivery", re.compile(r"\bdeliver(ed|y complete)\b", re.IGNORECASE)),
+    ("confirm_pickup", re.compile(r"\bpick(ed)?\s*up\b|\bpickup\b", re.IGNORECASE)),
+    ("update_cod", re.compile(r"\bcollected\b|\bcod\b", re.IGNORECASE)),
+    ("report_delay", re.compile(r"\bdelay|\blate\b|\btraffic\b", re.IGNORECASE)),
+    ("update_status", re.compile(r"\bupdate\b|\bin transit\b", re.IGNORECASE)),
+]
+_STUB_SHIPMENT = re.compile(r"\bSHP[-_]?\d+\b", re.IGNORECASE)
+
+# Smallest valid MPEG-1 Layer III frame (silence), so clients can play the stub's audio
+_SILENT_MP3 = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
+
+class StubVoiceProvider(VoiceProvider):
+    """
+    Local, deterministic provider. transcribe() returns the upload decoded as UTF-8
+    (send the utterance as a .txt "recording") or `transcript`; chat() answers the
+    intent prompt with keyword rules.
+    """
+
+    name = "stub"
+
+    def __init__(self, transcript: str = "Confirm pickup for shipment SHP123"):
+        self.transcript = transcript
+        self.calls: Dict[str, int] = {"transcribe": 0, "chat": 0, "speech": 0}
+
+    async def transcribe(self, audio: bytes, filename: str = "audio.wav", language: str = "en") -> str:
+        self.calls["transcribe"] += 1
+        try:
+            text = audio.decode("utf-8").strip()
+        except UnicodeDecodeError:
+            text = ""
+        return text if text.isprintable() and text else self.transcript
+
+    async def chat(self, messages: List[Dict[str, str]], temperature: float = 0.3) -> str:
+        self.calls["chat"] += 1
+        utterance = messages[-1]["content"]
+        intent = next((name for name, pattern in _STUB_INTENTS if pattern.search(utterance)), "unknown")
+        entities = {}
+        shipment = _STUB_SHIPMENT.search(utterance)
+        if shipment:
+            entities["shipment_id"] = shipment.group(0).upper()
+        return json.dumps({"intent": intent, "entities": entities, "confidence": 0.9 if intent != "unknown" else 0.0})
+
+    async def speech(self, text: str, voice: str = "nova") -> bytes:
+        self.calls["speech"] += 1
+        return _SILENT_MP3 * 8
+
+    async def stream_speech(self, text: str, voice: str = "nova") -> AsyncIterator[bytes]:
+        self.calls["speech"] += 1
+        for _ in range(8):
+            yield _SILENT_MP3
+
+
+# ==================== FACTORY ====================
+_voice_provider: Optional[VoiceProvider] = None
+_voice_provider_lock = threading.Lock()
+
+
+def get_voice_provider() -> VoiceProvider:
+    """Process-wide provider chain (Settings.VOICE_PROVIDER + VOICE_FALLBACK_PROVIDERS)"""
+    global _voice_provider
+    if _voice_provider is None:
+        with _voice_provider_lock:
+            if _voice_provider is None:
+                _voice_provider = build_voice_provider()
+    return _voice_provider
+
+
+def set_voice_provider(provider: Optional[VoiceProvider]) -> None:
+    """Replace the process-wide provider (tests, load tests, local engines)"""
+    global _voice_provider
+    with _voice_provider_lock:
+        _voice_provider = provider
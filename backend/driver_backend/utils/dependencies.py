@@ -19,24 +19,52 @@ In simple words — this file is the security gatekeeper that ensures only logge
 """
 Dependencies and utilities for Driver Backend
 """
-import os
-from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from backend.shared.database import get_db
+from backend.shared.models import UserRole
 from backend.shared.utils import verify_token
 from typing import Dict
 
-# Load environment variables
-load_dotenv()
-
-# Get OpenAI API Key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-
 # Security
 security = HTTPBearer()
 
+def decode_driver_token(token: str) -> Dict:
+    """
+    Verify a driver JWT and return the driver identity.
+    Shared by the HTTP dependency and the location WebSocket handshake.
+    """
+    payload = verify_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+
+    # DriverService.authenticate_driver stores the id under "id"
+    driver_id = payload.get("id") or payload.get("user_id")
+
+    if not driver_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token"
+        )
+
+    if payload.get("role") != UserRole.DRIVER.value:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Driver access required"
+        )
+
+    return {
+        "id": driver_id,
+        "driver_id": driver_id,
+        "email": payload.get("email") or payload.get("sub"),
+        "role": payload.get("role")
+    }
+
+
 async def get_current_driver(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -44,26 +72,4 @@ async def get_current_driver(
     """
     Verify JWT token and return current driver info
     """
-    token = credentials.credentials
-    
-    try:
-        payload = verify_token(token)
-        driver_id = payload.get("user_id")
-        
-        if not driver_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-        
-        return {
-            "driver_id": driver_id,
-            "email": payload.get("email"),
-            "role": payload.get("role")
-        }
-        
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
\ No newline at end of file
+    return decode_driver_token(credentials.credentials)
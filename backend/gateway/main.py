@@ -0,0 +1,88 @@
+"""
+Gateway - all three backends in one ASGI application
+Mounts the user, driver and admin apps under /user, /driver and /admin in one
+process, so they share one SQLAlchemy pool, one settings object, one event
+bus and one set of in-process caches. Each app keeps its own middleware,
+docs (/driver/docs, ...) and health/metrics routes; the gateway runs their
+startup and shutdown handlers, which Starlette does not do for mounted apps.
+Small deployments run this (python main.py gateway); larger ones
+still run the backends separately.
+"""
+import logging
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from backend.shared.health import install_health
+from backend.shared.metrics import CONTENT_TYPE, REGISTRY
+from backend.shared.serialization import FastJSONResponse
+from backend.user_backend.main import app as user_app
+from backend.driver_backend.main import app as driver_app
+from backend.admin_backend.main import app as admin_app
+
+logger = logging.getLogger(__name__)
+
+MOUNTS = (
+    ("/user", user_app),
+    ("/driver", driver_app),
+    ("/admin", admin_app),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start every mounted app in order, stop them in reverse"""
+    started = []
+    try:
+        for prefix, sub_app in MOUNTS:
+            await sub_app.router.startup()
+            started.append((prefix, sub_app))
+        yield
+    finally:
+        for prefix, sub_app in reversed(started):
+            try:
+                await sub_app.router.shutdown()
+            except Exception:
+                logger.exception("Shutdown of %s failed", prefix)
+
+
+app = FastAPI(
+    title="Logistics - Gateway",
+    version="1.0.0",
+    docs_url=None,  # Each backend keeps its own docs under its prefix
+    redoc_url=None,
+    openapi_url=None,
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# GET /health/live, /health/ready (and /health) for the load balancer
+install_health(app, "gateway")
+
+
+async def metrics():
+    """One registry per process: the same output as /user/metrics, /driver/metrics, /admin/metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+
+
+@app.get("/")
+async def root():
+    return {
+        "message": "Logistics Gateway",
+        "status": "active",
+        "backends": {prefix.strip("/"): f"{prefix}/docs" for prefix, _ in MOUNTS}
+    }
+
+
+for _prefix, _sub_app in MOUNTS:
+    app.mount(_prefix, _sub_app)
+
+
+if __name__ == "__main__":
+    from backend.shared.server import main
+    main(["gateway", *sys.argv[1:]], app=app)
@@ -0,0 +1,77 @@
+"""
+Circuit Breaker (Shared across all backends)
+Stops calling a dependency that keeps failing: after `failure_threshold`
+consecutive failures the circuit opens and calls are refused instantly for
+`reset_seconds`; then one trial call is let through (half-open) and its
+outcome closes or re-opens the circuit.
+circuit_breaker_state{name} (0 closed, 1 half-open, 2 open) is exported on /metrics.
+"""
+import threading
+import time
+from typing import Dict
+
+from backend.shared.metrics import gauge
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(RuntimeError):
+    """Call refused because the circuit is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        _breakers[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """True when a call may go ahead (in half-open state: only one trial call)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            if self._trial_in_flight:
+                return False
+            self._state = HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+
+gauge(
+    "circuit_breaker_state", "Circuit state per dependency (0 closed, 1 half-open, 2 open)",
+    lambda: {(name,): _STATE_VALUES[breaker.state] for name, breaker in list(_breakers.items())},
+    ("name",),
+    multiprocess_mode="max"  # Worst state across workers
+)
@@ -26,17 +26,136 @@ class Settings(BaseSettings):
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_URL: str = "redis://localhost:6379"
+
+    # SQL instrumentation
+    DB_ECHO: bool = False  # log every statement (debugging only, slow)
+    DB_AUTO_CREATE: bool = True  # create missing tables on startup (not at import)
+    DB_SERVER_TIMING: bool = True  # Server-Timing: db;dur=..;desc="N queries"
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_SAMPLE_RATE: float = 1.0  # fraction of slow statements logged
+
+    # Prometheus metrics across preforked workers
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # per-worker value files merged on scrape; the launcher sets one
+    METRICS_EXPORT_SECONDS: float = 1.0  # how often each worker writes its file
+
+    # Health / readiness probes
+    HEALTH_CACHE_SECONDS: float = 1.0
+    HEALTH_DB_TIMEOUT_MS: float = 500.0  # slower DB ping = not ready
+    HEALTH_POOL_MAX_UTILIZATION: float = 0.9  # checked-out / (pool_size + max_overflow)
+    HEALTH_REDIS_TIMEOUT_MS: float = 200.0
+    HEALTH_MAX_QUEUE_DEPTH: int = 1000  # per in-process background queue (notifications)
+    HEALTH_MAX_OUTBOX_BACKLOG: int = 5000  # unpublished outbox rows, table-wide
+
+    # SQL statement guard (N+1 detection per request)
+    SQL_GUARD_MODE: str = "off"  # off | warn | raise (tests)
+    SQL_STATEMENT_LIMIT: int = 25
+
+    # Event-loop watchdog
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_HEARTBEAT_MS: float = 100.0
+    LOOP_LAG_THRESHOLD_MS: float = 100.0  # stall longer than this = log the loop thread's stack
+    LOOP_STRICT_MODE: bool = False  # dev only: raise on sync DB calls made on the event loop thread
+
+    # On-demand request profiling (off unless a token or sample rate is set)
+    PROFILING_TOKEN: Optional[str] = None  # requests with "X-Profile: <token>" are profiled
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of all requests profiled
+    PROFILING_INTERVAL_MS: float = 5.0  # stack sampling interval
+    PROFILING_DIR: str = str(BACKEND_DIR.parent / "logs" / "profiles")
+    PROFILING_MAX_PROFILES: int = 200  # oldest profiles are deleted beyond this
+
+    # Event Bus
+    EVENT_BUS_BACKEND: str = "memory"  # memory | redis
+    EVENT_BUS_CHANNEL_PREFIX: str = "supplylink"
+    EVENT_BUS_REDIS_TIMEOUT_SECONDS: float = 1.0  # connect and per-command; a dead Redis must fail fast
+    EVENT_BUS_PUBLISH_QUEUE_SIZE: int = 10000  # best-effort events awaiting the publisher thread; oldest dropped beyond
+
+    # Transactional outbox relay
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_POLL_SECONDS: float = 0.5
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_RETENTION_HOURS: int = 24
+
+    # Driver location WebSocket
+    WS_LOCATION_MAX_RATE: float = 5.0  # sustained frames per second per connection
+    WS_LOCATION_BURST: int = 20
+    WS_LOCATION_QUEUE_SIZE: int = 200
+    WS_LOCATION_BATCH_SIZE: int = 50
     
+    # Voice assistant (driver backend)
+    OPENAI_API_KEY: Optional[str] = None  # only needed once a voice endpoint is called
+    VOICE_PROVIDER: str = "openai"  # openai | ollama | stub (local, for tests and offline development)
+    VOICE_FALLBACK_PROVIDERS: str = "ollama"  # comma separated, tried in order when VOICE_PROVIDER fails
+    VOICE_PROVIDER_TIMEOUT_SECONDS: float = 30.0  # per voice operation, queueing and fallbacks included
+    VOICE_ATTEMPT_TIMEOUT_SECONDS: float = 12.0  # per single provider attempt
+    VOICE_HEDGE_AFTER_SECONDS: float = 4.0  # start a second attempt when the first is this slow (0 = off)
+    VOICE_BREAKER_FAILURES: int = 5  # consecutive failures that open a provider's circuit
+    VOICE_BREAKER_RESET_SECONDS: float = 30.0
+    OLLAMA_HOST: str = "http://localhost:11434"
+    OLLAMA_MODEL: str = "llama3.1"
+    VOICE_MAX_CONCURRENCY: int = 4  # provider calls in flight per process
+    VOICE_STT_MODEL: str = "whisper-1"
+    VOICE_LLM_MODEL: str = "gpt-4"
+    VOICE_TTS_MODEL: str = "tts-1"
+    VOICE_INTENT_CONFIDENCE_THRESHOLD: float = 0.75  # local classifier below this = ask the LLM
+    VOICE_MAX_UPLOAD_MB: float = 25.0  # Whisper's own limit
+    VOICE_MAX_DURATION_SECONDS: float = 120.0
+    VOICE_PREPROCESS_ENABLED: bool = True  # trim silence, mono, resample before STT
+    VOICE_PREPROCESS_WORKERS: int = 2  # processes (decoding/resampling is CPU-bound)
+    VOICE_SAMPLE_RATE: int = 16000
+    VOICE_AUDIO_FORMAT: str = "wav"  # wav | opus | mp3 (opus/mp3 need ffmpeg)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = str(BACKEND_DIR.parent / "data" / "tts_cache")
+    TTS_CACHE_MAX_MB: int = 512  # least recently used replies are deleted beyond this
+
+    # AI agents (backend/ai_agents)
+    AGENT_MODEL_PROVIDER: str = "openai"  # openai | stub (deterministic, offline)
+    AGENT_LLM_MODEL: str = "gpt-4"
+    AGENT_MAX_TOKENS: int = 8000  # per conversation
+    AGENT_MAX_SECONDS: float = 20.0  # per user message, tool calls included
+    AGENT_MAX_STEPS: int = 5  # model turns per user message
+    AGENT_SNAPSHOT_TTL_SECONDS: float = 60.0  # tracking snapshots, also kept fresh by bus events
+    AGENT_SNAPSHOT_MAX_ENTRIES: int = 10000
+
+    # Background jobs (Celery workers, never inside the API processes)
+    JOBS_BROKER_URL: Optional[str] = None  # default REDIS_URL; "memory://" = in-process broker
+    JOBS_EAGER: bool = False  # tests: run jobs inline on submit, no broker or Celery needed
+    JOBS_QUEUE: str = "batch"
+    JOBS_WORKER_CONCURRENCY: int = 2
+    JOBS_TIME_LIMIT_SECONDS: int = 1800  # hard limit; a RUNNING job older than this may be re-claimed
+    JOBS_EXPORT_DIR: str = str(BACKEND_DIR.parent / "data" / "exports")  # shared volume: workers write, the admin API serves
+
     # API Configuration
     API_HOST: str = "0.0.0.0"
     API_PORT_USER: int = 8001
     API_PORT_DRIVER: int = 8002
     API_PORT_ADMIN: int = 8003
+    API_PORT_GATEWAY: int = 8000  # all three backends in one app (backend.gateway.main)
+    WEB_WORKERS: int = 0  # forked worker processes per server; 0 = one per CPU
+    WEB_KEEPALIVE_SECONDS: int = 65  # longer than the load balancer's idle timeout (60s on most)
+    WEB_BACKLOG: int = 2048
+    WEB_LIMIT_CONCURRENCY: int = 0  # connections per worker before 503; 0 = no limit
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30  # drain time for in-flight requests on SIGTERM
     
     # External APIs
     GOOGLE_MAPS_API_KEY: Optional[str] = None
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
+    TWILIO_FROM_NUMBER: Optional[str] = None
+
+    # Notifications
+    NOTIFICATION_CHANNELS: str = "log"  # comma separated: log, sms, email, push
+    NOTIFICATION_LOG_PATH: Optional[str] = None  # None = application log only
+    NOTIFY_COALESCE_SECONDS: float = 2.0
+    NOTIFY_BATCH_SIZE: int = 50
+    NOTIFY_MAX_RETRIES: int = 3
+    NOTIFY_RETRY_BASE_SECONDS: float = 0.5
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_FROM: str = "no-reply@supplylink.local"
+    SMTP_POOL_SIZE: int = 2
+    PUSH_GATEWAY_URL: Optional[str] = None
     
     class Config:
         env_file = str(BACKEND_DIR / ".env")
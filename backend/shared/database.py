@@ -1,6 +1,10 @@
 """
 Database Connection (Shared across all backends)
+init_db() creates missing tables once per process; apps call it on startup
+(and the launcher once before forking), never at import time.
 """
+import threading
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -9,7 +13,7 @@ from backend.shared.config import settings
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True,  # Set False in production
+    echo=settings.DB_ECHO,  # Timing/counts come from backend.shared.db_instrumentation
     pool_pre_ping=True,
     pool_recycle=3600
 )
@@ -27,4 +31,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+
+def init_db() -> None:
+    """Create missing tables (once per process; off with DB_AUTO_CREATE=false when migrations own the schema)"""
+    global _schema_ready
+    if _schema_ready or not settings.DB_AUTO_CREATE:
+        return
+    with _schema_lock:
+        if not _schema_ready:
+            from backend.shared import models  # noqa: F401  (registers every table on Base)
+            Base.metadata.create_all(bind=engine)
+            _schema_ready = True
@@ -0,0 +1,189 @@
+"""
+DB Instrumentation (Shared across all backends)
+before/after_cursor_execute hooks record statement count and DB time for the
+current request in a contextvar. The middleware reports them as a Server-Timing
+header and enforce the statement guard, and slow statements are logged (sampled)
+as normalized SQL with a fingerprint - parameter values are never logged.
+Statement guard: a request over Settings.SQL_STATEMENT_LIMIT statements is the
+signature of an N+1 lazy-load loop. SQL_GUARD_MODE: "off" (default), "warn"
+(log) or "raise" (tests: the request fails with the statements listed).
+"""
+import hashlib
+import logging
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+
+from backend.shared.config import settings
+from backend.shared.database import engine
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("backend.sql.slow")
+
+
+class DBStats:
+    """Per-request DB counters; the object is shared with threadpool workers via the context copy"""
+
+    __slots__ = ("count", "seconds", "statements", "route")
+
+    def __init__(self, keep_statements: bool = False, route: Optional[str] = None):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = [] if keep_statements else None
+        self.route = route
+
+
+_current: ContextVar[Optional[DBStats]] = ContextVar("db_stats", default=None)
+
+
+def current_db_stats() -> Optional[DBStats]:
+    """Stats of the request (or track_db block) running in this context"""
+    return _current.get()
+
+
+@contextmanager
+def track_db(keep_statements: bool = False, route: Optional[str] = None) -> Iterator[DBStats]:
+    """Record statements issued inside the block (middleware, scripts, benchmarks)"""
+    stats = DBStats(keep_statements, route)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# ==================== SQL FINGERPRINTS ====================
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Literals and placeholders -> ?, IN lists and multi-row VALUES collapsed, whitespace squeezed"""
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _VALUES_LIST.sub(r"\1, ...", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    """Short stable id for grouping the same statement shape"""
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:12]
+
+
+def _log_slow(statement: str, parameters, executemany: bool, elapsed: float, stats: Optional[DBStats]) -> None:
+    normalized = normalize_sql(statement)
+    if executemany:
+        param_info = f"{len(parameters)} rows"
+    else:
+        param_info = f"{len(parameters) if parameters else 0} params"
+    slow_query_logger.warning(
+        "slow query %.1f ms fp=%s route=%s (%s redacted) %s",
+        elapsed * 1000, fingerprint(normalized), stats.route if stats else "-", param_info, normalized
+    )
+
+
+# ==================== ENGINE HOOKS ====================
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append(statement)
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS and random.random() < settings.SLOW_QUERY_SAMPLE_RATE:
+        _log_slow(statement, parameters, executemany, elapsed, stats)
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; drop their start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+# ==================== STATEMENT GUARD ====================
+class QueryBudgetExceeded(AssertionError):
+    """A request issued more SQL statements than allowed"""
+
+
+def check_statement_budget(route: str, stats: DBStats, limit: int, mode: str) -> None:
+    """Warn or raise when stats.count is over limit"""
+    if mode == "off" or stats.count <= limit:
+        return
+    message = f"{route} issued {stats.count} SQL statements (limit {limit})"
+    if mode == "raise":
+        if stats.statements:
+            message += ":\n" + "\n".join(stats.statements)
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+# ==================== MIDDLEWARE ====================
+def server_timing(stats: DBStats, app_seconds: float) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries", '
+        f"app;dur={app_seconds * 1000:.1f}"
+    )
+
+
+class DBInstrumentationMiddleware:
+    """
+    Pure ASGI middleware: per-request DBStats, Server-Timing header and the
+    statement guard, all checked when the response starts - i.e. after the
+    handler's queries.
+    """
+
+    def __init__(self, app, server_timing_header: Optional[bool] = None, guard_mode: Optional[str] = None,
+                 statement_limit: Optional[int] = None):
+        self.app = app
+        self.server_timing_header = (
+            settings.DB_SERVER_TIMING if server_timing_header is None else server_timing_header
+        )
+        self.guard_mode = guard_mode or settings.SQL_GUARD_MODE
+        self.statement_limit = statement_limit if statement_limit is not None else settings.SQL_STATEMENT_LIMIT
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        route = f"{scope['method']} {scope['path']}"
+        with track_db(keep_statements=self.guard_mode == "raise", route=route) as stats:
+
+            async def instrumented_send(message):
+                if message["type"] == "http.response.start":
+                    if self.guard_mode != "off":
+                        check_statement_budget(route, stats, self.statement_limit, self.guard_mode)
+                    if self.server_timing_header:
+                        header = server_timing(stats, time.perf_counter() - started)
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (b"server-timing", header.encode("latin-1"))
+                        ]
+                await send(message)
+
+            await self.app(scope, receive, instrumented_send)
+
+
+def install_db_instrumentation(app) -> None:
+    """Add per-request DB stats, Server-Timing and the statement guard to an app"""
+    app.add_middleware(DBInstrumentationMiddleware)
@@ -0,0 +1,335 @@
+"""
+Event Bus (Shared across all backends)
+Publishes compact tracking and status events on per-shipment and per-driver channels.
+InProcessEventBus keeps subscribers in memory (single process / tests).
+RedisEventBus fans events out across the user, driver and admin processes;
+best-effort publishes are handed to a publisher thread, so a slow or dead
+Redis never holds up a request or the event loop.
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from backend.shared.config import settings
+from backend.shared.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# handler(channel, event)
+EventHandler = Callable[[str, dict], None]
+
+# Redis publishes sent in one pipeline round trip by the publisher thread
+PUBLISH_BATCH_SIZE = 100
+
+EVENTS_DROPPED = counter("event_bus_dropped_total", "Best-effort events dropped by the Redis bus", ("reason",))
+
+
+# ==================== CHANNEL NAMES ====================
+def shipment_channel(shipment_id: int) -> str:
+    """Channel carrying every event for one shipment"""
+    return f"shipment:{shipment_id}"
+
+
+def driver_channel(driver_id: int) -> str:
+    """Channel carrying every event for one driver"""
+    return f"driver:{driver_id}"
+
+
+# ==================== BASE BUS ====================
+class EventBus:
+    """Base event bus: publish dicts on channels, subscribe with glob patterns"""
+
+    def publish(self, channel: str, event: dict, strict: bool = False) -> None:
+        """Best-effort publish; strict=True re-raises transport errors (outbox relay)"""
+        raise NotImplementedError
+
+    def subscribe(self, pattern: str, handler: EventHandler) -> Callable[[], None]:
+        """Register handler for channels matching pattern; returns an unsubscribe callable"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def publish_tracking(
+        self,
+        shipment_id: int,
+        latitude: float,
+        longitude: float,
+        location_name: Optional[str] = None,
+        driver_id: Optional[int] = None,
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """Publish a GPS point on the shipment (and driver) channel"""
+        self.publish_event(tracking_event(
+            shipment_id, latitude, longitude, location_name, driver_id, timestamp
+        ))
+
+    def publish_status(
+        self,
+        shipment_id: int,
+        status: str,
+        driver_id: Optional[int] = None,
+        customer_id: Optional[int] = None
+    ) -> None:
+        """Publish a shipment status transition on the shipment (and driver) channel"""
+        self.publish_event(status_event(shipment_id, status, driver_id, customer_id))
+
+    def publish_event(self, event: dict, strict: bool = False) -> None:
+        """Route an event to its shipment channel and, when known, its driver channel"""
+        self.publish(shipment_channel(event["shipment_id"]), event, strict=strict)
+        if event.get("driver_id"):
+            self.publish(driver_channel(event["driver_id"]), event, strict=strict)
+
+
+# ==================== EVENT PAYLOADS ====================
+def tracking_event(
+    shipment_id: int,
+    latitude: float,
+    longitude: float,
+    location_name: Optional[str] = None,
+    driver_id: Optional[int] = None,
+    timestamp: Optional[datetime] = None
+) -> dict:
+    """Compact GPS point event"""
+    return {
+        "type": "tracking",
+        "shipment_id": shipment_id,
+        "driver_id": driver_id,
+        "lat": latitude,
+        "lng": longitude,
+        "name": location_name,
+        "ts": (timestamp or datetime.utcnow()).isoformat()
+    }
+
+
+def status_event(
+    shipment_id: int,
+    status: str,
+    driver_id: Optional[int] = None,
+    customer_id: Optional[int] = None
+) -> dict:
+    """Compact shipment status transition event"""
+    return {
+        "type": "status",
+        "shipment_id": shipment_id,
+        "status": getattr(status, "value", status),
+        "driver_id": driver_id,
+        "customer_id": customer_id,
+        "ts": datetime.utcnow().isoformat()
+    }
+
+
+# ==================== IN-PROCESS BUS ====================
+class InProcessEventBus(EventBus):
+    """Synchronous in-memory fan-out; handlers run in the publisher's thread"""
+
+    def __init__(self):
+        self._subscriptions: List[Tuple[str, EventHandler]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: dict, strict: bool = False) -> None:
+        self._dispatch(channel, event)
+
+    def subscribe(self, pattern: str, handler: EventHandler) -> Callable[[], None]:
+        entry = (pattern, handler)
+        with self._lock:
+            # Copy-on-write so publishers iterate without holding the lock
+            self._subscriptions = self._subscriptions + [entry]
+
+        def unsubscribe():
+            with self._lock:
+                self._subscriptions = [s for s in self._subscriptions if s is not entry]
+
+        return unsubscribe
+
+    def _dispatch(self, channel: str, event: dict) -> None:
+        for pattern, handler in self._subscriptions:
+            if fnmatch.fnmatchcase(channel, pattern):
+                try:
+                    handler(channel, event)
+                except Exception:
+                    logger.exception("Event handler failed for channel %s", channel)
+
+
+# ==================== REDIS BUS ====================
+class RedisEventBus(InProcessEventBus):
+    """
+    Redis pub/sub bus. All channels live under one prefix so a single
+    pattern subscription feeds the local handler registry.
+    publish() only queues the event for a publisher thread (the oldest queued
+    event is dropped when Redis falls behind); strict=True publishes on the
+    caller's thread and raises, for the outbox relay.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, client=None, prefix: Optional[str] = None,
+                 queue_size: Optional[int] = None):
+        super().__init__()
+        if client is None:
+            import redis
+            timeout = settings.EVENT_BUS_REDIS_TIMEOUT_SECONDS
+            client = redis.Redis.from_url(
+                redis_url or settings.REDIS_URL, socket_timeout=timeout, socket_connect_timeout=timeout
+            )
+        self._client = client
+        self._prefix = f"{prefix or settings.EVENT_BUS_CHANNEL_PREFIX}:"
+        self._pubsub = None
+        self._listener = None
+        self._outgoing: queue.Queue = queue.Queue(maxsize=queue_size or settings.EVENT_BUS_PUBLISH_QUEUE_SIZE)
+        self._publisher: Optional[threading.Thread] = None
+
+    def publish(self, channel: str, event: dict, strict: bool = False) -> None:
+        message = (self._prefix + channel, json.dumps(event, default=str))
+        if strict:
+            self._client.publish(*message)
+            return
+        self._ensure_publisher()
+        try:
+            self._outgoing.put_nowait(message)
+        except queue.Full:
+            # Redis is down or slow: keep the newest events (latest positions and statuses)
+            try:
+                self._outgoing.get_nowait()
+            except queue.Empty:
+                pass
+            EVENTS_DROPPED.inc("queue_full")
+            try:
+                self._outgoing.put_nowait(message)
+            except queue.Full:
+                EVENTS_DROPPED.inc("queue_full")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event was sent (or dropped); False on timeout"""
+        done = threading.Event()
+        self._ensure_publisher()
+        try:
+            self._outgoing.put((done.set, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _ensure_publisher(self) -> None:
+        # is_alive() is also False in a forked child: each process gets its own thread
+        if self._publisher is not None and self._publisher.is_alive():
+            return
+        with self._lock:
+            if self._publisher is None or not self._publisher.is_alive():
+                self._publisher = threading.Thread(target=self._publish_loop, name="event-bus-publisher", daemon=True)
+                self._publisher.start()
+
+    def _publish_loop(self) -> None:
+        while True:
+            batch = [self._outgoing.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                try:
+                    batch.append(self._outgoing.get_nowait())
+                except queue.Empty:
+                    break
+            messages = [item for item in batch if item[1] is not None]
+            if messages:
+                try:
+                    pipe = self._client.pipeline(transaction=False)
+                    for channel, message in messages:
+                        pipe.publish(channel, message)
+                    pipe.execute()
+                except Exception:
+                    # Publishing is best-effort: never fail the write path on a Redis outage
+                    EVENTS_DROPPED.inc("redis_error", amount=len(messages))
+                    logger.warning("Event bus publish failed for %d events", len(messages), exc_info=True)
+            # Flush markers: (callback, None)
+            for callback, message in batch:
+                if message is None:
+                    callback()
+
+    def subscribe(self, pattern: str, handler: EventHandler) -> Callable[[], None]:
+        self._ensure_listener()
+        return super().subscribe(pattern, handler)
+
+    def close(self) -> None:
+        if self._publisher is not None and self._publisher.is_alive():
+            self.flush(timeout=settings.EVENT_BUS_REDIS_TIMEOUT_SECONDS)
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.psubscribe(**{self._prefix + "*": self._on_message})
+            self._listener = self._pubsub.run_in_thread(sleep_time=0.05, daemon=True)
+
+    def _on_message(self, message: dict) -> None:
+        channel = message["channel"]
+        data = message["data"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        try:
+            event = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning("Dropping malformed event on %s", channel)
+            return
+        self._dispatch(channel[len(self._prefix):], event)
+
+
+# ==================== ASYNC BRIDGE ====================
+class EventSubscription:
+    """
+    Bridge bus callbacks (any thread) into an asyncio.Queue so websocket or
+    cache consumers can `await subscription.get()`. Drops the oldest event
+    when the consumer falls behind.
+    """
+
+    def __init__(self, bus: EventBus, pattern: str, maxsize: int = 1000):
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._unsubscribe = bus.subscribe(pattern, self._on_event)
+
+    def _on_event(self, channel: str, event: dict) -> None:
+        self._loop.call_soon_threadsafe(self._put, (channel, event))
+
+    def _put(self, item: Tuple[str, dict]) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    async def get(self) -> Tuple[str, dict]:
+        return await self._queue.get()
+
+    def close(self) -> None:
+        self._unsubscribe()
+
+
+# ==================== FACTORY ====================
+_event_bus: Optional[EventBus] = None
+_event_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """Process-wide event bus selected by Settings.EVENT_BUS_BACKEND"""
+    global _event_bus
+    if _event_bus is None:
+        with _event_bus_lock:
+            if _event_bus is None:
+                if settings.EVENT_BUS_BACKEND == "redis":
+                    _event_bus = RedisEventBus()
+                else:
+                    _event_bus = InProcessEventBus()
+    return _event_bus
+
+
+def set_event_bus(bus: Optional[EventBus]) -> None:
+    """Replace the process-wide bus (tests, fake redis, combined deployments)"""
+    global _event_bus
+    with _event_bus_lock:
+        if _event_bus is not None and _event_bus is not bus:
+            _event_bus.close()
+        _event_bus = bus
@@ -0,0 +1,160 @@
+"""
+Health Probes (Shared across all backends)
+/health/live  - the process is up and its event loop answers (never touches dependencies).
+/health/ready - DB ping latency, pool utilization, Redis ping (when the event bus uses it)
+                and background queue depths against thresholds from Settings.
+Readiness results are cached for HEALTH_CACHE_SECONDS and concurrent probes share
+one in-flight check, so probes never add load. install_health(app, "driver").
+"""
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.database import engine
+
+# name -> (callable returning the current depth or None if not measured here, max depth or None)
+_queue_sources: Dict[str, Tuple[Callable[[], Optional[int]], Optional[int]]] = {}
+
+
+def register_queue(name: str, depth: Callable[[], Optional[int]], max_depth: Optional[int] = None) -> None:
+    """Include a background queue in readiness (depth above max_depth, default HEALTH_MAX_QUEUE_DEPTH = not ready)"""
+    _queue_sources[name] = (depth, max_depth)
+
+
+# ==================== CHECKS ====================
+def _ping_db() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+_redis_client = None
+
+
+def _ping_redis() -> None:
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        timeout = settings.HEALTH_REDIS_TIMEOUT_MS / 1000
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+    _redis_client.ping()
+
+
+async def _timed(func: Callable[[], None], timeout_ms: float) -> dict:
+    """Run a blocking ping in the threadpool; slow or failing = not ok"""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(run_in_threadpool(func), timeout=timeout_ms / 1000)
+    except asyncio.TimeoutError:
+        return {"ok": False, "latency_ms": round(timeout_ms, 1), "error": "timeout"}
+    except Exception as exc:
+        return {"ok": False, "error": type(exc).__name__}
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {"ok": latency_ms <= timeout_ms, "latency_ms": round(latency_ms, 1)}
+
+
+def pool_status() -> Optional[dict]:
+    """Checked-out connections vs capacity (None for pools without limits, e.g. NullPool)"""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return None
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    utilization = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": utilization < settings.HEALTH_POOL_MAX_UTILIZATION,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "utilization": round(utilization, 3)
+    }
+
+
+def queue_status() -> Dict[str, dict]:
+    statuses = {}
+    for name, (depth, max_depth) in _queue_sources.items():
+        try:
+            value = depth()
+        except Exception as exc:
+            statuses[name] = {"ok": False, "error": type(exc).__name__}
+            continue
+        if value is None:
+            continue  # Not measured in this process
+        limit = max_depth if max_depth is not None else settings.HEALTH_MAX_QUEUE_DEPTH
+        statuses[name] = {"ok": value <= limit, "depth": value, "max": limit}
+    return statuses
+
+
+async def run_readiness_checks() -> dict:
+    checks: Dict[str, dict] = {}
+
+    pool = pool_status()
+    if pool is not None:
+        checks["db_pool"] = pool
+    if pool is not None and pool["checked_out"] >= pool["capacity"]:
+        # Exhausted pool: a ping would just wait for pool_timeout
+        checks["database"] = {"ok": False, "error": "pool exhausted"}
+    else:
+        checks["database"] = await _timed(_ping_db, settings.HEALTH_DB_TIMEOUT_MS)
+
+    if settings.EVENT_BUS_BACKEND == "redis":
+        checks["redis"] = await _timed(_ping_redis, settings.HEALTH_REDIS_TIMEOUT_MS)
+
+    for name, status in queue_status().items():
+        checks[f"queue:{name}"] = status
+
+    return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+
+# ==================== CACHED PROBE ====================
+class ReadinessProbe:
+    """Single-flight, time-cached readiness result"""
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl if ttl is not None else settings.HEALTH_CACHE_SECONDS
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another probe may have refreshed it while we waited
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = await run_readiness_checks()
+                self._checked_at = time.monotonic()
+        return self._result
+
+
+readiness_probe = ReadinessProbe()
+
+
+def install_health(app: FastAPI, service: str) -> None:
+    """Add /health/live, /health/ready and /health (alias of ready) to an app"""
+
+    async def live():
+        return {"status": "alive", "service": service}
+
+    async def ready():
+        result = await readiness_probe.get()
+        return JSONResponse(
+            status_code=200 if result["ready"] else 503,
+            content={
+                "status": "ready" if result["ready"] else "unready",
+                "service": service,
+                "checks": result["checks"]
+            }
+        )
+
+    app.add_api_route("/health/live", live, methods=["GET"], tags=["Health"])
+    app.add_api_route("/health/ready", ready, methods=["GET"], tags=["Health"])
+    app.add_api_route("/health", ready, methods=["GET"], tags=["Health"])
@@ -0,0 +1,88 @@
+"""
+HTTP Conditional GET helpers (Shared across all backends)
+Endpoints compute a cheap version (a few aggregate columns) instead of the full body,
+turn it into an ETag / Last-Modified pair and answer 304 when the client is current.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+from backend.shared.metrics import record_cache
+
+# (etag parts, last modified) as returned by the services' *_version() methods
+Version = Tuple[Sequence, Optional[datetime]]
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from any printable version parts"""
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive-UTC datetime as an HTTP date"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        return modified <= since
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    # Bodies are per user: never share them, revalidate every time, key caches on the token
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def conditional_get(request: Request, response: Response, version: Optional[Version]) -> Optional[Response]:
+    """
+    Attach ETag/Last-Modified to `response` and return a ready 304 when the
+    client's copy is current. Returns None when the full body must be built
+    (including when version is None, e.g. the resource does not exist).
+    """
+    if version is None:
+        return None
+    parts, last_modified = version
+    etag = make_etag(*parts)
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        record_cache("http_etag", hit=True)
+        return Response(status_code=304, headers=headers)
+    record_cache("http_etag", hit=False)
+    response.headers.update(headers)
+    return None
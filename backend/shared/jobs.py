@@ -0,0 +1,311 @@
+"""
+Background Jobs (Shared across all backends)
+Heavy work (exports, bulk pricing, later route planning, model training,
+fraud rescoring) runs in Celery workers on their own queue, never inside an
+API process. submit_job() validates the params, inserts a QUEUED row in the
+`jobs` table and enqueues only its id; the worker claims the row (RUNNING),
+runs the registered handler with its own session and stores the JSON result
+or the error. The jobs table is the source of truth: there is no Celery
+result backend, and a duplicate delivery finds the row already claimed.
+Celery is imported on first enqueue, so the API pays nothing for it at
+startup. JOBS_EAGER runs jobs inline on submit (tests, no broker);
+JOBS_BROKER_URL=memory:// keeps the broker in-process.
+Export files go to JOBS_EXPORT_DIR, which must be a volume shared by the
+workers and the admin API (each may mount it elsewhere): a result names the
+file relative to that directory, never by the worker's absolute path.
+
+    @job("shipments_export", ExportParams, "CSV of shipments")
+    def export(db: Session, params: ExportParams, job_id: int) -> dict: ...
+
+    python -m backend.shared.jobs worker        # consume JOBS_QUEUE
+"""
+import csv
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Type
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, Field
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from backend.driver_backend.services.pricing_service import PricingService
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.config import settings
+from backend.shared.database import SessionLocal, engine
+from backend.shared.metrics import counter, histogram
+from backend.shared.models import Job, JobStatus, Shipment
+
+logger = logging.getLogger(__name__)
+
+RUN_TASK = "jobs.run"
+
+JOBS_FINISHED = counter("jobs_finished_total", "Background jobs by type and final status", ("job_type", "status"))
+JOB_SECONDS = histogram(
+    "job_seconds", "Background job run time", ("job_type",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0)
+)
+
+
+class JobError(Exception):
+    """Unknown job type, or the job could not be enqueued"""
+
+
+class JobSpec(NamedTuple):
+    name: str
+    params: Type[BaseModel]
+    handler: Callable[[Session, BaseModel, int], Dict]
+    description: str
+
+
+JOB_TYPES: Dict[str, JobSpec] = {}
+
+
+def job(name: str, params: Type[BaseModel], description: str):
+    """Register handler(db, params, job_id) -> JSON-able dict under `name`"""
+    def register(handler):
+        JOB_TYPES[name] = JobSpec(name, params, handler, description)
+        return handler
+    return register
+
+
+# ==================== CELERY ====================
+_celery_app = None
+_celery_lock = threading.Lock()
+
+
+def _dispose_inherited_pool(**kwargs) -> None:
+    engine.dispose(close=False)
+
+
+def get_celery_app():
+    global _celery_app
+    if _celery_app is None:
+        with _celery_lock:
+            if _celery_app is None:
+                from celery import Celery
+                from celery.signals import worker_process_init
+
+                app = Celery("supplylink", broker=settings.JOBS_BROKER_URL or settings.REDIS_URL)
+                app.conf.update(
+                    task_default_queue=settings.JOBS_QUEUE,
+                    task_ignore_result=True,  # status and result live in the jobs table
+                    task_acks_late=True,  # a worker that dies mid-job leaves it for another worker
+                    task_reject_on_worker_lost=True,
+                    worker_prefetch_multiplier=1,  # long jobs: don't hoard the queue
+                    task_time_limit=settings.JOBS_TIME_LIMIT_SECONDS,
+                    broker_connection_retry_on_startup=True,
+                )
+                app.task(name=RUN_TASK)(execute_job)
+                # Prefork children must not share the parent's DB connections
+                worker_process_init.connect(_dispose_inherited_pool, weak=False)
+                _celery_app = app
+    return _celery_app
+
+
+def set_celery_app(app) -> None:
+    global _celery_app
+    _celery_app = app
+
+
+# ==================== SUBMIT ====================
+def submit_job(db: Session, job_type: str, params: Dict[str, Any], submitted_by: Optional[int] = None) -> Job:
+    """
+    Validate, store and enqueue a job. Raises JobError for an unknown type or
+    an unreachable broker (the row is then marked FAILED), pydantic's
+    ValidationError for bad params.
+    """
+    spec = JOB_TYPES.get(job_type)
+    if spec is None:
+        raise JobError(f"Unknown job type: {job_type}")
+    validated = spec.params(**params)
+
+    row = Job(
+        job_type=job_type,
+        status=JobStatus.QUEUED,
+        params=validated.model_dump_json(),
+        submitted_by=submitted_by
+    )
+    db.add(row)
+    db.commit()  # The worker must find the row
+
+    if settings.JOBS_EAGER:
+        execute_job(row.id)
+    else:
+        try:
+            get_celery_app().send_task(RUN_TASK, args=[row.id], queue=settings.JOBS_QUEUE)
+        except Exception as exc:
+            logger.exception("Could not enqueue job %d", row.id)
+            row.status = JobStatus.FAILED
+            row.error = f"Could not enqueue: {exc}"
+            row.finished_at = datetime.utcnow()
+            db.commit()
+            raise JobError("Job queue unavailable") from exc
+
+    db.refresh(row)
+    return row
+
+
+def cancel_job(db: Session, job_id: int) -> bool:
+    """QUEUED -> CANCELLED; False when the job already started or finished"""
+    cancelled = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+        .values(status=JobStatus.CANCELLED, finished_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    return bool(cancelled)
+
+
+# ==================== RUN (worker side) ====================
+def _claim(db: Session, job_id: int) -> bool:
+    """Atomically QUEUED (or RUNNING past the time limit) -> RUNNING"""
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.JOBS_TIME_LIMIT_SECONDS)
+    claimed = db.execute(
+        update(Job)
+        .where(
+            Job.id == job_id,
+            or_(Job.status == JobStatus.QUEUED, (Job.status == JobStatus.RUNNING) & (Job.started_at < stale))
+        )
+        .values(status=JobStatus.RUNNING, started_at=now, attempts=Job.attempts + 1)
+    ).rowcount
+    db.commit()
+    return bool(claimed)
+
+
+def _finish(db: Session, job_id: int, job_status: JobStatus, result: Optional[Dict] = None,
+            error: Optional[str] = None) -> None:
+    db.execute(
+        update(Job).where(Job.id == job_id).values(
+            status=job_status,
+            result=json.dumps(jsonable_encoder(result)) if result is not None else None,
+            error=error,
+            finished_at=datetime.utcnow()
+        )
+    )
+    db.commit()
+
+
+def execute_job(job_id: int) -> None:
+    """Celery task body: claim the row, run its handler, store the outcome"""
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            logger.info("Job %d already claimed, finished or cancelled", job_id)
+            return
+        row = db.get(Job, job_id)
+        spec = JOB_TYPES.get(row.job_type)
+        started = time.perf_counter()
+        try:
+            if spec is None:
+                raise JobError(f"Unknown job type: {row.job_type}")
+            result = spec.handler(db, spec.params.model_validate_json(row.params), job_id)
+        except Exception as exc:
+            db.rollback()
+            logger.exception("Job %d (%s) failed", job_id, row.job_type)
+            _finish(db, job_id, JobStatus.FAILED, error=f"{type(exc).__name__}: {exc}")
+            JOBS_FINISHED.inc(row.job_type, JobStatus.FAILED.value)
+        else:
+            _finish(db, job_id, JobStatus.SUCCEEDED, result=result)
+            JOBS_FINISHED.inc(row.job_type, JobStatus.SUCCEEDED.value)
+        JOB_SECONDS.observe(time.perf_counter() - started, row.job_type)
+    finally:
+        db.close()
+
+
+# ==================== JOB TYPES ====================
+EXPORT_COLUMNS = (
+    "id", "shipment_number", "customer_id", "driver_id", "pickup_location", "delivery_location",
+    "cargo_type", "weight", "status", "shipment_type", "is_cod", "cod_amount", "total_price",
+    "estimated_delivery", "actual_delivery", "created_at"
+)
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_path(name: str) -> Path:
+    """An export file in this process's JOBS_EXPORT_DIR (the name never leaves it)"""
+    directory = Path(settings.JOBS_EXPORT_DIR)
+    path = directory / Path(name).name
+    if not name or path.name != name:
+        raise JobError(f"Invalid export file name: {name!r}")
+    return path
+
+
+class ShipmentsExportParams(BaseModel):
+    status: Optional[ShipmentStatus] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+@job("shipments_export", ShipmentsExportParams, "CSV file of shipments, optionally by status and creation date")
+def export_shipments(db: Session, params: ShipmentsExportParams, job_id: int) -> Dict:
+    query = db.query(*(getattr(Shipment, name) for name in EXPORT_COLUMNS))
+    if params.status is not None:
+        query = query.filter(Shipment.status == params.status)
+    if params.created_from is not None:
+        query = query.filter(Shipment.created_at >= params.created_from)
+    if params.created_to is not None:
+        query = query.filter(Shipment.created_at < params.created_to)
+
+    path = export_path(f"shipments_{job_id}.csv")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EXPORT_COLUMNS)
+        # Streamed in batches: memory stays flat however many shipments match
+        for row in query.order_by(Shipment.id).yield_per(EXPORT_BATCH_SIZE):
+            writer.writerow([getattr(value, "value", value) for value in row])
+            rows += 1
+    return {"file": path.name, "rows": rows}  # Relative to JOBS_EXPORT_DIR, wherever the reader mounts it
+
+
+class QuoteItem(BaseModel):
+    reference: Optional[str] = None
+    distance_km: float = Field(gt=0)
+    weight_kg: float = Field(gt=0)
+    shipment_type: str = "domestic"
+    international_mode: Optional[str] = None
+    is_express: bool = False
+
+
+class BulkPricingParams(BaseModel):
+    items: List[QuoteItem] = Field(min_length=1, max_length=10000)
+    fuel_price_per_liter: float = Field(default=100.0, gt=0)
+
+
+@job("bulk_pricing", BulkPricingParams, "Price quotes for a list of lanes (rate cards, contract bids)")
+def bulk_pricing(db: Session, params: BulkPricingParams, job_id: int) -> Dict:
+    pricing = PricingService()
+    quotes = []
+    for item in params.items:
+        quote = pricing.calculate_price(
+            distance_km=item.distance_km,
+            weight_kg=item.weight_kg,
+            shipment_type=item.shipment_type,
+            international_mode=item.international_mode,
+            is_express=item.is_express,
+            fuel_price_per_liter=params.fuel_price_per_liter
+        )
+        quotes.append({"reference": item.reference, **quote})
+    return {
+        "count": len(quotes),
+        "total_price": round(sum(quote["total_price"] for quote in quotes), 2),
+        "quotes": quotes
+    }
+
+
+if __name__ == "__main__":
+    # Batch worker: separate processes (and CPU) from the API
+    if sys.argv[1:2] != ["worker"]:
+        sys.exit("usage: python -m backend.shared.jobs worker [celery worker options]")
+    get_celery_app().worker_main([
+        "worker", "--queues", settings.JOBS_QUEUE, "--concurrency", str(settings.JOBS_WORKER_CONCURRENCY),
+        "--loglevel", "INFO", *sys.argv[2:]
+    ])
@@ -0,0 +1,134 @@
+"""
+Event-Loop Watchdog (Shared across all backends)
+A heartbeat task measures event-loop lag (how late asyncio.sleep wakes up) into
+the event_loop_lag_seconds histogram. A watchdog thread notices when the heartbeat
+stops for longer than LOOP_LAG_THRESHOLD_MS and logs the loop thread's stack at
+that moment - i.e. the sync call blocking the loop (DB, passlib, sync HTTP clients).
+LOOP_STRICT_MODE (dev only) raises BlockingCallError on SQL executed on the loop thread.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from sqlalchemy import event
+
+from backend.shared.config import settings
+from backend.shared.database import engine
+from backend.shared.metrics import counter, histogram
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG = histogram(
+    "event_loop_lag_seconds", "Event-loop heartbeat lateness",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+LOOP_STALLS = counter("event_loop_stalls_total", "Event-loop stalls longer than LOOP_LAG_THRESHOLD_MS")
+
+
+class BlockingCallError(RuntimeError):
+    """A blocking call ran on the event loop thread (strict mode)"""
+
+
+class LoopWatchdog:
+    """One per process; start() from a startup hook (needs the running loop)"""
+
+    def __init__(self, heartbeat_ms: Optional[float] = None, threshold_ms: Optional[float] = None):
+        self.interval = (heartbeat_ms or settings.LOOP_HEARTBEAT_MS) / 1000
+        self.threshold = (threshold_ms or settings.LOOP_LAG_THRESHOLD_MS) / 1000
+        self.recent_stalls: Deque[Dict] = deque(maxlen=20)
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._reported_beat = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    # -------------------- HEARTBEAT (loop) --------------------
+    async def _heartbeat(self) -> None:
+        while True:
+            started = time.perf_counter()
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(time.perf_counter() - started - self.interval, 0.0))
+
+    # -------------------- WATCHDOG (thread) --------------------
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            stalled_for = time.monotonic() - beat - self.interval
+            if stalled_for > self.threshold and beat != self._reported_beat:
+                self._reported_beat = beat  # One report per stall
+                self._report(stalled_for)
+
+    def _report(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+        LOOP_STALLS.inc()
+        self.recent_stalls.append({"at": time.time(), "stalled_ms": round(stalled_for * 1000, 1), "stack": stack})
+        logger.warning(
+            "Event loop blocked for %.0f ms (and counting); loop thread stack:\n%s",
+            stalled_for * 1000, stack
+        )
+
+    # -------------------- LIFECYCLE --------------------
+    def start(self) -> None:
+        if self.running:
+            return  # Several apps in one process share the watchdog
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stop.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._thread.join()
+
+
+loop_watchdog = LoopWatchdog()
+
+
+# ==================== STRICT MODE ====================
+def _reject_sql_on_loop(conn, cursor, statement, parameters, context, executemany):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # Worker thread / script: fine
+    raise BlockingCallError(
+        "Synchronous SQL on the event loop thread: make the handler a plain `def` "
+        f"or use run_in_threadpool. Statement: {statement[:200]}"
+    )
+
+
+def enable_strict_mode() -> None:
+    if not event.contains(engine, "before_cursor_execute", _reject_sql_on_loop):
+        event.listen(engine, "before_cursor_execute", _reject_sql_on_loop)
+
+
+def install_loop_watchdog(app) -> None:
+    """Start/stop the process watchdog with the app; strict mode per LOOP_STRICT_MODE"""
+    if settings.LOOP_STRICT_MODE:
+        enable_strict_mode()
+    if not settings.LOOP_WATCHDOG_ENABLED:
+        return
+
+    async def start_watchdog():
+        loop_watchdog.start()
+
+    app.add_event_handler("startup", start_watchdog)
+    app.add_event_handler("shutdown", loop_watchdog.stop)
@@ -0,0 +1,441 @@
+"""
+Metrics (Shared across all backends)
+Prometheus text-format metrics without a client library dependency.
+Counters and histograms write to per-thread shards (no lock on the hot path)
+that are summed on scrape; gauges are read from callbacks at scrape time.
+install_metrics(app, "driver") adds the request middleware and GET /metrics.
+Preforked workers share one port, so a scrape reaches any one of them: with
+METRICS_MULTIPROC_DIR set (the launcher sets it) every worker writes its
+values to <dir>/<pid>.json every METRICS_EXPORT_SECONDS and on exit, and a
+scrape merges all files. Counters and histograms include exited workers (so
+totals never go backwards); gauges count live workers only, summed or, for
+table-wide values, the max.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+
+from backend.shared.config import settings
+from backend.shared.database import engine
+from backend.shared.db_instrumentation import current_db_stats
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ==================== METRIC TYPES ====================
+class _Sharded:
+    """Base for metrics whose writes go to a dict owned by the writing thread"""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:  # Once per thread
+                self._shards.append(shard)
+            return shard
+
+    def _snapshots(self) -> List[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL, so writers never block or break the scrape
+        return [shard.copy() for shard in shards]
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def collect(self) -> List[str]:
+        return self.lines(self.snapshot())
+
+
+class Counter(_Sharded):
+    """Monotonic counter: counter.inc("GET", amount=2)"""
+
+    kind = "counter"
+    live_only = False  # Exited workers' counts stay in the total
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        totals: Dict[Tuple, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def merge(self, processes: List[Tuple[bool, Dict[Tuple, Any]]]) -> Dict[Tuple, float]:
+        totals: Dict[Tuple, float] = {}
+        for alive, values in processes:
+            if alive or not self.live_only:
+                for key, value in values.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def lines(self, values: Dict[Tuple, float]) -> List[str]:
+        lines = self.header()
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_format(value)}")
+        return lines
+
+
+class UpDownCounter(Counter):
+    """Sharded gauge that moves by deltas (in-flight requests, open sockets)"""
+
+    kind = "gauge"
+    live_only = True
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Sharded):
+    """Cumulative-bucket histogram: histogram.observe(0.042, "GET", "/x")"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues) -> None:
+        shard = self._shard()
+        state = shard.get(labelvalues)
+        if state is None:
+            # [count per bucket..., +Inf bucket, sum, count]
+            state = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    @staticmethod
+    def _add(merged: Dict[Tuple, list], values: Dict[Tuple, list]) -> Dict[Tuple, list]:
+        for key, state in values.items():
+            state = list(state)  # The owner thread may still be writing the original
+            total = merged.get(key)
+            merged[key] = state if total is None else [a + b for a, b in zip(total, state)]
+        return merged
+
+    def snapshot(self) -> Dict[Tuple, list]:
+        merged: Dict[Tuple, list] = {}
+        for shard in self._snapshots():
+            self._add(merged, shard)
+        return merged
+
+    def merge(self, processes: List[Tuple[bool, Dict[Tuple, Any]]]) -> Dict[Tuple, list]:
+        merged: Dict[Tuple, list] = {}
+        for _, values in processes:
+            self._add(merged, values)
+        return merged
+
+    def lines(self, merged: Dict[Tuple, list]) -> List[str]:
+        lines = self.header()
+        bounds = self.buckets + (float("inf"),)
+        for key, state in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                le = 'le="%s"' % _format(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_format(state[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+class CallbackGauge:
+    """
+    Gauge read at scrape time. The callback returns a number, or a dict of
+    label tuple -> number when labelnames are given. Across workers, live
+    values are summed (multiprocess_mode="sum", per-process quantities) or
+    the max is taken ("max", values every worker reads from the same place).
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable, labelnames: Sequence[str] = (),
+                 multiprocess_mode: str = "sum"):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelnames = tuple(labelnames)
+        self.multiprocess_mode = multiprocess_mode
+
+    def snapshot(self) -> Dict[Tuple, float]:
+        try:
+            value = self.callback()
+        except Exception:
+            return {}  # A broken source must not break the scrape
+        if value is None:
+            return {}
+        return dict(value) if isinstance(value, dict) else {(): value}
+
+    def merge(self, processes: List[Tuple[bool, Dict[Tuple, Any]]]) -> Dict[Tuple, float]:
+        combine = max if self.multiprocess_mode == "max" else (lambda a, b: a + b)
+        merged: Dict[Tuple, float] = {}
+        for alive, values in processes:
+            if alive:
+                for key, value in values.items():
+                    merged[key] = value if key not in merged else combine(merged[key], value)
+        return merged
+
+    def lines(self, values: Dict[Tuple, float]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for key, item in sorted(values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, key)} {_format(item)}")
+        return lines
+
+    def collect(self) -> List[str]:
+        return self.lines(self.snapshot())
+
+
+# ==================== REGISTRY ====================
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """Register once; re-registering a name returns the existing metric (module reloads, sub-apps)"""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def metrics(self) -> list:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        directory = settings.METRICS_MULTIPROC_DIR
+        processes = None
+        if directory:
+            write_process_metrics()  # This worker's values as of now
+            processes = read_process_metrics(directory)
+        lines: List[str] = []
+        for metric in self.metrics():
+            if processes is None:
+                lines.extend(metric.collect())
+            else:
+                lines.extend(metric.lines(metric.merge([
+                    (alive, values.get(metric.name, {})) for alive, values in processes
+                ])))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# ==================== MULTIPROCESS ====================
+_export_pid: Optional[int] = None
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def write_process_metrics() -> None:
+    """Write this process's values to METRICS_MULTIPROC_DIR/<pid>.json (atomic replace)"""
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    data = {
+        metric.name: [[list(key), value] for key, value in metric.snapshot().items()]
+        for metric in REGISTRY.metrics()
+    }
+    path = Path(directory) / f"{os.getpid()}.json"
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def read_process_metrics(directory: str) -> List[Tuple[bool, Dict[str, Dict[Tuple, Any]]]]:
+    """[(process alive, {metric name: {label tuple: value}})] for every worker that wrote a file"""
+    processes = []
+    for path in Path(directory).glob("*.json"):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue  # Vanished or half-written by an old version: skip this scrape
+        values = {name: {tuple(key): value for key, value in items} for name, items in data.items()}
+        processes.append((path.stem == str(os.getpid()) or _alive(int(path.stem)), values))
+    return processes
+
+
+def reset_process_metrics(directory: str) -> None:
+    """Launcher side, before forking: start from empty totals"""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    for path in Path(directory).glob("*.json*"):
+        path.unlink(missing_ok=True)
+
+
+def start_process_export() -> None:
+    """Worker side: write this process's values every METRICS_EXPORT_SECONDS (once per process)"""
+    global _export_pid
+    if not settings.METRICS_MULTIPROC_DIR or _export_pid == os.getpid():
+        return
+    _export_pid = os.getpid()
+
+    def export():
+        while True:
+            time.sleep(settings.METRICS_EXPORT_SECONDS)
+            try:
+                write_process_metrics()
+            except Exception:
+                logger.warning("Writing process metrics failed", exc_info=True)
+
+    threading.Thread(target=export, name="metrics-export", daemon=True).start()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def up_down_counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> UpDownCounter:
+    return REGISTRY.register(UpDownCounter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge(name: str, documentation: str, callback: Callable, labelnames: Sequence[str] = (),
+          multiprocess_mode: str = "sum") -> CallbackGauge:
+    return REGISTRY.register(CallbackGauge(name, documentation, callback, labelnames, multiprocess_mode))
+
+
+# ==================== SHARED METRICS ====================
+HTTP_REQUESTS = counter(
+    "http_requests_total", "HTTP requests by route and status", ("app", "method", "route", "status")
+)
+HTTP_LATENCY = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("app", "method", "route")
+)
+HTTP_IN_FLIGHT = up_down_counter("http_requests_in_flight", "HTTP requests being served", ("app",))
+DB_SECONDS = histogram(
+    "http_request_db_seconds", "DB time per HTTP request", ("app", "route"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# cache_requests_total{cache, result="hit"|"miss"}: hit ratio = hit / (hit + miss)
+CACHE_REQUESTS = counter("cache_requests_total", "Cache lookups by cache and result", ("cache", "result"))
+
+SHIPMENT_TRANSITIONS = counter(
+    "shipment_status_transitions_total", "Shipment status transitions by new status", ("status",)
+)
+GPS_POINTS = counter("gps_points_ingested_total", "GPS points stored by ingestion path", ("source",))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def _pool_stats() -> Optional[dict]:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    stats = {("checked_out",): pool.checkedout()}
+    if hasattr(pool, "overflow"):
+        stats[("overflow",)] = max(pool.overflow(), 0)
+        stats[("size",)] = pool.size()
+    return stats
+
+
+gauge("db_pool_connections", "SQLAlchemy pool connections by state", _pool_stats, ("state",))
+
+
+# ==================== HTTP ====================
+class MetricsMiddleware:
+    """Pure ASGI middleware: latency histogram, status counter and in-flight gauge per route template"""
+
+    def __init__(self, app, app_name: str):
+        self.app = app
+        self.app_name = app_name
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        app_name = self.app_name
+        method = scope["method"]
+        status_holder = [500]
+        started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(app_name)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                stats = current_db_stats()
+                if stats is not None:
+                    DB_SECONDS.observe(stats.seconds, app_name, _route_label(scope))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = _route_label(scope)
+            HTTP_IN_FLIGHT.dec(app_name)
+            HTTP_LATENCY.observe(time.perf_counter() - started, app_name, method, route)
+            HTTP_REQUESTS.inc(app_name, method, route, status_holder[0])
+
+
+def _route_label(scope) -> str:
+    """Route template (/shipments/{shipment_id}), never the raw path, to bound cardinality"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def install_metrics(app: FastAPI, app_name: str) -> None:
+    """Add request metrics and GET /metrics to an app"""
+    app.add_middleware(MetricsMiddleware, app_name=app_name)
+
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
@@ -6,8 +6,9 @@ import enum
 from datetime import datetime
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Enum,
-    ForeignKey, Text, Boolean
+    ForeignKey, Text, Boolean, Index
 )
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from backend.shared.database import Base
 from backend.driver_backend.utils.enums import (
@@ -27,6 +28,14 @@ class UserRole(str, enum.Enum):
     ADMIN = "admin"
 
 
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
 
 
 # ================================================================
@@ -195,4 +204,64 @@ class TrackingData(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
-    shipment = relationship("Shipment", back_populates="tracking")
\ No newline at end of file
+    shipment = relationship("Shipment", back_populates="tracking")
+
+
+
+# ================================================================
+# ===================== OUTBOX MODEL =============================
+# Written in the SAME transaction as a shipment state change.
+# A background relay publishes pending rows to the event bus and
+# stamps published_at (at-least-once delivery, no dual writes).
+# ================================================================
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    aggregate_type = Column(String(50), nullable=False)   # e.g. "shipment"
+    aggregate_id = Column(Integer, nullable=False, index=True)
+    event_type = Column(String(50), nullable=False)       # e.g. "status"
+    payload = Column(Text, nullable=False)                # JSON event body
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    published_at = Column(DateTime, nullable=True)
+    attempts = Column(Integer, default=0)
+
+    # Relay scans pending rows in id order
+    __table_args__ = (
+        Index("ix_outbox_events_pending", "published_at", "id"),
+    )
+
+
+
+# ================================================================
+# ======================= JOB MODEL ==============================
+# One row per background job (exports, bulk pricing, ...).
+# The API inserts it as QUEUED; a job worker claims it (RUNNING)
+# and stores the JSON result or the error. Admins poll this row.
+# ================================================================
+JSON_TEXT = Text().with_variant(mysql.LONGTEXT(), "mysql")
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False, index=True)  # e.g. "shipments_export"
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    # LONGTEXT on MySQL: TEXT stops at 64 KB (a bulk_pricing request or result passes that easily)
+    params = Column(JSON_TEXT, nullable=False)                 # JSON, validated on submit
+    result = Column(JSON_TEXT, nullable=True)                  # JSON, set on success
+    error = Column(Text, nullable=True)                        # set on failure
+    attempts = Column(Integer, default=0)
+
+    submitted_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Admin list: newest jobs by status
+    __table_args__ = (
+        Index("ix_jobs_status_created", "status", "created_at"),
+    )
@@ -0,0 +1,228 @@
+"""
+Transactional Outbox (Shared across all backends)
+record_shipment_status() adds an outbox row inside the caller's transaction.
+OutboxRelay claims pending rows with FOR UPDATE SKIP LOCKED, publishes them
+on the event bus and marks them published. Several relays (workers or a
+standalone `python -m backend.shared.outbox`) can run side by side.
+Consumers that must act once per event (customer notifications) register
+with add_consumer() instead of subscribing to the bus: each row is claimed
+by exactly one relay, so only one process sees it. Consumers run after the
+batch is committed, so a failed commit never notifies twice (a crash between
+commit and delivery loses those notifications: at most once). Bus subscribers
+get each event at least once (a failed commit republishes) and drop repeated
+event_ids.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from sqlalchemy import event as orm_event, func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+from backend.shared.database import SessionLocal
+from backend.shared.event_bus import EventBus, get_event_bus, status_event
+from backend.shared.health import register_queue
+from backend.shared.metrics import SHIPMENT_TRANSITIONS, gauge
+from backend.shared.models import OutboxEvent, Shipment
+
+logger = logging.getLogger(__name__)
+
+# How often the relay deletes rows older than OUTBOX_RETENTION_HOURS
+PURGE_INTERVAL_SECONDS = 300
+
+# Session.info key: statuses staged in the open transaction, counted once it commits
+PENDING_TRANSITIONS = "outbox_pending_transitions"
+
+
+def add_outbox_event(db: Session, aggregate_type: str, aggregate_id: int, event: dict) -> OutboxEvent:
+    """Stage an event in the current transaction (caller commits)"""
+    row = OutboxEvent(
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        event_type=event["type"],
+        payload=json.dumps(event, default=str)
+    )
+    db.add(row)
+    return row
+
+
+def record_shipment_status(db: Session, shipment: Shipment) -> OutboxEvent:
+    """Stage a status event for the shipment's current status (call before commit)"""
+    db.info.setdefault(PENDING_TRANSITIONS, []).append(getattr(shipment.status, "value", shipment.status))
+    return add_outbox_event(db, "shipment", shipment.id, status_event(
+        shipment_id=shipment.id,
+        status=shipment.status,
+        driver_id=shipment.driver_id,
+        customer_id=shipment.customer_id
+    ))
+
+
+@orm_event.listens_for(Session, "after_commit")
+def _count_committed_transitions(session: Session) -> None:
+    for new_status in session.info.pop(PENDING_TRANSITIONS, ()):
+        SHIPMENT_TRANSITIONS.inc(new_status)
+
+
+@orm_event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_transitions(session: Session) -> None:
+    session.info.pop(PENDING_TRANSITIONS, None)
+
+
+class OutboxRelay:
+    """Polls outbox_events and publishes pending rows on the event bus"""
+
+    def __init__(self, bus: Optional[EventBus] = None, batch_size: Optional[int] = None):
+        self._bus = bus
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+        self._last_count = 0.0
+        # Unpublished rows in the table (all relays), refreshed once per poll interval; None until counted
+        self.backlog: Optional[int] = None
+        self._consumers: List[Callable[[dict], None]] = []
+
+    @property
+    def bus(self) -> EventBus:
+        return self._bus or get_event_bus()
+
+    def add_consumer(self, handler: Callable[[dict], None]) -> Callable[[], None]:
+        """Call handler(event) for every event this relay publishes; returns a remove callable"""
+        self._consumers = self._consumers + [handler]
+
+        def remove():
+            self._consumers = [c for c in self._consumers if c is not handler]
+
+        return remove
+
+    def _deliver(self, event: dict) -> None:
+        for consumer in self._consumers:
+            try:
+                consumer(event)
+            except Exception:
+                logger.exception("Outbox consumer failed for event %s", event.get("event_id"))
+
+    # -------------------- ONE BATCH --------------------
+    def relay_batch(self) -> int:
+        """Claim, publish and mark one batch; returns the number published"""
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(OutboxEvent)
+                .filter(OutboxEvent.published_at.is_(None))
+                .order_by(OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            published = []
+            now = datetime.utcnow()
+            for row in rows:
+                event = json.loads(row.payload)
+                event["event_id"] = row.id  # Lets consumers drop redeliveries
+                try:
+                    self.bus.publish_event(event, strict=True)
+                except Exception:
+                    row.attempts = (row.attempts or 0) + 1
+                    logger.warning("Outbox event %s publish failed (attempt %s)", row.id, row.attempts)
+                    break  # Keep per-aggregate order; retry from here next poll
+                row.published_at = now
+                published.append(event)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        # Only once the rows are marked: a failed commit must not notify customers twice
+        for event in published:
+            self._deliver(event)
+        return len(published)
+
+    def count_pending(self) -> int:
+        """Unpublished rows, whichever relay will claim them"""
+        db = SessionLocal()
+        try:
+            return db.query(func.count(OutboxEvent.id)).filter(OutboxEvent.published_at.is_(None)).scalar()
+        finally:
+            db.close()
+
+    def purge_published(self) -> int:
+        """Delete published rows past the retention window"""
+        cutoff = datetime.utcnow() - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+        db = SessionLocal()
+        try:
+            deleted = db.query(OutboxEvent).filter(
+                OutboxEvent.published_at.isnot(None),
+                OutboxEvent.published_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    # -------------------- LOOP --------------------
+    async def run(self, poll_seconds: Optional[float] = None) -> None:
+        """Relay until cancelled; drains back-to-back while batches come back full"""
+        poll_seconds = poll_seconds if poll_seconds is not None else settings.OUTBOX_POLL_SECONDS
+        while True:
+            try:
+                published = await run_in_threadpool(self.relay_batch)
+                # At most once per poll interval, even while draining full batches back-to-back
+                if time.monotonic() - self._last_count >= poll_seconds:
+                    self._last_count = time.monotonic()
+                    self.backlog = await run_in_threadpool(self.count_pending)
+                if time.monotonic() - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                    self._last_purge = time.monotonic()
+                    await run_in_threadpool(self.purge_published)
+            except Exception:
+                logger.exception("Outbox relay iteration failed")
+                published = 0
+            if published < self.batch_size:
+                await asyncio.sleep(poll_seconds)
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # Publish whatever was committed before shutdown
+        try:
+            await run_in_threadpool(self.relay_batch)
+        except Exception:
+            logger.exception("Final outbox relay failed")
+
+
+# Process-wide relay, started by the driver backend on startup
+outbox_relay = OutboxRelay()
+gauge(
+    "outbox_backlog", "Unpublished outbox rows (counted by this process's relay)",
+    lambda: outbox_relay.backlog, multiprocess_mode="max"  # Table-wide: every relay counts the same rows
+)
+# Only processes running the relay report it (the others return None)
+register_queue("outbox", lambda: outbox_relay.backlog, settings.HEALTH_MAX_OUTBOX_BACKLOG)
+
+
+async def _run_standalone() -> None:
+    # Notifications follow the relay: with OUTBOX_RELAY_ENABLED off in the API, they are sent from here
+    from backend.driver_backend.services.notification_service import notification_dispatcher
+
+    notification_dispatcher.start(outbox_relay)
+    try:
+        await outbox_relay.run()
+    finally:
+        await notification_dispatcher.stop()
+
+
+if __name__ == "__main__":
+    # Standalone relay process: scale consumers independently of the API
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_standalone())
@@ -0,0 +1,251 @@
+"""
+Request Profiling (Shared across all backends)
+Opt-in sampling profiler. A request is profiled when it carries
+"X-Profile: <PROFILING_TOKEN>" or falls in PROFILING_SAMPLE_RATE. While it runs, a
+sampler thread records, every PROFILING_INTERVAL_MS, the stacks working for that
+request only: the event loop while one of its tasks runs, and threadpool workers
+(sync handlers, dependencies) while they run a job it submitted. Concurrent
+requests on the same process stay out of its profile. The profile is stored as
+JSON under PROFILING_DIR keyed by request id (X-Profile-Id response header) and
+served by the admin backend (/admin/profiles).
+With neither setting configured the middleware is not installed at all.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import Context, ContextVar
+from hmac import compare_digest
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.config import settings
+
+# Innermost frames of threads that are idle, not working for anyone
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+}
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# Id of the profiled request, inherited by its tasks and threadpool jobs
+_profiled_request: ContextVar[Optional[str]] = ContextVar("profiled_request", default=None)
+
+
+# ==================== SAMPLER ====================
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+def _job_context(frame) -> Optional[Context]:
+    """Context of the job a threadpool worker is running (anyio's WorkerThread.run holds it in `context`)"""
+    while frame is not None:
+        if frame.f_code.co_name == "run":
+            context = frame.f_locals.get("context")
+            if isinstance(context, Context):
+                return context
+        frame = frame.f_back
+    return None
+
+
+class StackSampler:
+    """
+    Samples threads working for one request (request_id), or every thread
+    but itself when request_id is None; one active sampler per process
+    """
+
+    _active = threading.Lock()
+
+    def __init__(self, interval: float, request_id: Optional[str] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None, loop_thread_id: Optional[int] = None):
+        self.interval = interval
+        self.request_id = request_id
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """False when another request is already being profiled"""
+        if not StackSampler._active.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        StackSampler._active.release()
+
+    def _serves_request(self, thread_id: int, frame) -> bool:
+        if thread_id == self.loop_thread_id:
+            # The task may switch between reading frames and this check: an occasional misattributed sample
+            task = asyncio.current_task(self.loop)
+            context = task.get_context() if task is not None else None
+        else:
+            context = _job_context(frame)
+        return context is not None and context.get(_profiled_request) == self.request_id
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                if self.request_id is not None and not self._serves_request(thread_id, frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append("[event loop]" if thread_id == self.loop_thread_id else "[thread]")
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def top_functions(self, limit: int = 25) -> List[Dict]:
+        """Self (leaf) and inclusive sample counts per function"""
+        own, inclusive = Counter(), Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for label in set(frames):
+                inclusive[label] += count
+        return [
+            {"function": label, "self": own[label], "inclusive": count}
+            for label, count in inclusive.most_common(limit)
+        ]
+
+
+# ==================== STORAGE ====================
+class ProfileStore:
+    """One JSON file per profiled request, pruned to PROFILING_MAX_PROFILES"""
+
+    def __init__(self, directory: Optional[str] = None, max_profiles: Optional[int] = None):
+        self.directory = Path(directory or settings.PROFILING_DIR)
+        self.max_profiles = max_profiles or settings.PROFILING_MAX_PROFILES
+
+    def _path(self, profile_id: str) -> Path:
+        if not _PROFILE_ID.match(profile_id):
+            raise KeyError(profile_id)
+        return self.directory / f"{profile_id}.json"
+
+    def save(self, profile: Dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(profile["id"])
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(profile))
+        tmp.replace(path)
+        self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in files[:-self.max_profiles]:
+            old.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        """Summaries, newest first"""
+        if not self.directory.exists():
+            return []
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+            try:
+                profile = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            summaries.append({key: profile.get(key) for key in (
+                "id", "service", "method", "path", "status", "duration_ms", "samples", "created_at"
+            )})
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        try:
+            return json.loads(self._path(profile_id).read_text())
+        except (KeyError, OSError, ValueError):
+            return None
+
+
+# ==================== MIDDLEWARE ====================
+class ProfilingMiddleware:
+    """Pure ASGI middleware; requests that are not selected pass straight through"""
+
+    def __init__(self, app, service: str, store: Optional[ProfileStore] = None):
+        self.app = app
+        self.service = service
+        self.store = store or ProfileStore()
+        self.token = settings.PROFILING_TOKEN.encode() if settings.PROFILING_TOKEN else None
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.interval = settings.PROFILING_INTERVAL_MS / 1000
+
+    def _selected(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    return compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        sampler = StackSampler(self.interval, profile_id, asyncio.get_running_loop(), threading.get_ident())
+        if not sampler.start():
+            await self.app(scope, receive, send)
+            return
+        status_holder = [500]
+
+        async def profiled_send(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        started = time.perf_counter()
+        token = _profiled_request.set(profile_id)
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            _profiled_request.reset(token)
+            sampler.stop()
+            await run_in_threadpool(self.store.save, {
+                "id": profile_id,
+                "service": self.service,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_holder[0],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "interval_ms": settings.PROFILING_INTERVAL_MS,
+                "samples": sampler.samples,
+                "scope": "request",  # Only this request's tasks and threadpool jobs were sampled
+                "created_at": time.time(),
+                "top": sampler.top_functions(),
+                # Collapsed stacks: feed to flamegraph.pl or speedscope as-is
+                "stacks": dict(sampler.stacks.most_common())
+            })
+
+
+def install_profiling(app, service: str) -> None:
+    """Add the profiling middleware only when profiling is configured (zero cost otherwise)"""
+    if settings.PROFILING_TOKEN or settings.PROFILING_SAMPLE_RATE > 0:
+        app.add_middleware(ProfilingMiddleware, service=service)
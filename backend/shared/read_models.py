@@ -0,0 +1,113 @@
+"""
+Read Models (Shared across all backends)
+Lightweight NamedTuple rows for list views and dashboards.
+Each row type knows its columns, so queries select only those columns:
+no Text blobs, no ORM hydration and nothing added to the session identity map.
+"""
+from typing import Any, List, NamedTuple, Optional, Type
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.shared.models import Shipment, TrackingData, User
+
+
+def _bind_columns(row_type: Type, model) -> Type:
+    """Attach the mapped columns (same names as the tuple fields) to a row type"""
+    row_type.columns = tuple(getattr(model, field) for field in row_type._fields)
+    return row_type
+
+
+def fetch_rows(db: Session, row_type: Type, *criteria, order_by=None, limit: Optional[int] = None) -> List[Any]:
+    """SELECT row_type.columns WHERE criteria -> list of row_type"""
+    statement = select(*row_type.columns).where(*criteria)
+    if order_by is not None:
+        statement = statement.order_by(order_by)
+    if limit is not None:
+        statement = statement.limit(limit)
+    make = row_type._make
+    return [make(row) for row in db.execute(statement)]
+
+
+# ==================== SHIPMENT ROWS ====================
+class DriverShipmentRow(NamedTuple):
+    """Driver's active shipment list / dashboard current shipment"""
+    id: int
+    shipment_number: str
+    pickup_location: str
+    delivery_location: str
+    status: Any
+    estimated_delivery: Optional[datetime]
+    is_cod: bool
+    cod_amount: Optional[float]
+    shipment_type: Any
+
+
+class CustomerShipmentRow(NamedTuple):
+    """Customer's shipment list (ShipmentResponse)"""
+    id: int
+    shipment_number: str
+    customer_id: int
+    pickup_location: str
+    delivery_location: str
+    cargo_type: Optional[str]
+    weight: Optional[float]
+    dimensions: Optional[str]
+    status: Any
+    estimated_delivery: Optional[datetime]
+    actual_delivery: Optional[datetime]
+    is_cod: bool
+    cod_amount: Optional[float]
+    cod_status: Any
+    base_price: Optional[float]
+    fuel_surcharge: Optional[float]
+    total_price: Optional[float]
+    created_at: datetime
+    updated_at: datetime
+
+
+class AdminShipmentRow(NamedTuple):
+    """Admin shipment list (admin ShipmentListResponse)"""
+    id: int
+    shipment_number: str
+    customer_id: int
+    driver_id: Optional[int]
+    pickup_location: str
+    delivery_location: str
+    cargo_type: Optional[str]
+    weight: Optional[float]
+    status: Any
+    estimated_delivery: Optional[datetime]
+    actual_delivery: Optional[datetime]
+    total_price: Optional[float]
+    created_at: datetime
+
+
+# ==================== OTHER ROWS ====================
+class TrackingRow(NamedTuple):
+    """Tracking history entry (TrackingResponse)"""
+    id: int
+    latitude: Optional[float]
+    longitude: Optional[float]
+    location_name: Optional[str]
+    status_update: Optional[str]
+    timestamp: datetime
+
+
+class DriverRow(NamedTuple):
+    """Admin driver list (DriverResponse)"""
+    id: int
+    email: str
+    full_name: str
+    phone: Optional[str]
+    role: Any
+    is_active: bool
+    created_at: datetime
+
+
+_bind_columns(DriverShipmentRow, Shipment)
+_bind_columns(CustomerShipmentRow, Shipment)
+_bind_columns(AdminShipmentRow, Shipment)
+_bind_columns(TrackingRow, TrackingData)
+_bind_columns(DriverRow, User)
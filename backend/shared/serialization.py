@@ -0,0 +1,86 @@
+"""
+Fast JSON Serialization (Shared across all backends)
+FastJSONResponse renders with orjson when installed (stdlib json otherwise).
+projection() builds a row -> dict function once per list view, so list
+endpoints can return fast_json() directly and skip per-item response_model
+validation when the service already guarantees the shape.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes (naive datetimes stay naive, enums become values)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class for all three backends"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Return pre-shaped content without response_model validation.
+    Headers set on the injected `response` (ETag, Server-Timing...) are carried over,
+    because FastAPI ignores the sub-response once a Response is returned.
+    """
+    result = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for key, value in response.headers.items():
+            if key not in ("content-length", "content-type"):
+                result.headers[key] = value
+    return result
+
+
+# ==================== PROJECTIONS ====================
+def enum_value(value):
+    """Converter: Enum -> its value, None stays None"""
+    return value.value if value is not None else None
+
+
+def projection(*fields: str, **converters: Callable) -> Callable[[Any], dict]:
+    """
+    Build `lambda row: {"a": row.a, "b": conv(row.b), ...}` for the given
+    attribute names. Works on ORM objects, Row tuples and NamedTuples alike.
+    """
+    names = list(fields) + [name for name in converters if name not in fields]
+    for name in names:
+        if not name.isidentifier():
+            raise ValueError(f"Invalid field name: {name!r}")
+
+    # (key, getter, converter or None), resolved once instead of per row
+    steps = tuple((name, attrgetter(name), converters.get(name)) for name in names)
+
+    def project(row) -> dict:
+        result = {}
+        for name, get, convert in steps:
+            value = get(row)
+            result[name] = value if convert is None else convert(value)
+        return result
+
+    project.fields = tuple(names)
+    return project
@@ -0,0 +1,250 @@
+"""
+Server (Shared across all backends)
+Preforking uvicorn launcher: the parent imports the app once, binds the
+listening socket and forks the workers, so imports, settings and models are
+loaded once and shared copy-on-write. Each child discards the SQLAlchemy
+pool it inherited (engine.dispose(close=False)) and opens its own
+connections. The parent restarts a worker that dies and forwards
+SIGINT/SIGTERM to all of them. Workers export their metrics to a shared
+directory (METRICS_MULTIPROC_DIR, a temp dir by default) so /metrics on any
+worker reports the totals of all of them.
+On SIGTERM each worker stops accepting, lets in-flight requests finish
+(up to WEB_GRACEFUL_TIMEOUT_SECONDS) and then runs the apps' shutdown
+handlers, which flush the outbox relay, pending notifications and streamed
+GPS batches. Startup time is logged per phase.
+
+    python -m backend.shared.server gateway --workers 4
+    python main.py driver --port 8002 --limit-concurrency 200
+"""
+import argparse
+import logging
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Optional, Sequence, Union
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from backend.shared.config import settings
+from backend.shared.database import engine, init_db
+from backend.shared.metrics import reset_process_metrics, start_process_export, write_process_metrics
+
+logger = logging.getLogger(__name__)
+
+# A worker that dies this soon after starting is not restarted (broken app, not a crash)
+MIN_WORKER_LIFETIME_SECONDS = 5.0
+# Extra time the parent gives draining workers before SIGKILL
+KILL_AFTER_GRACE_SECONDS = 10
+
+# target -> (app path, port setting)
+TARGETS = {
+    "user": ("backend.user_backend.main:app", "API_PORT_USER"),
+    "driver": ("backend.driver_backend.main:app", "API_PORT_DRIVER"),
+    "admin": ("backend.admin_backend.main:app", "API_PORT_ADMIN"),
+    "gateway": ("backend.gateway.main:app", "API_PORT_GATEWAY"),
+}
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn.Server that logs its startup time and how long draining took"""
+
+    def __init__(self, config: uvicorn.Config, started_at: Optional[float] = None):
+        super().__init__(config)
+        self.started_at = started_at or time.perf_counter()
+
+    async def startup(self, sockets=None) -> None:
+        began = time.perf_counter()
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            logger.info(
+                "Worker %d ready: startup handlers %.3fs, %.3fs since fork",
+                os.getpid(), time.perf_counter() - began, time.perf_counter() - self.started_at
+            )
+
+    async def shutdown(self, sockets=None) -> None:
+        began = time.perf_counter()
+        logger.info(
+            "Worker %d draining %d connection(s)", os.getpid(), len(self.server_state.connections)
+        )
+        await super().shutdown(sockets=sockets)
+        write_process_metrics()  # Final counts of this worker stay in the totals
+        logger.info("Worker %d stopped in %.3fs", os.getpid(), time.perf_counter() - began)
+
+
+def _after_fork() -> None:
+    """Child side: never reuse the parent's DB connections (one socket, two processes)"""
+    engine.dispose(close=False)
+
+
+def _run_worker(app: Any, sock: socket.socket, config_kwargs: Dict[str, Any]) -> None:
+    forked_at = time.perf_counter()
+    for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGCHLD, signal.SIGALRM):
+        signal.signal(sig, signal.SIG_DFL)  # uvicorn installs its own graceful handlers
+    _after_fork()
+    start_process_export()
+    DrainingServer(uvicorn.Config(app, **config_kwargs), started_at=forked_at).run(sockets=[sock])
+
+
+def serve(app: Union[str, Any], host: str, port: int, workers: int = 1, **config_kwargs: Any) -> None:
+    """Preload app ("module:attribute" or the app itself), then serve it from `workers` forked processes"""
+    phases = []
+    began = time.perf_counter()
+    if isinstance(app, str):
+        app = import_from_string(app)
+    phases.append(("import", time.perf_counter() - began))
+
+    # Once here instead of in every worker's startup (workers inherit "done")
+    began = time.perf_counter()
+    init_db()
+    phases.append(("schema", time.perf_counter() - began))
+
+    began = time.perf_counter()
+    sock = bind_socket(host, port, config_kwargs.get("backlog", 2048))
+    phases.append(("bind", time.perf_counter() - began))
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        logger.info("Startup phases: %s", ", ".join(f"{name} {seconds:.3f}s" for name, seconds in phases))
+        DrainingServer(uvicorn.Config(app, **config_kwargs)).run(sockets=[sock])
+        return
+
+    # Nothing pooled may cross the fork
+    engine.dispose()
+
+    # One /metrics for all workers: each writes its values here, any of them merges on scrape
+    metrics_dir_created = not settings.METRICS_MULTIPROC_DIR
+    if metrics_dir_created:
+        settings.METRICS_MULTIPROC_DIR = tempfile.mkdtemp(prefix="metrics-")
+    reset_process_metrics(settings.METRICS_MULTIPROC_DIR)
+
+    children: Dict[int, float] = {}
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(app, sock, config_kwargs)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+
+    def signal_children(signum) -> None:
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        if stopping:
+            return
+        stopping = True
+        logger.info("Draining %d worker(s)", len(children))
+        signal_children(signum)
+        grace = config_kwargs.get("timeout_graceful_shutdown") or 0
+        signal.alarm(int(grace) + KILL_AFTER_GRACE_SECONDS)
+
+    def kill(signum, frame) -> None:
+        logger.error("Workers still running after the drain timeout; killing them")
+        signal_children(signal.SIGKILL)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGALRM, kill)
+
+    began = time.perf_counter()
+    for _ in range(workers):
+        spawn()
+    phases.append(("fork", time.perf_counter() - began))
+    logger.info(
+        "Serving on %s:%d with %d workers; startup phases: %s", host, port, workers,
+        ", ".join(f"{name} {seconds:.3f}s" for name, seconds in phases)
+    )
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        lifetime = time.monotonic() - started
+        logger.warning("Worker %d exited (code %d) after %.1fs", pid, os.waitstatus_to_exitcode(status), lifetime)
+        if lifetime >= MIN_WORKER_LIFETIME_SECONDS:
+            spawn()
+    signal.alarm(0)
+    sock.close()
+    if metrics_dir_created:
+        shutil.rmtree(settings.METRICS_MULTIPROC_DIR, ignore_errors=True)
+    if not stopping:
+        sys.exit(1)  # Every worker failed on startup
+
+
+def default_workers() -> int:
+    return settings.WEB_WORKERS or os.cpu_count() or 1
+
+
+def server_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """uvicorn.Config keyword arguments from the CLI (settings as defaults)"""
+    return {
+        "timeout_keep_alive": args.keep_alive,
+        "backlog": args.backlog,
+        "limit_concurrency": args.limit_concurrency or None,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+        "log_level": args.log_level,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None, app: Any = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a backend (or all of them) behind preforked uvicorn workers")
+    parser.add_argument("target", choices=sorted(TARGETS), help="backend to serve; gateway = all three")
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, help="default: the target's API_PORT_* setting")
+    parser.add_argument("--workers", type=int, default=default_workers(), help="default: WEB_WORKERS or CPU count")
+    parser.add_argument("--keep-alive", type=int, default=settings.WEB_KEEPALIVE_SECONDS,
+                        help="seconds an idle connection stays open")
+    parser.add_argument("--backlog", type=int, default=settings.WEB_BACKLOG,
+                        help="pending connections the kernel queues")
+    parser.add_argument("--limit-concurrency", type=int, default=settings.WEB_LIMIT_CONCURRENCY,
+                        help="connections per worker beyond which requests get 503 (0 = no limit)")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+                        help="seconds to let in-flight requests finish on SIGTERM")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    app_path, port_setting = TARGETS[args.target]
+    serve(
+        app if app is not None else app_path,
+        host=args.host,
+        port=args.port or getattr(settings, port_setting),
+        workers=max(args.workers, 1),
+        **server_options(args)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,17 @@
 """
 Shipment Controller - Handles HTTP requests for shipment operations
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from backend.shared.database import get_db
+from backend.shared.http_cache import conditional_get
+from backend.shared.serialization import fast_json
 from backend.shared.models import User
-from backend.user_backend.services.shipment_service import ShipmentService
+from backend.user_backend.services.shipment_service import (
+    ShipmentService, SHIPMENT_PROJECTION, TRACKING_PROJECTION
+)
 from backend.user_backend.schemas.shipment_schema import (
     ShipmentCreate, ShipmentResponse, TrackingResponse
 )
@@ -72,25 +76,43 @@ class ShipmentController:
         db: Session = Depends(get_db)
     ):
         """Get all shipments for current user"""
-        return self.shipment_service.get_user_shipments(current_user.id, db)
+        shipments = self.shipment_service.get_user_shipments(current_user.id, db)
+        return fast_json([SHIPMENT_PROJECTION(s) for s in shipments])
 
     async def get_shipment(
         self,
         shipment_id: int,
+        request: Request,
+        response: Response,
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
     ):
-        """Get specific shipment details"""
+        """Get specific shipment details (304 when the client's ETag is current)"""
+        not_modified = conditional_get(
+            request, response,
+            self.shipment_service.get_shipment_version(shipment_id, current_user.id, db)
+        )
+        if not_modified:
+            return not_modified
         return self.shipment_service.get_shipment_by_id(shipment_id, current_user.id, db)
 
     async def get_shipment_tracking(
         self,
         shipment_id: int,
+        request: Request,
+        response: Response,
         current_user: User = Depends(get_current_user),
         db: Session = Depends(get_db)
     ):
-        """Get real-time tracking data for a shipment"""
-        return self.shipment_service.get_shipment_tracking(shipment_id, current_user.id, db)
+        """Get real-time tracking data for a shipment (304 when nothing new was recorded)"""
+        not_modified = conditional_get(
+            request, response,
+            self.shipment_service.get_tracking_version(shipment_id, current_user.id, db)
+        )
+        if not_modified:
+            return not_modified
+        tracking = self.shipment_service.get_shipment_tracking(shipment_id, current_user.id, db)
+        return fast_json([TRACKING_PROJECTION(t) for t in tracking], response)
 
     async def cancel_shipment(
         self,
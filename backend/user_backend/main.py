@@ -5,21 +5,29 @@
 User Backend - Main Application
 Handles customer-facing operations: registration, login, shipment booking, tracking
 """
+import sys
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
-from backend.shared.database import engine
-from backend.shared.models import Base
+from backend.shared.database import init_db
+from backend.shared.serialization import FastJSONResponse
+from backend.shared.db_instrumentation import install_db_instrumentation
+from backend.shared.metrics import install_metrics
+from backend.shared.health import install_health
+from backend.shared.profiling import install_profiling
+from backend.shared.loop_watchdog import install_loop_watchdog
 from backend.user_backend.services.user_service import UserService
 from backend.user_backend.services.shipment_service import ShipmentService
 from backend.user_backend.controllers.user_controller import UserController
 from backend.user_backend.controllers.shipment_controller import ShipmentController
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Initialize FastAPI app
-app = FastAPI(title="User Backend API", version="1.0.0")
+app = FastAPI(
+    title="User Backend API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
 
 # CORS Configuration
 app.add_middleware(
@@ -30,6 +38,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics + GET /metrics, then per-request DB stats (Server-Timing, slow-query log, N+1 guard)
+install_metrics(app, "user")
+install_db_instrumentation(app)
+
+# GET /health/live, /health/ready (and /health)
+install_health(app, "user_backend")
+
+# Opt-in request profiling (PROFILING_TOKEN / PROFILING_SAMPLE_RATE)
+install_profiling(app, "user_backend")
+
+# Event-loop lag histogram + stall stacks (LOOP_STRICT_MODE: fail sync SQL on the loop)
+install_loop_watchdog(app)
+
 # Initialize services
 user_service = UserService()
 shipment_service = ShipmentService()
@@ -43,6 +64,12 @@ app.include_router(user_controller.router)
 app.include_router(shipment_controller.router)
 
 
+@app.on_event("startup")
+async def create_schema():
+    """Create missing tables off the event loop (no-op after the first app in a process)"""
+    await run_in_threadpool(init_db)
+
+
 @app.get("/")
 async def root():
     return {
@@ -53,5 +80,5 @@ async def root():
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    from backend.shared.server import main
+    main(["user", *sys.argv[1:]], app=app)
@@ -5,6 +5,7 @@
 Shipment Service - Handles all shipment-related business logic
 """
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from fastapi import HTTPException, status
 from typing import List, Optional
 import secrets
@@ -12,6 +13,22 @@ import secrets
 from backend.shared.models import Shipment, TrackingData, User
 from backend.driver_backend.utils.enums import ShipmentStatus
 from backend.user_backend.schemas.shipment_schema import ShipmentCreate
+from backend.shared.http_cache import Version
+from backend.shared.read_models import CustomerShipmentRow, TrackingRow, fetch_rows
+from backend.shared.serialization import projection, enum_value
+
+# Row -> dict projections matching ShipmentResponse / TrackingResponse
+SHIPMENT_PROJECTION = projection(
+    "id", "shipment_number", "customer_id", "pickup_location", "delivery_location",
+    "cargo_type", "weight", "dimensions", "estimated_delivery", "actual_delivery",
+    "is_cod", "cod_amount", "base_price", "fuel_surcharge", "total_price",
+    "created_at", "updated_at",
+    status=enum_value,
+    cod_status=enum_value
+)
+TRACKING_PROJECTION = projection(
+    "id", "latitude", "longitude", "location_name", "status_update", "timestamp"
+)
 
 
 class ShipmentService:
@@ -75,13 +92,13 @@ class ShipmentService:
     
         return new_shipment
 
-    def get_user_shipments(self, user_id: int, db: Session) -> List[Shipment]:
-        """Get all shipments for a user"""
-        shipments = db.query(Shipment).filter(
-            Shipment.customer_id == user_id
-        ).order_by(Shipment.created_at.desc()).all()
-
-        return shipments
+    def get_user_shipments(self, user_id: int, db: Session) -> List[CustomerShipmentRow]:
+        """Get all shipments for a user (read-only rows, selected columns only)"""
+        return fetch_rows(
+            db, CustomerShipmentRow,
+            Shipment.customer_id == user_id,
+            order_by=Shipment.created_at.desc()
+        )
 
     def get_shipment_by_id(self, shipment_id: int, user_id: int, db: Session) -> Shipment:
         """Get specific shipment by ID"""
@@ -98,17 +115,61 @@ class ShipmentService:
 
         return shipment
 
-    def get_shipment_tracking(self, shipment_id: int, user_id: int, db: Session) -> List[TrackingData]:
+    def get_shipment_version(self, shipment_id: int, user_id: int, db: Session) -> Optional[Version]:
+        """
+        Version of one shipment without loading the row; None if not found.
+        updated_at only has one-second resolution on MySQL, so the columns that change
+        within the same second (status, delivery, COD) are part of the ETag too.
+        """
+        row = db.query(
+            Shipment.updated_at, Shipment.status, Shipment.actual_delivery, Shipment.cod_status
+        ).filter(
+            Shipment.id == shipment_id,
+            Shipment.customer_id == user_id
+        ).first()
+
+        if row is None:
+            return None
+        return ("shipment", shipment_id, *row), row.updated_at
+
+    def get_tracking_version(self, shipment_id: int, user_id: int, db: Session) -> Optional[Version]:
+        """Version of a shipment's tracking history in one aggregate query; None if not found"""
+        owned, latest, points, latest_id = db.query(
+            func.count(func.distinct(Shipment.id)),
+            func.max(TrackingData.timestamp),
+            func.count(TrackingData.id),
+            func.max(TrackingData.id)
+        ).select_from(Shipment).outerjoin(
+            TrackingData, TrackingData.shipment_id == Shipment.id
+        ).filter(
+            Shipment.id == shipment_id,
+            Shipment.customer_id == user_id
+        ).one()
+
+        if not owned:
+            return None
+        return ("tracking", shipment_id, latest, points, latest_id), latest
+
+    def get_shipment_tracking(self, shipment_id: int, user_id: int, db: Session) -> List[TrackingRow]:
         """Get tracking data for a shipment"""
         # Verify shipment belongs to user
-        shipment = self.get_shipment_by_id(shipment_id, user_id, db)
+        owned = db.query(Shipment.id).filter(
+            Shipment.id == shipment_id,
+            Shipment.customer_id == user_id
+        ).first()
 
-        # Get tracking data
-        tracking_data = db.query(TrackingData).filter(
-            TrackingData.shipment_id == shipment_id
-        ).order_by(TrackingData.timestamp.desc()).all()
+        if not owned:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Shipment not found"
+            )
 
-        return tracking_data
+        # Get tracking data
+        return fetch_rows(
+            db, TrackingRow,
+            TrackingData.shipment_id == shipment_id,
+            order_by=TrackingData.timestamp.desc()
+        )
 
     def cancel_shipment(self, shipment_id: int, user_id: int, db: Session) -> None:
         """Cancel a pending shipment"""
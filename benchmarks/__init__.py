@@ -0,0 +1,3 @@
+"""
+Performance benchmarks and load tools (not part of the deployed backends)
+"""
@@ -0,0 +1,131 @@
+"""
+Repository micro-benchmarks over a synthetic dataset (fixtures and gate in conftest.py).
+Every method of ShipmentRepository, TrackingRepository and AdminShipmentService,
+plus the customer tracking read (ShipmentService.get_shipment_tracking).
+
+    pytest benchmarks/bench_repositories.py --bench-scale medium --benchmark-max-time 2
+    pytest benchmarks/bench_repositories.py -k tracking --bench-db-url mysql+pymysql://...
+"""
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from backend.admin_backend.services.admin_shipment_service import AdminShipmentService
+from backend.driver_backend.repositories.shipment_repository import (
+    ACTIVE_STATUSES, ShipmentRepository
+)
+from backend.driver_backend.repositories.tracking_repository import TrackingRepository
+from backend.driver_backend.utils.enums import CustomsStatus, DelayReason, FailureReason, ShipmentStatus
+from backend.user_backend.services.shipment_service import ShipmentService
+
+# name -> call(db, inputs); reads must not change anything
+SHIPMENT_READS = {
+    "get_assigned_shipments": lambda db, i: ShipmentRepository(db).get_assigned_shipments(i.driver_id),
+    "get_assigned_shipment_rows": lambda db, i: ShipmentRepository(db).get_assigned_shipment_rows(i.driver_id),
+    "get_assigned_shipment_ids": lambda db, i: ShipmentRepository(db).get_assigned_shipment_ids(i.driver_id),
+    "get_assigned_version": lambda db, i: ShipmentRepository(db).get_assigned_version(i.driver_id),
+    "get_driver_version": lambda db, i: ShipmentRepository(db).get_driver_version(i.driver_id),
+    "get_shipment_by_id": lambda db, i: ShipmentRepository(db).get_shipment_by_id(i.active_shipment_id),
+    "get_shipment_detail": lambda db, i: ShipmentRepository(db).get_shipment_detail(i.active_shipment_id),
+    "get_deliveries_today": lambda db, i: ShipmentRepository(db).get_deliveries_today(i.driver_id),
+    "get_pending_count": lambda db, i: ShipmentRepository(db).get_pending_count(i.driver_id),
+    "get_completed_count": lambda db, i: ShipmentRepository(db).get_completed_count(i.driver_id),
+    "get_failed_count": lambda db, i: ShipmentRepository(db).get_failed_count(i.driver_id),
+}
+
+SHIPMENT_WRITES = {
+    "update_shipment_status": lambda db, i: ShipmentRepository(db).update_shipment_status(
+        i.active_shipment_id, ShipmentStatus.IN_TRANSIT),
+    "update_status": lambda db, i: ShipmentRepository(db).update_status(
+        i.active_shipment_id, ShipmentStatus.OUT_FOR_DELIVERY),
+    "mark_picked_up": lambda db, i: ShipmentRepository(db).mark_picked_up(i.active_shipment_id),
+    "mark_delivered": lambda db, i: ShipmentRepository(db).mark_delivered(i.active_shipment_id),
+    "mark_failed": lambda db, i: ShipmentRepository(db).mark_failed(
+        i.active_shipment_id, FailureReason.WRONG_ADDRESS, "benchmark"),
+    "mark_cod_collected": lambda db, i: ShipmentRepository(db).mark_cod_collected(i.active_shipment_id, 100.0),
+    "update_customs_status": lambda db, i: ShipmentRepository(db).update_customs_status(
+        i.active_shipment_id, CustomsStatus.CLEARED),
+    "report_delay": lambda db, i: ShipmentRepository(db).report_delay(
+        i.active_shipment_id, DelayReason.TRAFFIC_JAM, "benchmark"),
+}
+
+TRACKING_READS = {
+    "get_last_location": lambda db, i: TrackingRepository(db).get_last_location(i.tracked_shipment_id),
+    "get_driver_tracking_version": lambda db, i: TrackingRepository(db).get_driver_tracking_version(
+        i.driver_id, ACTIVE_STATUSES),
+    "get_shipment_tracking": lambda db, i: ShipmentService().get_shipment_tracking(
+        i.tracked_shipment_id, i.customer_id, db),
+}
+
+
+def _point(i, n=0):
+    return {"shipment_id": i.active_shipment_id, "latitude": 19.07 + n * 1e-4, "longitude": 72.87,
+            "timestamp": datetime.utcnow()}
+
+
+TRACKING_WRITES = {
+    "create_tracking_entry": lambda db, i: TrackingRepository(db).create_tracking_entry(
+        i.active_shipment_id, 19.07, 72.87, "Benchmark", driver_id=i.driver_id),
+    "create_tracking_entries_50": lambda db, i: TrackingRepository(db).create_tracking_entries(
+        [_point(i, n) for n in range(50)], driver_id=i.driver_id),
+}
+
+ADMIN_READS = {
+    "get_all_shipments": lambda db, i: AdminShipmentService().get_all_shipments(db),
+    "get_shipment_by_id": lambda db, i: AdminShipmentService().get_shipment_by_id(i.active_shipment_id, db),
+}
+
+ADMIN_WRITES = {
+    "assign_driver_to_shipment": lambda db, i: AdminShipmentService().assign_driver_to_shipment(
+        i.active_shipment_id, i.driver_id, db),
+    "update_shipment_status": lambda db, i: AdminShipmentService().update_shipment_status(
+        i.active_shipment_id, ShipmentStatus.IN_TRANSIT.value, db),
+}
+
+
+def _run(bench, db, inputs, call):
+    def once():
+        result = call(db, inputs)
+        db.expunge_all()  # Measure the query, not identity-map hits from the previous round
+        return result
+
+    assert once() is not None  # Inputs exist: an empty answer would benchmark nothing
+    bench(once)
+
+
+@pytest.mark.benchmark(group="shipment_repository")
+@pytest.mark.parametrize("name", SHIPMENT_READS)
+def test_shipment_read(bench, db, inputs, name):
+    _run(bench, db, inputs, SHIPMENT_READS[name])
+
+
+@pytest.mark.benchmark(group="shipment_repository_writes")
+@pytest.mark.parametrize("name", SHIPMENT_WRITES)
+def test_shipment_write(bench, db, inputs, name):
+    _run(bench, db, inputs, SHIPMENT_WRITES[name])
+
+
+@pytest.mark.benchmark(group="tracking_repository")
+@pytest.mark.parametrize("name", TRACKING_READS)
+def test_tracking_read(bench, db, inputs, name):
+    _run(bench, db, inputs, TRACKING_READS[name])
+
+
+@pytest.mark.benchmark(group="tracking_repository_writes")
+@pytest.mark.parametrize("name", TRACKING_WRITES)
+def test_tracking_write(bench, db, inputs, name):
+    _run(bench, db, inputs, TRACKING_WRITES[name])
+
+
+@pytest.mark.benchmark(group="admin_shipment_service")
+@pytest.mark.parametrize("name", ADMIN_READS)
+def test_admin_read(bench, db, inputs, name):
+    _run(bench, db, inputs, ADMIN_READS[name])
+
+
+@pytest.mark.benchmark(group="admin_shipment_service_writes")
+@pytest.mark.parametrize("name", ADMIN_WRITES)
+def test_admin_write(bench, db, inputs, name):
+    _run(bench, db, inputs, ADMIN_WRITES[name])
@@ -0,0 +1,204 @@
+"""
+pytest fixtures and the regression gate for the repository benchmarks.
+
+    pip install -r requirements-dev.txt
+    pytest benchmarks/bench_repositories.py --bench-scale small --bench-save-baseline   # record
+    pytest benchmarks/bench_repositories.py --bench-scale small                         # compare
+
+The synthetic database (benchmarks/datagen.py) is generated once per scale and
+reused: BENCH_DATABASE_URL / --bench-db-url, default a SQLite file in the temp dir.
+Writes run inside an outer transaction that is rolled back, so the data never drifts.
+
+Medians are compared with the baseline file (one section per scale); a benchmark
+slower than baseline by more than --bench-max-regression percent (default 20,
+env BENCH_MAX_REGRESSION) fails the session.
+"""
+import json
+import os
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple
+
+import pytest
+
+# Settings need these even though the benchmarks use their own engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_PASSWORD", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from benchmarks.datagen import SCALES, describe, generate
+from backend.shared.models import Shipment
+from backend.driver_backend.utils.enums import ShipmentStatus
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+_results = pytest.StashKey[Dict[str, float]]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("repository benchmarks")
+    group.addoption("--bench-scale", default=os.getenv("BENCH_SCALE", "small"), choices=sorted(SCALES),
+                    help="Synthetic dataset size (benchmarks/datagen.py SCALES)")
+    group.addoption("--bench-db-url", default=os.getenv("BENCH_DATABASE_URL"),
+                    help="Database holding the synthetic dataset (generated when empty)")
+    group.addoption("--bench-baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    group.addoption("--bench-save-baseline", action="store_true",
+                    help="Write this run's medians as the baseline instead of comparing")
+    group.addoption("--bench-max-regression", type=float,
+                    default=float(os.getenv("BENCH_MAX_REGRESSION", "20")),
+                    help="Allowed slowdown against the baseline median, in percent")
+
+
+def pytest_configure(config):
+    config.stash[_results] = {}
+
+
+# ==================== DATA ====================
+class Inputs(NamedTuple):
+    """Ids the benchmarks query, picked once from the middle of the dataset"""
+    driver_id: int
+    customer_id: int
+    tracked_shipment_id: int  # Delivered, full GPS trail
+    active_shipment_id: int   # Target of the write benchmarks
+
+
+def _sqlite_savepoints(engine) -> None:
+    # pysqlite manages transactions itself and breaks SAVEPOINT; let SQLAlchemy do it
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def bench_engine(request):
+    scale_name = request.config.getoption("--bench-scale")
+    url = request.config.getoption("--bench-db-url") or \
+        f"sqlite:///{Path(tempfile.gettempdir()) / f'logistics-bench-{scale_name}.db'}"
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        _sqlite_savepoints(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def dataset(request, bench_engine):
+    existing = describe(bench_engine)
+    if existing is not None:
+        return existing
+    scale = SCALES[request.config.getoption("--bench-scale")]
+    started = time.perf_counter()
+    generated = generate(bench_engine, scale)
+    reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+    if reporter:
+        reporter.write_line(f"\ngenerated {scale} in {time.perf_counter() - started:.1f}s")
+    return generated
+
+
+@pytest.fixture(scope="session")
+def inputs(bench_engine, dataset) -> Inputs:
+    middle = dataset.shipment_ids[len(dataset.shipment_ids) // 2]
+    with bench_engine.connect() as conn:
+        def pick(status):
+            return conn.execute(
+                select(Shipment.id, Shipment.customer_id, Shipment.driver_id)
+                .where(Shipment.id >= middle, Shipment.status == status)
+                .order_by(Shipment.id).limit(1)
+            ).one()
+
+        tracked = pick(ShipmentStatus.DELIVERED)
+        moving = pick(ShipmentStatus.IN_TRANSIT)  # A driver with an active GPS trail
+        active = pick(ShipmentStatus.ASSIGNED)
+    return Inputs(
+        driver_id=moving.driver_id,
+        customer_id=tracked.customer_id,
+        tracked_shipment_id=tracked.id,
+        active_shipment_id=active.id
+    )
+
+
+@pytest.fixture
+def db(bench_engine):
+    """Session whose commits only release a savepoint; everything is rolled back afterwards"""
+    connection = bench_engine.connect()
+    outer = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        outer.rollback()
+        connection.close()
+
+
+# ==================== BASELINE GATE ====================
+@pytest.fixture
+def bench(benchmark, request):
+    """pytest-benchmark's fixture, with the median recorded for the baseline gate"""
+    yield benchmark
+    if benchmark.stats is not None:
+        request.config.stash[_results][request.node.name] = benchmark.stats.stats.median
+
+
+def _load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config.stash.get(_results, {})
+    if not results:
+        return
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    reporter.write_line("")
+    scale = config.getoption("--bench-scale")
+    path = Path(config.getoption("--bench-baseline"))
+    baseline = _load_baseline(path)
+
+    if config.getoption("--bench-save-baseline"):
+        section = baseline.setdefault(scale, {})
+        section["machine"] = platform.node()
+        section["python"] = platform.python_version()
+        section["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        section.setdefault("median_seconds", {}).update(results)
+        path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        reporter.write_line(f"baseline for scale '{scale}' written to {path}")
+        return
+
+    recorded = baseline.get(scale, {}).get("median_seconds", {})
+    if not recorded:
+        reporter.write_line(f"no baseline for scale '{scale}' in {path}; run with --bench-save-baseline")
+        return
+
+    limit = config.getoption("--bench-max-regression")
+    regressions = []
+    reporter.write_sep("-", f"baseline comparison (scale {scale}, limit +{limit:g}%)")
+    for name, median in sorted(results.items()):
+        before = recorded.get(name)
+        if not before:
+            reporter.write_line(f"{name:<60} new")
+            continue
+        change = (median - before) / before * 100
+        regressed = change > limit
+        if regressed:
+            regressions.append(name)
+        reporter.write_line(
+            f"{name:<60} {before * 1000:>10.3f} ms -> {median * 1000:>10.3f} ms  {change:+7.1f}%"
+            f"{'  REGRESSION' if regressed else ''}",
+            red=regressed
+        )
+    if regressions:
+        reporter.write_line(f"{len(regressions)} benchmark(s) regressed more than {limit:g}%", red=True)
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
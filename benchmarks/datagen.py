@@ -0,0 +1,321 @@
+"""
+Synthetic data generator: customers, drivers, shipments and GPS trails at any scale.
+Rows are generated in chunks and written with Core executemany inserts (no ORM
+objects, no per-row round trips), so memory stays flat from 1k to 10M shipments.
+Same seed + scale = same data, so benchmark runs are comparable.
+
+    # standalone (DATABASE_URL or --url; MySQL or a SQLite file)
+    python -m benchmarks.datagen --scale small
+    python -m benchmarks.datagen --url mysql+pymysql://... --scale full  # 10M shipments / 500M points
+
+    # from tests / benchmarks
+    from benchmarks.datagen import SCALES, generate, describe
+    dataset = describe(engine) or generate(engine, SCALES["small"])
+
+Accounts are synthetic-{customer,driver}-N@example.com, shipment numbers SYN0000000001.
+"""
+import argparse
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from backend.shared.models import Base, Shipment, TrackingData, User, UserRole
+from backend.driver_backend.utils.enums import CODStatus, ShipmentStatus, ShipmentType
+
+EMAIL_PREFIX = "synthetic-"
+NUMBER_PREFIX = "SYN"
+DEFAULT_PASSWORD = "synthetic-password"
+
+# (name, latitude, longitude)
+CITIES = [
+    ("Mumbai", 19.0760, 72.8777), ("Delhi", 28.7041, 77.1025), ("Bengaluru", 12.9716, 77.5946),
+    ("Chennai", 13.0827, 80.2707), ("Kolkata", 22.5726, 88.3639), ("Hyderabad", 17.3850, 78.4867),
+    ("Pune", 18.5204, 73.8567), ("Ahmedabad", 23.0225, 72.5714), ("Jaipur", 26.9124, 75.7873),
+    ("Lucknow", 26.8467, 80.9462), ("Kochi", 9.9312, 76.2673), ("Nagpur", 21.1458, 79.0882),
+]
+
+# Status mix of a live system: mostly history, a working set of active deliveries
+STATUS_WEIGHTS = {
+    ShipmentStatus.PENDING: 5,
+    ShipmentStatus.ASSIGNED: 5,
+    ShipmentStatus.PICKED_UP: 3,
+    ShipmentStatus.IN_TRANSIT: 7,
+    ShipmentStatus.OUT_FOR_DELIVERY: 3,
+    ShipmentStatus.DELIVERED: 70,
+    ShipmentStatus.FAILED: 4,
+    ShipmentStatus.CANCELLED: 3,
+}
+# Share of the route covered so far, per status (None = no GPS trail)
+TRAIL_PROGRESS = {
+    ShipmentStatus.PICKED_UP: 0.1,
+    ShipmentStatus.IN_TRANSIT: 0.6,
+    ShipmentStatus.OUT_FOR_DELIVERY: 0.9,
+    ShipmentStatus.DELIVERED: 1.0,
+    ShipmentStatus.FAILED: 1.0,
+}
+UNASSIGNED = {ShipmentStatus.PENDING, ShipmentStatus.CANCELLED}
+
+
+class Scale(NamedTuple):
+    customers: int
+    drivers: int
+    shipments: int
+    points_per_shipment: int  # Average GPS points of a completed route
+    days: int = 365           # created_at spread
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(customers=50, drivers=10, shipments=1_000, points_per_shipment=10),
+    "small": Scale(customers=1_000, drivers=100, shipments=20_000, points_per_shipment=20),
+    "medium": Scale(customers=50_000, drivers=2_000, shipments=1_000_000, points_per_shipment=50),
+    "full": Scale(customers=1_000_000, drivers=50_000, shipments=10_000_000, points_per_shipment=50),
+}
+
+
+class Dataset(NamedTuple):
+    """Id ranges of the generated rows (inclusive), for picking benchmark inputs"""
+    first_customer_id: int
+    last_customer_id: int
+    first_driver_id: int
+    last_driver_id: int
+    first_shipment_id: int
+    last_shipment_id: int
+    tracking_rows: int
+
+    @property
+    def customer_ids(self) -> range:
+        return range(self.first_customer_id, self.last_customer_id + 1)
+
+    @property
+    def driver_ids(self) -> range:
+        return range(self.first_driver_id, self.last_driver_id + 1)
+
+    @property
+    def shipment_ids(self) -> range:
+        return range(self.first_shipment_id, self.last_shipment_id + 1)
+
+
+# ==================== ROW GENERATORS ====================
+def _chunks(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    chunk: List[dict] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def user_rows(role: UserRole, count: int, first_id: int, password_hash: str) -> Iterator[dict]:
+    now = datetime.utcnow()
+    for i in range(count):
+        yield {
+            "id": first_id + i,
+            "email": f"{EMAIL_PREFIX}{role.value}-{i}@example.com",
+            "password_hash": password_hash,
+            "full_name": f"Synthetic {role.value.title()} {i}",
+            "phone": f"+91{9_000_000_000 + first_id + i}",
+            "role": role,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def shipment_rows(rng: random.Random, scale: Scale, first_id: int,
+                  customer_ids: range, driver_ids: range) -> Iterator[dict]:
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    now = datetime.utcnow()
+    for i in range(scale.shipments):
+        shipment_id = first_id + i
+        status = rng.choices(statuses, weights)[0]
+        pickup, delivery = rng.sample(CITIES, 2)
+        # Completed shipments spread over the whole period, active ones are recent
+        age = rng.uniform(0, scale.days) if status in (ShipmentStatus.DELIVERED, ShipmentStatus.FAILED,
+                                                      ShipmentStatus.CANCELLED) else rng.uniform(0, 3)
+        created = now - timedelta(days=age)
+        is_cod = rng.random() < 0.3
+        base_price = round(rng.uniform(40, 400), 2)
+        delivered = status == ShipmentStatus.DELIVERED
+        yield {
+            "id": shipment_id,
+            "shipment_number": f"{NUMBER_PREFIX}{shipment_id:010d}",
+            "customer_id": rng.choice(customer_ids),
+            "driver_id": None if status in UNASSIGNED else rng.choice(driver_ids),
+            "pickup_location": pickup[0],
+            "delivery_location": delivery[0],
+            "cargo_type": rng.choice(("parcel", "documents", "electronics", "furniture", "food")),
+            "weight": round(rng.uniform(0.2, 80), 2),
+            "dimensions": f"{rng.randint(10, 120)}x{rng.randint(10, 120)}x{rng.randint(5, 80)}",
+            "status": status,
+            "shipment_type": ShipmentType.DOMESTIC,
+            "estimated_delivery": created + timedelta(days=3),
+            "actual_delivery": min(created + timedelta(days=rng.uniform(0.5, 4)), now) if delivered else None,
+            "pickup_completed_at": created + timedelta(hours=2) if status in TRAIL_PROGRESS else None,
+            "is_cod": is_cod,
+            "cod_amount": base_price if is_cod else None,
+            "cod_status": (CODStatus.COLLECTED if delivered else CODStatus.PENDING) if is_cod
+            else CODStatus.NOT_APPLICABLE,
+            "base_price": base_price,
+            "fuel_surcharge": round(base_price * 0.15, 2),
+            "total_price": round(base_price * 1.15, 2),
+            "created_at": created,
+            "updated_at": created,
+        }
+
+
+def trail_rows(rng: random.Random, shipment: dict, points_per_shipment: int) -> Iterator[dict]:
+    """GPS points along the pickup -> delivery line with road-like jitter, oldest first"""
+    progress = TRAIL_PROGRESS.get(shipment["status"])
+    if progress is None:
+        return
+    count = max(1, round(rng.uniform(0.5, 1.5) * points_per_shipment * progress))
+    start = next(city for city in CITIES if city[0] == shipment["pickup_location"])
+    end = next(city for city in CITIES if city[0] == shipment["delivery_location"])
+    started = shipment["pickup_completed_at"]
+    step = timedelta(minutes=rng.uniform(2, 30))
+    for n in range(count):
+        share = progress * n / count
+        yield {
+            "shipment_id": shipment["id"],
+            "latitude": round(start[1] + (end[1] - start[1]) * share + rng.gauss(0, 0.01), 6),
+            "longitude": round(start[2] + (end[2] - start[2]) * share + rng.gauss(0, 0.01), 6),
+            "location_name": start[0] if n == 0 else None,
+            "status_update": None,
+            "timestamp": started + step * n,
+        }
+
+
+# ==================== LOADING ====================
+def _next_id(conn, column) -> int:
+    return (conn.execute(select(func.max(column))).scalar() or 0) + 1
+
+
+def _insert(conn, table, rows: Iterator[dict], chunk_size: int,
+            progress: Optional[Callable[[str, int], None]]) -> int:
+    written = 0
+    statement = insert(table)
+    for chunk in _chunks(rows, chunk_size):
+        conn.execute(statement, chunk)  # executemany
+        written += len(chunk)
+        if progress:
+            progress(table.name, written)
+    return written
+
+
+def generate(engine: Engine, scale: Scale, seed: int = 42, chunk_size: int = 10_000,
+             password_hash: Optional[str] = None,
+             progress: Optional[Callable[[str, int], None]] = None) -> Dataset:
+    """
+    Bulk-load one synthetic dataset (creates missing tables). Each table is written
+    in one transaction per chunk; ids continue after any existing rows.
+    """
+    if password_hash is None:
+        from backend.shared.utils import hash_password
+        password_hash = hash_password(DEFAULT_PASSWORD)  # bcrypt once for every account
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        first_customer = _next_id(conn, User.id)
+        _insert(conn, User.__table__, user_rows(UserRole.CUSTOMER, scale.customers, first_customer, password_hash),
+                chunk_size, progress)
+        first_driver = first_customer + scale.customers
+        _insert(conn, User.__table__, user_rows(UserRole.DRIVER, scale.drivers, first_driver, password_hash),
+                chunk_size, progress)
+        first_shipment = _next_id(conn, Shipment.id)
+
+    customer_ids = range(first_customer, first_customer + scale.customers)
+    driver_ids = range(first_driver, first_driver + scale.drivers)
+    tracking_rows = 0
+    # Shipments and their trails in lockstep so a 10M run never holds more than a chunk
+    for chunk in _chunks(shipment_rows(rng, scale, first_shipment, customer_ids, driver_ids), chunk_size):
+        with engine.begin() as conn:
+            conn.execute(insert(Shipment.__table__), chunk)
+            if progress:
+                progress(Shipment.__tablename__, chunk[-1]["id"] - first_shipment + 1)
+            trails = (point for shipment in chunk for point in trail_rows(rng, shipment, scale.points_per_shipment))
+            tracking_rows += _insert(conn, TrackingData.__table__, trails, chunk_size * 4, None)
+
+    return Dataset(
+        first_customer_id=first_customer, last_customer_id=customer_ids[-1] if customer_ids else first_customer - 1,
+        first_driver_id=first_driver, last_driver_id=driver_ids[-1] if driver_ids else first_driver - 1,
+        first_shipment_id=first_shipment, last_shipment_id=first_shipment + scale.shipments - 1,
+        tracking_rows=tracking_rows
+    )
+
+
+def describe(engine: Engine) -> Optional[Dataset]:
+    """Dataset of a previously generated database, or None when there is none"""
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        def id_range(column, *criteria):
+            return conn.execute(select(func.min(column), func.max(column)).where(*criteria)).one()
+
+        customers = id_range(User.id, User.email.like(f"{EMAIL_PREFIX}customer-%"))
+        drivers = id_range(User.id, User.email.like(f"{EMAIL_PREFIX}driver-%"))
+        shipments = id_range(Shipment.id, Shipment.shipment_number.like(f"{NUMBER_PREFIX}%"))
+        if None in (*customers, *drivers, *shipments):
+            return None
+        tracking_rows = conn.execute(select(func.count()).select_from(TrackingData).where(
+            TrackingData.shipment_id.between(*shipments)
+        )).scalar()
+    return Dataset(*customers, *drivers, *shipments, tracking_rows)
+
+
+def scale_from_args(args: argparse.Namespace) -> Scale:
+    scale = SCALES[args.scale]
+    overrides = {
+        field: getattr(args, field) for field in Scale._fields
+        if getattr(args, field, None) is not None
+    }
+    return scale._replace(**overrides)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic logistics data")
+    parser.add_argument("--url", help="SQLAlchemy URL (default: DATABASE_URL from settings)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--customers", type=int)
+    parser.add_argument("--drivers", type=int)
+    parser.add_argument("--shipments", type=int)
+    parser.add_argument("--points-per-shipment", dest="points_per_shipment", type=int)
+    parser.add_argument("--days", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.url:
+        from sqlalchemy import create_engine
+        engine = create_engine(args.url)
+    else:
+        from backend.shared.database import engine
+
+    scale = scale_from_args(args)
+    started = time.perf_counter()
+    report_every = max(scale.shipments // 20, 1)
+
+    def progress(table: str, written: int) -> None:
+        if table == Shipment.__tablename__ and (written % report_every < args.chunk_size
+                                                 or written == scale.shipments):
+            elapsed = time.perf_counter() - started
+            print(f"  {written:>12,} / {scale.shipments:,} shipments  ({written / elapsed:,.0f}/s)")
+
+    print(f"Generating {scale}")
+    dataset = generate(engine, scale, seed=args.seed, chunk_size=args.chunk_size, progress=progress)
+    elapsed = time.perf_counter() - started
+    print(f"Done in {elapsed:.1f}s: customers {dataset.first_customer_id}-{dataset.last_customer_id}, "
+          f"drivers {dataset.first_driver_id}-{dataset.last_driver_id}, "
+          f"shipments {dataset.first_shipment_id}-{dataset.last_shipment_id}, "
+          f"{dataset.tracking_rows:,} tracking rows (~{math.ceil(dataset.tracking_rows / max(elapsed, 1e-9)):,}/s)")
+
+
+if __name__ == "__main__":
+    main()
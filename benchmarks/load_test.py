@@ -0,0 +1,330 @@
+"""
+HTTP load test: simulated drivers, customers and admins against the three backends.
+Prints throughput and latency percentiles per endpoint (route template).
+
+    # 1. seed the database the backends use (DATABASE_URL: SQLite file or MySQL)
+    python -m benchmarks.load_test seed --drivers 50 --customers 200 --shipments 2000
+
+    # 2a. against running servers
+    python -m benchmarks.load_test run --drivers 50 --customers 200 --admins 2 --duration 60 \\
+        --user-url http://localhost:8001 --driver-url http://localhost:8002 --admin-url http://localhost:8003
+
+    # 2b. or without servers (ASGI in-process; measures the app, not the network)
+    python -m benchmarks.load_test run --in-process --duration 20
+
+Seeded accounts are loadtest-{driver,customer,admin}-N@example.com with one shared
+password, so runs can be repeated without reseeding.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+EMAIL_DOMAIN = "example.com"
+DEFAULT_PASSWORD = "loadtest-password"
+
+# Driver action for each status of a shipment it holds
+NEXT_ACTION = {
+    "ASSIGNED": "/api/driver/shipments/pickup",
+    "PICKED_UP": "/api/driver/shipments/in-transit",
+    "IN_TRANSIT": "/api/driver/shipments/out-for-delivery",
+    "OUT_FOR_DELIVERY": "/api/driver/shipments/deliver",
+}
+
+
+def account_email(role: str, index: int) -> str:
+    return f"loadtest-{role}-{index}@{EMAIL_DOMAIN}"
+
+
+# ==================== SEEDING ====================
+def seed(drivers: int, customers: int, admins: int, shipments: int, password: str) -> None:
+    """Create accounts and shipments directly through the ORM (idempotent for accounts)"""
+    from backend.shared.database import SessionLocal, engine
+    from backend.shared.models import Base, Shipment, User, UserRole
+    from backend.shared.utils import hash_password
+    from backend.driver_backend.utils.enums import ShipmentStatus
+
+    Base.metadata.create_all(bind=engine)
+    password_hash = hash_password(password)  # bcrypt once, not per account
+    db = SessionLocal()
+    try:
+        existing = {email for (email,) in db.query(User.email).filter(User.email.like("loadtest-%"))}
+        for role, count in (("driver", drivers), ("customer", customers), ("admin", admins)):
+            for i in range(count):
+                email = account_email(role, i)
+                if email not in existing:
+                    db.add(User(
+                        email=email, password_hash=password_hash, full_name=f"Load {role.title()} {i}",
+                        phone=f"+1555{i:07d}", role=UserRole(role), is_active=True
+                    ))
+        db.commit()
+
+        driver_ids = [uid for (uid,) in db.query(User.id).filter(User.email.like("loadtest-driver-%"))]
+        customer_ids = [uid for (uid,) in db.query(User.id).filter(User.email.like("loadtest-customer-%"))]
+        run = int(time.time())
+        rows = []
+        for i in range(shipments):
+            # Half start assigned so drivers have work before the admins catch up
+            assigned = driver_ids and i % 2 == 0
+            rows.append(Shipment(
+                shipment_number=f"LT{run}{i:07d}",
+                customer_id=random.choice(customer_ids),
+                driver_id=random.choice(driver_ids) if assigned else None,
+                pickup_location="Mumbai", delivery_location="Delhi", cargo_type="parcel",
+                weight=1.0 + i % 25, status=ShipmentStatus.ASSIGNED if assigned else ShipmentStatus.PENDING,
+                base_price=50.0, fuel_surcharge=7.5, total_price=57.5
+            ))
+        db.add_all(rows)
+        db.commit()
+        print(f"Seeded {len(driver_ids)} drivers, {len(customer_ids)} customers, {admins} admins, "
+              f"{shipments} shipments")
+    finally:
+        db.close()
+
+
+# ==================== MEASUREMENT ====================
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, label: str, seconds: float, ok: bool) -> None:
+        self.latencies[label].append(seconds)
+        if not ok:
+            self.errors[label] += 1
+
+    def report(self) -> List[Dict]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        rows = []
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            rows.append({
+                "endpoint": label,
+                "requests": len(values),
+                "errors": self.errors[label],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p90_ms": round(percentile(values, 90) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            })
+        return rows
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def print_report(rows: List[Dict], elapsed: float) -> None:
+    header = f"{'endpoint':<48}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['endpoint']:<48}{row['requests']:>8}{row['errors']:>6}{row['rps']:>9}"
+              f"{row['p50_ms']:>9}{row['p90_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}")
+    total = sum(row["requests"] for row in rows)
+    errors = sum(row["errors"] for row in rows)
+    print(f"\n{total} requests, {errors} errors in {elapsed:.1f}s = {total / elapsed:.1f} req/s (latencies in ms)")
+
+
+async def call(client: httpx.AsyncClient, stats: Stats, label: str, method: str, url: str,
+               expect=(200, 201, 304), **kwargs) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except Exception:  # Transport errors, or app exceptions surfacing through ASGITransport
+        stats.record(label, time.perf_counter() - started, ok=False)
+        return None
+    stats.record(label, time.perf_counter() - started, ok=response.status_code in expect)
+    return response
+
+
+async def think(seconds: float) -> None:
+    if seconds > 0:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * seconds)
+
+
+# ==================== ACTORS ====================
+async def driver_actor(client, stats, index: int, password: str, deadline: float, think_time: float,
+                       gps_points: int) -> None:
+    login = await call(client, stats, "POST /api/driver/login", "POST", "/api/driver/login",
+                       json={"email": account_email("driver", index), "password": password})
+    if login is None or login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    etag = None
+    cached: List[Dict] = []
+
+    while time.perf_counter() < deadline:
+        poll_headers = dict(headers, **({"If-None-Match": etag} if etag else {}))
+        listing = await call(client, stats, "GET /api/driver/shipments", "GET", "/api/driver/shipments",
+                             headers=poll_headers)
+        if listing is not None and listing.status_code == 200:
+            cached = listing.json()
+            etag = listing.headers.get("etag")
+
+        if cached:
+            shipment = cached[0]
+            action = NEXT_ACTION.get(shipment["status"])
+            for _ in range(gps_points):
+                await call(client, stats, "POST /api/driver/location", "POST", "/api/driver/location",
+                           headers=headers, json={
+                               "latitude": 19.0 + random.random(), "longitude": 72.8 + random.random(),
+                               "shipment_id": shipment["id"]
+                           })
+            if action:
+                await call(client, stats, f"POST {action}", "POST", action, headers=headers,
+                           json={"shipment_id": shipment["id"], "notes": "load test"}, expect=(200, 400))
+
+        if random.random() < 0.2:
+            await call(client, stats, "GET /api/driver/dashboard", "GET", "/api/driver/dashboard", headers=headers)
+        await think(think_time)
+
+
+async def customer_actor(client, stats, index: int, password: str, deadline: float, think_time: float) -> None:
+    login = await call(client, stats, "POST /token", "POST", "/token",
+                       data={"username": account_email("customer", index), "password": password})
+    if login is None or login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    shipment_ids: List[int] = []
+
+    while time.perf_counter() < deadline:
+        if random.random() < 0.1:
+            await call(client, stats, "POST /shipments", "POST", "/shipments", headers=headers, json={
+                "pickup_location": "Pune", "delivery_location": "Chennai",
+                "cargo_type": "parcel", "weight": round(random.uniform(0.5, 30), 1)
+            })
+        listing = await call(client, stats, "GET /shipments", "GET", "/shipments", headers=headers)
+        if listing is not None and listing.status_code == 200:
+            shipment_ids = [s["id"] for s in listing.json()]
+        if shipment_ids:
+            shipment_id = random.choice(shipment_ids)
+            await call(client, stats, "GET /shipments/{id}/tracking", "GET", f"/shipments/{shipment_id}/tracking",
+                       headers=headers)
+        await think(think_time)
+
+
+async def admin_actor(client, stats, index: int, password: str, deadline: float, think_time: float) -> None:
+    login = await call(client, stats, "POST /admin/token", "POST", "/admin/token",
+                       data={"username": account_email("admin", index), "password": password})
+    if login is None or login.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    drivers = await call(client, stats, "GET /admin/drivers", "GET", "/admin/drivers", headers=headers)
+    driver_ids = [d["id"] for d in drivers.json()] if drivers is not None and drivers.status_code == 200 else []
+
+    while time.perf_counter() < deadline:
+        listing = await call(client, stats, "GET /admin/shipments", "GET", "/admin/shipments", headers=headers)
+        pending = []
+        if listing is not None and listing.status_code == 200:
+            pending = [s["id"] for s in listing.json() if s["status"] == "PENDING"]
+        for shipment_id in pending[:5]:
+            if not driver_ids:
+                break
+            await call(client, stats, "POST /admin/shipments/{id}/assign-driver", "POST",
+                       f"/admin/shipments/{shipment_id}/assign-driver", headers=headers,
+                       json={"driver_id": random.choice(driver_ids)})
+        await think(think_time * 4)
+
+
+# ==================== RUN ====================
+def _in_process_apps() -> Dict:
+    from backend.user_backend.main import app as user_app
+    from backend.driver_backend.main import app as driver_app
+    from backend.admin_backend.main import app as admin_app
+    return {"user": user_app, "driver": driver_app, "admin": admin_app}
+
+
+def _clients(args, apps: Optional[Dict]) -> Dict[str, httpx.AsyncClient]:
+    limits = httpx.Limits(max_connections=args.drivers + args.customers + args.admins + 10)
+    timeout = httpx.Timeout(args.timeout)
+    if apps:
+        return {
+            name: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=timeout)
+            for name, app in apps.items()
+        }
+    return {
+        "user": httpx.AsyncClient(base_url=args.user_url, limits=limits, timeout=timeout),
+        "driver": httpx.AsyncClient(base_url=args.driver_url, limits=limits, timeout=timeout),
+        "admin": httpx.AsyncClient(base_url=args.admin_url, limits=limits, timeout=timeout),
+    }
+
+
+async def run(args) -> List[Dict]:
+    apps = _in_process_apps() if args.in_process else None
+    if apps:
+        # ASGITransport does not send lifespan events; run startup hooks (relay, watchdog...) here
+        for app in apps.values():
+            await app.router.startup()
+    clients = _clients(args, apps)
+    stats = Stats()
+    deadline = time.perf_counter() + args.duration
+    tasks = (
+        [driver_actor(clients["driver"], stats, i, args.password, deadline, args.think, args.gps_points)
+         for i in range(args.drivers)]
+        + [customer_actor(clients["user"], stats, i, args.password, deadline, args.think)
+           for i in range(args.customers)]
+        + [admin_actor(clients["admin"], stats, i, args.password, deadline, args.think)
+           for i in range(args.admins)]
+    )
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        stats.finished = time.perf_counter()
+        for client in clients.values():
+            await client.aclose()
+        for app in (apps or {}).values():
+            await app.router.shutdown()
+    rows = stats.report()
+    print_report(rows, stats.finished - stats.started)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("seed", "run"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("--drivers", type=int, default=20)
+        cmd.add_argument("--customers", type=int, default=50)
+        cmd.add_argument("--admins", type=int, default=1)
+        cmd.add_argument("--password", default=DEFAULT_PASSWORD)
+    seed_cmd, run_cmd = sub.choices["seed"], sub.choices["run"]
+    seed_cmd.add_argument("--shipments", type=int, default=500)
+    run_cmd.add_argument("--duration", type=float, default=30.0, help="seconds")
+    run_cmd.add_argument("--think", type=float, default=0.5, help="mean think time between iterations (s)")
+    run_cmd.add_argument("--gps-points", type=int, default=5, help="GPS posts per driver iteration")
+    run_cmd.add_argument("--timeout", type=float, default=30.0)
+    run_cmd.add_argument("--user-url", default=os.environ.get("LOADTEST_USER_URL", "http://localhost:8001"))
+    run_cmd.add_argument("--driver-url", default=os.environ.get("LOADTEST_DRIVER_URL", "http://localhost:8002"))
+    run_cmd.add_argument("--admin-url", default=os.environ.get("LOADTEST_ADMIN_URL", "http://localhost:8003"))
+    run_cmd.add_argument("--in-process", action="store_true", help="call the ASGI apps directly, no servers")
+    run_cmd.add_argument("--json", help="also write the per-endpoint results to this file")
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        seed(args.drivers, args.customers, args.admins, args.shipments, args.password)
+        return
+
+    rows = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(rows, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Serialization benchmark: response_model validation + jsonable_encoder + json
+(FastAPI's default list path) versus a precompiled projection + FastJSONResponse.
+
+    python -m benchmarks.serialization_bench --rows 5000 --repeat 5
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Settings need a database URL even though nothing is queried here
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_PASSWORD", "")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from backend.shared.models import Shipment, TrackingData
+from backend.shared.serialization import FastJSONResponse
+from backend.driver_backend.utils.enums import ShipmentStatus, CODStatus
+from backend.user_backend.schemas.shipment_schema import ShipmentResponse, TrackingResponse
+from backend.user_backend.services.shipment_service import SHIPMENT_PROJECTION, TRACKING_PROJECTION
+
+
+def make_shipments(count: int) -> List[Shipment]:
+    now = datetime.utcnow()
+    return [
+        Shipment(
+            id=i, shipment_number=f"SHP{i:08d}", customer_id=1 + i % 97,
+            pickup_location="Mumbai", delivery_location="Delhi", cargo_type="parcel",
+            weight=1.5 + i % 20, dimensions="10x10x10", status=ShipmentStatus.IN_TRANSIT,
+            estimated_delivery=now + timedelta(days=3), actual_delivery=None,
+            is_cod=bool(i % 2), cod_amount=250.0 if i % 2 else None,
+            cod_status=CODStatus.PENDING, base_price=50.0, fuel_surcharge=7.5,
+            total_price=57.5, created_at=now, updated_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def make_tracking(count: int) -> List[TrackingData]:
+    now = datetime.utcnow()
+    return [
+        TrackingData(
+            id=i, shipment_id=1, latitude=19.0 + i * 1e-4, longitude=72.8 + i * 1e-4,
+            location_name="Highway", status_update="Location updated by driver",
+            timestamp=now - timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+
+def validated_path(model, rows) -> bytes:
+    adapter = TypeAdapter(List[model])
+    validated = adapter.validate_python(rows, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def projected_path(project, rows) -> bytes:
+    return FastJSONResponse([project(r) for r in rows]).body
+
+
+def timeit(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("shipments", ShipmentResponse, SHIPMENT_PROJECTION, make_shipments(args.rows)),
+        ("tracking", TrackingResponse, TRACKING_PROJECTION, make_tracking(args.rows)),
+    ]
+    print(f"{'list':<12}{'rows':>8}{'validated ms':>15}{'projected ms':>15}{'speedup':>10}")
+    for name, model, project, rows in cases:
+        # Both paths must produce the same document
+        assert json.loads(validated_path(model, rows)) == json.loads(projected_path(project, rows)), name
+        before = timeit(lambda: validated_path(model, rows), args.repeat)
+        after = timeit(lambda: projected_path(project, rows), args.repeat)
+        print(f"{name:<12}{len(rows):>8}{before * 1000:>15.2f}{after * 1000:>15.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
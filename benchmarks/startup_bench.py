@@ -0,0 +1,218 @@
+"""
+Cold-start benchmark: import time (python -X importtime) and time to first
+request per backend, compared with a saved baseline.
+
+    python -m benchmarks.startup_bench --save-baseline      # record
+    python -m benchmarks.startup_bench                      # compare (exit 1 on regression)
+    python -m benchmarks.startup_bench --targets driver --top 15
+
+For each target a fresh interpreter imports the app with -X importtime (total
+and the slowest modules by self time), and a fresh single-worker launcher is
+timed from exec until GET /health/live answers. Medians of --runs runs are
+compared with benchmarks/startup_baseline.json: more than --max-regression
+percent slower (default 20, env BENCH_MAX_REGRESSION) fails, and so does a
+time to first request above --budget seconds (default 1.0, the autoscaling
+target). Importing an app must not pull in HEAVY_MODULES: those are loaded on
+first use, inside the code that needs them.
+
+The database is BENCH_DATABASE_URL, default a SQLite file in the temp dir.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).with_name("startup_baseline.json")
+
+TARGETS = {
+    "user": "backend.user_backend.main",
+    "driver": "backend.driver_backend.main",
+    "admin": "backend.admin_backend.main",
+    "gateway": "backend.gateway.main",
+}
+
+# Optional or heavy dependencies that only specific code paths need
+HEAVY_MODULES = (
+    "openai", "ollama", "httpx", "redis", "celery", "pandas", "numpy", "sklearn", "scipy",
+    "pydub", "twilio", "googlemaps", "aiosmtplib",
+)
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def bench_env(database_url: Optional[str]) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["DATABASE_URL"] = database_url or env.get("BENCH_DATABASE_URL") or \
+        f"sqlite:///{Path(tempfile.gettempdir()) / 'startup_bench.db'}"
+    env.setdefault("DB_PASSWORD", "")
+    env.setdefault("JWT_SECRET_KEY", "benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+# ==================== IMPORT TIME ====================
+def measure_imports(module: str, env: Dict[str, str]) -> Tuple[float, List[Tuple[str, float]], List[str]]:
+    """(total seconds, [(module, self seconds)] slowest first, heavy modules loaded)"""
+    probe = (
+        f"import sys; import {module}; "
+        f"print(','.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+    total = 0.0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules.append((name, int(self_us) / 1e6))
+        if len(indent) == 1:  # Top-level import: its cumulative time counts once
+            total += int(cumulative_us) / 1e6
+    modules.sort(key=lambda item: item[1], reverse=True)
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return total, modules, heavy
+
+
+# ==================== FIRST REQUEST ====================
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(target: str, env: Dict[str, str], timeout: float = 30.0) -> float:
+    """Seconds from exec of a single-worker launcher to the first 200 from /health/live"""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.shared.server", target, "--host", "127.0.0.1",
+         "--port", str(port), "--workers", "1", "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    url = f"http://127.0.0.1:{port}/health/live"
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"{target} exited during startup:\n{process.stderr.read().decode()[-2000:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                pass
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"{target} did not answer within {timeout:.0f}s")
+            time.sleep(0.005)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ==================== REPORT ====================
+def run(targets: List[str], runs: int, top: int, env: Dict[str, str]) -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    results: Dict[str, Dict[str, float]] = {}
+    problems: List[str] = []
+    # Create the schema once so no run pays for it
+    subprocess.run([sys.executable, "-c", "from backend.shared.database import init_db; init_db()"],
+                   cwd=ROOT, env=env, check=True)
+    for target in targets:
+        module = TARGETS[target]
+        import_times, first_requests = [], []
+        slowest: List[Tuple[str, float]] = []
+        for _ in range(runs):
+            total, modules, heavy = measure_imports(module, env)
+            import_times.append(total)
+            slowest = modules
+            if heavy:
+                problems.append(f"{target}: importing the app loads {', '.join(heavy)} (load on first use instead)")
+            first_requests.append(measure_first_request(target, env))
+        results[target] = {
+            "import_seconds": statistics.median(import_times),
+            "first_request_seconds": statistics.median(first_requests),
+        }
+        print(f"\n{target}: import {results[target]['import_seconds'] * 1000:.0f} ms, "
+              f"first request {results[target]['first_request_seconds'] * 1000:.0f} ms "
+              f"(median of {runs})")
+        for name, seconds in slowest[:top]:
+            print(f"    {seconds * 1000:8.1f} ms  {name}")
+    return results, sorted(set(problems))
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            max_regression: float, budget: float) -> List[str]:
+    problems = []
+    print(f"\n{'target':<10}{'metric':<24}{'baseline':>12}{'now':>12}{'change':>10}")
+    for target, metrics in results.items():
+        if metrics["first_request_seconds"] > budget:
+            problems.append(
+                f"{target}: first request after {metrics['first_request_seconds']:.3f}s (budget {budget:.3f}s)"
+            )
+        for metric, value in metrics.items():
+            before = baseline.get(target, {}).get(metric)
+            if before is None:
+                print(f"{target:<10}{metric:<24}{'-':>12}{value * 1000:>10.0f}ms{'new':>10}")
+                continue
+            change = (value - before) / before * 100 if before else 0.0
+            flag = " <-" if change > max_regression else ""
+            print(f"{target:<10}{metric:<24}{before * 1000:>10.0f}ms{value * 1000:>10.0f}ms{change:>+9.1f}%{flag}")
+            if change > max_regression:
+                problems.append(f"{target}: {metric} {change:+.1f}% (limit {max_regression:.0f}%)")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=list(TARGETS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list per target")
+    parser.add_argument("--db-url", help="default: BENCH_DATABASE_URL or a SQLite file in the temp dir")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float,
+                        default=float(os.environ.get("BENCH_MAX_REGRESSION", 20)))
+    parser.add_argument("--budget", type=float, default=1.0, help="max seconds to first request")
+    args = parser.parse_args()
+
+    env = bench_env(args.db_url)
+    results, problems = run(args.targets, args.runs, args.top, env)
+
+    if args.save_baseline:
+        saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        saved.update(results)
+        saved["_machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+        args.baseline.write_text(json.dumps(saved, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        problems += compare(results, json.loads(args.baseline.read_text()), args.max_regression, args.budget)
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        problems += compare(results, {}, args.max_regression, args.budget)
+
+    if problems:
+        print("\nStartup regressions:\n  " + "\n  ".join(problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
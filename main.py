@@ -1,5 +1,8 @@
-def main():
-    print("Hello from logistic-project!")
+"""
+Launcher: python main.py {user,driver,admin,gateway} [--workers N] [--port P] ...
+(see backend/shared/server.py)
+"""
+from backend.shared.server import main
 
 
 if __name__ == "__main__":
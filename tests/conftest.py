@@ -0,0 +1,87 @@
+"""
+pytest fixtures shared by the test suite.
+
+    pip install -r requirements-dev.txt   # or: uv sync
+    python -m pytest -q
+
+Everything runs offline: a SQLite database in a temp dir, the in-memory event
+bus, the stub voice provider and agent model, and eager background jobs.
+Each test that asks for `db` starts from empty tables.
+"""
+import os
+import tempfile
+
+# Settings are read on first import: configure before importing the backend
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}")
+os.environ.setdefault("DB_PASSWORD", "")
+os.environ.setdefault("JWT_SECRET_KEY", "tests")
+os.environ.setdefault("EVENT_BUS_BACKEND", "memory")
+os.environ.setdefault("VOICE_PROVIDER", "stub")
+os.environ.setdefault("VOICE_FALLBACK_PROVIDERS", "")
+os.environ.setdefault("AGENT_MODEL_PROVIDER", "stub")
+os.environ.setdefault("JOBS_EAGER", "true")
+os.environ.setdefault("SQL_GUARD_MODE", "raise")
+os.environ.setdefault("OUTBOX_RELAY_ENABLED", "false")
+os.environ.setdefault("TTS_CACHE_ENABLED", "false")
+
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import pytest
+
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared import models  # noqa: F401  (registers every table)
+from backend.shared.database import Base, SessionLocal, engine
+from backend.shared.models import Shipment, User, UserRole
+
+
+class Seed(NamedTuple):
+    customer_id: int
+    driver_id: int
+    admin_id: int
+    shipment_ids: tuple
+
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seed(db) -> Seed:
+    """One customer, driver and admin; three shipments ASSIGNED to the driver, two PENDING"""
+    customer = User(email="customer@example.com", password_hash="x", full_name="Customer", role=UserRole.CUSTOMER)
+    driver = User(email="driver@example.com", password_hash="x", full_name="Driver", role=UserRole.DRIVER)
+    admin = User(email="admin@example.com", password_hash="x", full_name="Admin", role=UserRole.ADMIN)
+    db.add_all([customer, driver, admin])
+    db.commit()
+    shipments = [
+        Shipment(
+            shipment_number=f"SHP{index:04d}",
+            customer_id=customer.id,
+            driver_id=driver.id if index < 3 else None,
+            pickup_location="Mumbai",
+            delivery_location="Pune",
+            cargo_type="box",
+            weight=2.0,
+            status=ShipmentStatus.ASSIGNED if index < 3 else ShipmentStatus.PENDING,
+            estimated_delivery=datetime.utcnow() + timedelta(days=1),
+            total_price=100.0
+        )
+        for index in range(5)
+    ]
+    db.add_all(shipments)
+    db.commit()
+    return Seed(customer.id, driver.id, admin.id, tuple(s.id for s in shipments))
+
+
+@pytest.fixture
+def anyio_backend():
+    """Async tests (@pytest.mark.anyio) run on asyncio only"""
+    return "asyncio"
@@ -0,0 +1,128 @@
+"""Agents on the offline StubAgentModel against the test database"""
+import asyncio
+
+import pytest
+
+from backend.ai_agents.base_agent import AgentBudget, AgentModel
+from backend.ai_agents.customer_agent import CustomerAgent
+from backend.ai_agents.dispatch_agent import DispatchAgent
+from backend.ai_agents.tracking_snapshots import TrackingSnapshotCache, set_snapshot_cache
+from backend.shared.event_bus import InProcessEventBus, status_event
+from backend.shared.models import Shipment
+
+
+@pytest.fixture
+def bus():
+    """A private bus feeding a fresh snapshot cache"""
+    bus = InProcessEventBus()
+    cache = TrackingSnapshotCache(ttl_seconds=60)
+    cache.start(bus)
+    set_snapshot_cache(cache)
+    yield bus
+    set_snapshot_cache(None)
+
+
+@pytest.mark.anyio
+async def test_customer_tracking_answer_is_memoized(db, seed, bus):
+    agent = CustomerAgent(seed.customer_id)
+    conversation = agent.new_conversation()
+
+    first = await agent.ask(conversation, "Where is SHP0000?")
+    assert first["reason"] == "complete"
+    assert first["answer"].startswith("Shipment SHP0000 is ASSIGNED, going from Mumbai to Pune")
+    assert first["tool_calls"][0]["cached"] is False
+
+    again = await agent.ask(conversation, "where is SHP0000 now")
+    assert again["tool_calls"][0]["cached"] is True
+
+
+@pytest.mark.anyio
+async def test_snapshots_follow_status_events(db, seed, bus):
+    agent = CustomerAgent(seed.customer_id)
+    await agent.ask(agent.new_conversation(), "Where is SHP0001?")
+
+    bus.publish_event(status_event(seed.shipment_ids[1], "IN_TRANSIT", customer_id=seed.customer_id))
+
+    answer = await agent.ask(agent.new_conversation(), "Where is SHP0001?")
+    assert "SHP0001 is IN_TRANSIT" in answer["answer"]
+    assert db.get(Shipment, seed.shipment_ids[1]).status.value == "ASSIGNED"  # Answered from the event
+
+
+@pytest.mark.anyio
+async def test_customer_cannot_see_other_customers_shipments(db, seed, bus):
+    agent = CustomerAgent(seed.admin_id)
+    answer = await agent.ask(agent.new_conversation(), "Where is SHP0000?")
+    assert answer["answer"] == "Sorry, shipment not found."
+
+
+@pytest.mark.anyio
+async def test_customer_quote_needs_no_database(seed):
+    agent = CustomerAgent(seed.customer_id)
+    answer = await agent.ask(agent.new_conversation(), "Price for 120 km, 15 kg express?")
+    assert [call["name"] for call in answer["tool_calls"]] == ["quote_price"]
+    assert answer["answer"].startswith("That shipment would cost")
+
+
+@pytest.mark.anyio
+async def test_dispatch_reads_together_then_assigns(db, seed, bus):
+    agent = DispatchAgent()
+    conversation = agent.new_conversation()
+
+    plan = await agent.ask(conversation, "Who should take the pending shipments?")
+    assert {call["name"] for call in plan["tool_calls"]} == {"unassigned_shipments", "active_drivers"}
+    assert "2 shipments are waiting for a driver" in plan["answer"]
+
+    pending = seed.shipment_ids[3]
+    done = await agent.ask(conversation, f"Assign shipment {pending} to driver {seed.driver_id}")
+    assert f"now assigned to driver #{seed.driver_id}" in done["answer"]
+    assert conversation.memo == {}  # A write clears earlier reads
+    db.expire_all()
+    assert db.get(Shipment, pending).driver_id == seed.driver_id
+
+
+@pytest.mark.anyio
+async def test_dispatch_reports_business_rule_errors(db, seed, bus):
+    agent = DispatchAgent()
+    answer = await agent.ask(agent.new_conversation(), f"Assign shipment {seed.shipment_ids[3]} to driver 999")
+    assert answer["answer"] == "Sorry, driver not found."
+
+
+@pytest.mark.anyio
+async def test_budgets_stop_the_turn(db, seed, bus):
+    agent = CustomerAgent(seed.customer_id, budget=AgentBudget(max_tokens=8000, max_seconds=5, max_steps=1))
+    assert (await agent.ask(agent.new_conversation(), "Where is SHP0000?"))["reason"] == "max_steps"
+
+    agent = CustomerAgent(seed.customer_id, budget=AgentBudget(max_tokens=1, max_seconds=5, max_steps=5))
+    assert (await agent.ask(agent.new_conversation(), "Where is SHP0000?"))["reason"] == "token_budget"
+
+
+class SlowModel(AgentModel):
+    """Answers in chunks, then stalls past any budget"""
+
+    def __init__(self):
+        self.closed = False
+
+    async def stream(self, messages, tools):
+        try:
+            yield "Looking "
+            await asyncio.sleep(0)
+            yield "it up"
+            await asyncio.sleep(60)
+        finally:
+            self.closed = True
+
+
+@pytest.mark.anyio
+async def test_time_budget_covers_the_model_not_the_reader(seed):
+    model = SlowModel()
+    agent = CustomerAgent(seed.customer_id, model=model, budget=AgentBudget(8000, 0.2, 3))
+    events = []
+    async for event in agent.run(agent.new_conversation(), "hello"):
+        events.append(event)
+        if len(events) == 1:
+            await asyncio.sleep(0.3)  # A slow client: its own await must not be cancelled
+
+    # The reader outlived the budget unharmed; the next wait for the model hit the deadline
+    assert [e["text"] for e in events if e["type"] == "text"] == ["Looking "]
+    assert events[-1]["reason"] == "time_budget"
+    assert model.closed
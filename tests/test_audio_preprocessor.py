@@ -0,0 +1,86 @@
+"""Voice upload preprocessing: trim, mono, 16 kHz, WAV without ffmpeg, and the size/duration limits"""
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+pydub = pytest.importorskip("pydub")
+from pydub import AudioSegment  # noqa: E402
+from pydub.generators import Sine  # noqa: E402
+
+from backend.driver_backend.services.audio_preprocessor import (  # noqa: E402
+    AudioRejected, preprocess_audio, read_upload
+)
+from backend.shared.config import settings  # noqa: E402
+
+
+def _recording(lead_ms=1000, speech_ms=1000, tail_ms=1000, frame_rate=44100) -> bytes:
+    """Stereo 44.1 kHz WAV: silence, a tone standing in for speech, silence"""
+    silence = AudioSegment.silent(duration=lead_ms, frame_rate=frame_rate)
+    tone = Sine(440, sample_rate=frame_rate).to_audio_segment(duration=speech_ms, volume=-10)
+    segment = (silence + tone + AudioSegment.silent(duration=tail_ms, frame_rate=frame_rate)).set_channels(2)
+    out = BytesIO()
+    segment.export(out, format="wav")
+    return out.getvalue()
+
+
+def _prepare(audio, filename="command.wav", max_seconds=120.0, output_format="wav"):
+    return preprocess_audio(audio, filename, max_seconds, 16000, output_format)
+
+
+def test_silence_is_trimmed_and_audio_is_mono_16k():
+    original = _recording()
+    prepared = _prepare(original)
+
+    decoded = AudioSegment.from_file(BytesIO(prepared.audio), format="wav")
+    assert decoded.channels == 1
+    assert decoded.frame_rate == 16000
+    assert decoded.sample_width == 2
+    assert prepared.original_seconds == pytest.approx(3.0, abs=0.01)
+    # The tone plus the margin kept on each side
+    assert 1.0 <= prepared.seconds <= 1.5
+    assert len(prepared.audio) < prepared.original_bytes / 5
+
+
+def test_compressed_output_falls_back_to_wav_without_ffmpeg(monkeypatch):
+    monkeypatch.setattr(AudioSegment, "converter", "/nonexistent/ffmpeg")
+    prepared = _prepare(_recording(), output_format="opus")
+
+    assert prepared.filename == "command.wav"
+    assert AudioSegment.from_file(BytesIO(prepared.audio), format="wav").frame_rate == 16000
+
+
+def test_undecodable_upload_is_sent_as_is():
+    prepared = _prepare(b"Picked up SHP0001", filename="command.txt")
+    assert prepared.audio == b"Picked up SHP0001"
+    assert prepared.seconds is None
+
+
+def test_recordings_over_the_duration_limit_are_rejected():
+    with pytest.raises(AudioRejected) as rejected:
+        _prepare(_recording(), max_seconds=2.0)
+    assert rejected.value.status_code == 413
+
+
+def test_silent_recordings_are_rejected():
+    with pytest.raises(AudioRejected) as rejected:
+        _prepare(_recording(speech_ms=0))
+    assert rejected.value.status_code == 400
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("declared", [True, False])
+async def test_oversize_upload_is_refused_with_413(monkeypatch, declared):
+    monkeypatch.setattr(settings, "VOICE_MAX_UPLOAD_MB", 0.001)  # 1048 bytes
+    body = b"\0" * 4096
+    upload = UploadFile(BytesIO(body), size=len(body) if declared else None, filename="command.wav")
+
+    with pytest.raises(HTTPException) as refused:
+        await read_upload(upload)
+    assert refused.value.status_code == 413
+
+
+@pytest.mark.anyio
+async def test_upload_within_the_limit_is_read_whole():
+    upload = UploadFile(BytesIO(b"RIFF...."), filename="command.wav")
+    assert await read_upload(upload) == b"RIFF...."
@@ -0,0 +1,58 @@
+"""init_db(): schema creation runs once per process, however many apps or threads ask"""
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.shared import database
+from backend.shared.config import settings
+
+
+@pytest.fixture
+def create_all_calls(monkeypatch):
+    """A process that has not created the schema yet, with create_all counted"""
+    calls = []
+    create_all = database.Base.metadata.create_all
+
+    def counting(*args, **kwargs):
+        calls.append(threading.get_ident())
+        return create_all(*args, **kwargs)
+
+    monkeypatch.setattr(database, "_schema_ready", False)
+    monkeypatch.setattr(database.Base.metadata, "create_all", counting)
+    return calls
+
+
+def test_init_db_creates_the_schema_once(create_all_calls):
+    database.init_db()
+    database.init_db()
+    assert len(create_all_calls) == 1
+
+
+def test_concurrent_callers_wait_for_one_creation(create_all_calls):
+    start = threading.Barrier(8)
+
+    def call():
+        start.wait()
+        database.init_db()
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(create_all_calls) == 1
+
+
+def test_gateway_startup_creates_the_schema_once(db, create_all_calls):
+    from backend.gateway.main import app
+
+    with TestClient(app):
+        pass
+    assert len(create_all_calls) == 1  # Three apps' startup hooks, one create_all
+
+
+def test_auto_create_off_leaves_the_schema_to_migrations(create_all_calls, monkeypatch):
+    monkeypatch.setattr(settings, "DB_AUTO_CREATE", False)
+    database.init_db()
+    assert create_all_calls == []
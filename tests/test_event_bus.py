@@ -0,0 +1,117 @@
+"""Event bus: in-process fan-out, and the Redis bus against fakeredis"""
+import threading
+import time
+
+import fakeredis
+import pytest
+
+from backend.shared.event_bus import InProcessEventBus, RedisEventBus, status_event
+
+
+class Collector:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, channel, event):
+        self.events.append((channel, event))
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.events) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.events
+
+
+class SlowRedis:
+    """A Redis that takes `delay` seconds per pipeline round trip"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append(channel)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        time.sleep(self.delay)
+
+
+class DeadRedis:
+    def publish(self, channel, message):
+        raise ConnectionError("redis down")
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        raise ConnectionError("redis down")
+
+
+@pytest.fixture
+def redis_bus():
+    bus = RedisEventBus(client=fakeredis.FakeRedis(), prefix="tests")
+    yield bus
+    bus.close()
+
+
+def test_in_process_bus_routes_by_pattern():
+    bus = InProcessEventBus()
+    shipments, drivers = Collector(), Collector()
+    bus.subscribe("shipment:*", shipments)
+    unsubscribe = bus.subscribe("driver:7", drivers)
+
+    bus.publish_event(status_event(1, "ASSIGNED", driver_id=7))
+    unsubscribe()
+    bus.publish_event(status_event(2, "ASSIGNED", driver_id=7))
+
+    assert [channel for channel, _ in shipments.events] == ["shipment:1", "shipment:2"]
+    assert [channel for channel, _ in drivers.events] == ["driver:7"]
+
+
+def test_redis_bus_delivers_in_order(redis_bus):
+    received = Collector()
+    redis_bus.subscribe("shipment:*", received)
+    time.sleep(0.1)  # Let the pattern subscription register
+
+    for shipment_id in range(5):
+        redis_bus.publish_event(status_event(shipment_id, "IN_TRANSIT"))
+
+    events = received.wait_for(5)
+    assert [channel for channel, _ in events] == [f"shipment:{i}" for i in range(5)]
+    assert events[0][1]["status"] == "IN_TRANSIT"
+
+
+def test_best_effort_publish_never_waits_for_redis():
+    bus = RedisEventBus(client=SlowRedis(delay=0.5), prefix="tests")
+    started = time.perf_counter()
+    for shipment_id in range(20):
+        bus.publish_event(status_event(shipment_id, "IN_TRANSIT"))
+    assert time.perf_counter() - started < 0.2
+    assert bus.flush(timeout=5.0)
+
+
+def test_full_queue_keeps_the_newest_events():
+    client = SlowRedis(delay=0)
+    bus = RedisEventBus(client=client, prefix="tests", queue_size=2)
+    gate = threading.Event()
+    bus._outgoing.put((gate.wait, None))  # Hold the publisher thread on a flush marker
+    bus._ensure_publisher()
+    time.sleep(0.05)
+
+    for shipment_id in range(4):
+        bus.publish(f"shipment:{shipment_id}", {"shipment_id": shipment_id})
+    gate.set()
+    assert bus.flush()
+    assert client.published == ["tests:shipment:2", "tests:shipment:3"]
+
+
+def test_redis_outage_is_swallowed_unless_strict():
+    bus = RedisEventBus(client=DeadRedis(), prefix="tests")
+    bus.publish_event(status_event(1, "DELIVERED"))
+    assert bus.flush()
+
+    with pytest.raises(ConnectionError):
+        bus.publish_event(status_event(1, "DELIVERED"), strict=True)
@@ -0,0 +1,48 @@
+"""Gateway: every backend answers under its prefix, and each one's startup/shutdown hooks run once"""
+from collections import Counter
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.gateway import main as gateway
+
+
+@pytest.fixture
+def hook_calls(monkeypatch):
+    """Count startup/shutdown per mounted app alongside its own handlers"""
+    calls = Counter()
+    for prefix, sub_app in gateway.MOUNTS:
+        async def started(prefix=prefix):
+            calls["startup", prefix] += 1
+
+        async def stopped(prefix=prefix):
+            calls["shutdown", prefix] += 1
+
+        monkeypatch.setattr(sub_app.router, "on_startup", [*sub_app.router.on_startup, started])
+        monkeypatch.setattr(sub_app.router, "on_shutdown", [*sub_app.router.on_shutdown, stopped])
+    return calls
+
+
+def test_each_backend_resolves_under_its_prefix(db, hook_calls):
+    with TestClient(gateway.app) as client:
+        assert client.get("/").json()["backends"] == {
+            "user": "/user/docs", "driver": "/driver/docs", "admin": "/admin/docs"
+        }
+        assert client.get("/user/").json()["message"] == "User Backend API"
+        assert client.get("/driver/").status_code == 200
+        assert client.get("/admin/").json()["portal"] == "admin"
+        for prefix in ("/user", "/driver", "/admin", ""):
+            assert client.get(f"{prefix}/health/live").status_code == 200
+        # Routed into each app (its own auth answers, not a gateway 404)
+        assert client.get("/user/shipments").status_code == 403
+        assert client.get("/driver/api/driver/shipments").status_code == 403
+        assert client.get("/admin/admin/jobs").status_code == 403
+
+
+def test_sub_app_hooks_run_once_each(db, hook_calls):
+    with TestClient(gateway.app):
+        assert hook_calls == Counter({("startup", prefix): 1 for prefix, _ in gateway.MOUNTS})
+
+    assert hook_calls == Counter(
+        {(phase, prefix): 1 for phase in ("startup", "shutdown") for prefix, _ in gateway.MOUNTS}
+    )
@@ -0,0 +1,120 @@
+"""Conditional GETs: 304 on a current ETag, 200 after a change in the same second, cache headers"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.driver_backend.controllers import driver_controller
+from backend.driver_backend.controllers import shipment_controller as driver_shipment_controller
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.models import Shipment, TrackingData, User
+from backend.shared.utils import create_access_token
+from backend.user_backend.controllers.shipment_controller import ShipmentController
+from backend.user_backend.dependencies import get_current_user
+from backend.user_backend.services.shipment_service import ShipmentService
+
+SECOND = datetime(2026, 1, 5, 9, 30, 0)
+
+
+@pytest.fixture
+def driver_client(seed):
+    app = FastAPI()
+    app.include_router(driver_controller.router)
+    app.include_router(driver_shipment_controller.router)
+    token = create_access_token({"sub": "driver@example.com", "role": "driver", "id": seed.driver_id})
+    return TestClient(app, headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.fixture
+def user_client(db, seed):
+    app = FastAPI()
+    app.include_router(ShipmentController(ShipmentService()).router)
+    app.dependency_overrides[get_current_user] = lambda: db.get(User, seed.customer_id)
+    return TestClient(app)
+
+
+def _same_second(db, *rows):
+    """Pin updated_at as MySQL DATETIME would store two writes within one second"""
+    for row in rows:
+        row.updated_at = SECOND
+    db.commit()
+
+
+def _revalidate(client, path, etag):
+    return client.get(path, headers={"If-None-Match": etag})
+
+
+def test_validators_and_cache_headers(driver_client):
+    response = driver_client.get("/shipments")
+
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["vary"] == "Authorization"
+
+    not_modified = _revalidate(driver_client, "/shipments", response.headers["etag"])
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == response.headers["etag"]
+    assert not_modified.headers["vary"] == "Authorization"
+
+
+def test_driver_list_changes_within_the_same_second(driver_client, db, seed):
+    shipments = db.query(Shipment).filter(Shipment.driver_id == seed.driver_id).all()
+    _same_second(db, *shipments)
+    etag = driver_client.get("/shipments").headers["etag"]
+    assert _revalidate(driver_client, "/shipments", etag).status_code == 304
+
+    shipments[0].status = ShipmentStatus.PICKED_UP
+    _same_second(db, *shipments)
+
+    changed = _revalidate(driver_client, "/shipments", etag)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_dashboard_changes_with_a_ping_in_the_same_second(driver_client, db, seed):
+    db.add(TrackingData(shipment_id=seed.shipment_ids[0], latitude=1.0, longitude=2.0, timestamp=SECOND))
+    db.commit()
+    etag = driver_client.get("/dashboard").headers["etag"]
+    assert _revalidate(driver_client, "/dashboard", etag).status_code == 304
+
+    db.add(TrackingData(shipment_id=seed.shipment_ids[0], latitude=1.5, longitude=2.5, timestamp=SECOND))
+    db.commit()
+
+    assert _revalidate(driver_client, "/dashboard", etag).status_code == 200
+
+
+def test_user_shipment_changes_within_the_same_second(user_client, db, seed):
+    shipment = db.get(Shipment, seed.shipment_ids[0])
+    _same_second(db, shipment)
+    path = f"/shipments/{shipment.id}"
+    etag = user_client.get(path).headers["etag"]
+    assert _revalidate(user_client, path, etag).status_code == 304
+
+    shipment.status = ShipmentStatus.PICKED_UP
+    _same_second(db, shipment)
+
+    changed = _revalidate(user_client, path, etag)
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "PICKED_UP"
+
+
+def test_user_tracking_changes_with_a_point_in_the_same_second(user_client, db, seed):
+    path = f"/shipments/{seed.shipment_ids[0]}/tracking"
+    db.add(TrackingData(shipment_id=seed.shipment_ids[0], latitude=1.0, longitude=2.0, timestamp=SECOND))
+    db.commit()
+    etag = user_client.get(path).headers["etag"]
+    assert _revalidate(user_client, path, etag).status_code == 304
+
+    db.add(TrackingData(shipment_id=seed.shipment_ids[0], latitude=1.5, longitude=2.5, timestamp=SECOND))
+    db.commit()
+
+    changed = _revalidate(user_client, path, etag)
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+
+
+def test_unknown_shipment_is_not_answered_from_cache(user_client):
+    assert _revalidate(user_client, "/shipments/999", "*").status_code == 404
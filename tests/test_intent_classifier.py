@@ -0,0 +1,80 @@
+"""Local intent classifier: grammars act, negations and model guesses go to the LLM"""
+import pytest
+
+from backend.driver_backend.services.intent_classifier import (
+    MODEL_WRITE_CONFIDENCE_CAP, WRITE_INTENTS, IntentClassifier
+)
+from backend.driver_backend.services.voice_assistant_service import VoiceAssistantService
+from backend.driver_backend.services.voice_providers import StubVoiceProvider, VoiceProviderError
+from backend.shared.config import settings
+
+classifier = IntentClassifier()
+
+
+@pytest.mark.parametrize("text, intent, entities", [
+    ("Mark SHP123 as delivered", "confirm_delivery", {"shipment_id": "SHP123"}),
+    ("Confirm pickup for shipment SHP77", "confirm_pickup", {"shipment_id": "SHP77"}),
+    ("Update SHP5 to in transit", "update_status", {"shipment_id": "SHP5", "status": "IN_TRANSIT"}),
+    ("Collected 500 rupees for SHP9", "update_cod", {"shipment_id": "SHP9", "amount": "500"}),
+])
+def test_grammar_resolves_commands_locally(text, intent, entities):
+    result = classifier.classify(text)
+    assert result["source"] == "grammar"
+    assert result["intent"] == intent
+    assert result["confidence"] >= settings.VOICE_INTENT_CONFIDENCE_THRESHOLD
+    assert entities.items() <= result["entities"].items()
+
+
+@pytest.mark.parametrize("text", [
+    "Don't mark SHP9 as delivered",
+    "dont mark SHP9 as delivered",
+    "cancel pickup for SHP7",
+    "I was not able to deliver SHP5",
+    "Undo delivery for SHP3",
+    "SHP4 wasn’t picked up",
+    "I couldn't collect 500 for SHP2",
+])
+def test_negated_or_cancelled_commands_never_resolve_locally(text):
+    result = classifier.classify(text)
+    assert result["intent"] == "unknown"
+    assert result["confidence"] == 0.0
+    assert result["source"] == "negation"
+
+
+@pytest.mark.parametrize("text", [
+    "Got the parcel from the sender for SHP12",
+    "SHP12 handed to the customer",
+    "Cash 300 taken for SHP12",
+])
+def test_model_never_triggers_a_write_without_the_llm(text):
+    pytest.importorskip("sklearn")
+    result = classifier.classify(text)
+    assert result["source"] == "model"
+    if result["intent"] in WRITE_INTENTS:
+        assert result["confidence"] <= MODEL_WRITE_CONFIDENCE_CAP < settings.VOICE_INTENT_CONFIDENCE_THRESHOLD
+
+
+class FailingChat(StubVoiceProvider):
+    async def chat(self, messages, temperature=0.3):
+        self.calls["chat"] += 1
+        raise VoiceProviderError("LLM unavailable")
+
+
+@pytest.mark.anyio
+async def test_negated_command_is_sent_to_the_llm():
+    provider = StubVoiceProvider()
+    result = await VoiceAssistantService(provider).analyze_intent("Don't mark SHP9 as delivered")
+    assert provider.calls["chat"] == 1
+    assert result["source"] == "llm"
+
+
+@pytest.mark.anyio
+async def test_llm_outage_never_acts_on_a_negation_or_model_guess():
+    provider = FailingChat()
+    service = VoiceAssistantService(provider)
+    grammar = await service.analyze_intent("Mark SHP9 as delivered")
+    assert grammar["intent"] == "confirm_delivery" and grammar["source"] == "grammar"
+    assert provider.calls["chat"] == 0
+    for text in ("Don't mark SHP9 as delivered", "SHP12 handed to the customer"):
+        assert (await service.analyze_intent(text))["intent"] == "unknown"
+    assert provider.calls["chat"] == 2
@@ -0,0 +1,116 @@
+"""Background jobs in JOBS_EAGER mode: submit, poll, list, download, cancel, failures"""
+import csv
+
+import pytest
+from fastapi import HTTPException
+
+from backend.admin_backend.services.admin_job_service import (
+    AdminJobService, JOB_LIST_PROJECTION, JOB_PROJECTION
+)
+from backend.shared import jobs
+from backend.shared.config import settings
+from backend.shared.models import Job, JobStatus
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_EXPORT_DIR", str(tmp_path / "worker"))
+    return AdminJobService()
+
+
+def test_export_runs_on_submit_and_downloads(db, seed, service):
+    job = service.submit_job("shipments_export", {"status": "ASSIGNED"}, seed.admin_id, db)
+
+    assert job.status == JobStatus.SUCCEEDED
+    assert JOB_PROJECTION(job)["result"] == {"file": f"shipments_{job.id}.csv", "rows": 3}
+    with service.get_job_file(job.id, db).open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert sorted(row["shipment_number"] for row in rows) == ["SHP0000", "SHP0001", "SHP0002"]
+
+
+def test_download_from_an_unshared_export_dir_is_unavailable(db, seed, service, tmp_path, monkeypatch):
+    job = service.submit_job("shipments_export", {}, seed.admin_id, db)
+    # The admin API mounts a different directory than the worker wrote to
+    monkeypatch.setattr(settings, "JOBS_EXPORT_DIR", str(tmp_path / "api"))
+
+    with pytest.raises(HTTPException) as error:
+        service.get_job_file(job.id, db)
+    assert error.value.status_code == 503
+
+
+def test_download_never_leaves_the_export_dir(db, seed, service):
+    job = service.submit_job("shipments_export", {}, seed.admin_id, db)
+    job.result = '{"file": "../../etc/passwd", "rows": 0}'
+    db.commit()
+
+    with pytest.raises(HTTPException) as error:
+        service.get_job_file(job.id, db)
+    assert error.value.status_code == 404
+
+
+def test_list_leaves_results_out(db, seed, service):
+    items = [{"distance_km": 10 + i, "weight_kg": 5} for i in range(3)]
+    job = service.submit_job("bulk_pricing", {"items": items}, seed.admin_id, db)
+
+    assert JOB_PROJECTION(service.get_job_by_id(job.id, db))["result"]["count"] == 3
+    listed = [JOB_LIST_PROJECTION(row) for row in service.get_jobs(db)]
+    assert [row["id"] for row in listed] == [job.id]
+    assert "result" not in listed[0]
+
+
+def test_bad_params_and_unknown_types(db, seed, service):
+    with pytest.raises(HTTPException) as error:
+        service.submit_job("bulk_pricing", {"items": []}, seed.admin_id, db)
+    assert error.value.status_code == 422
+    with pytest.raises(HTTPException) as error:
+        service.submit_job("route_planning", {}, seed.admin_id, db)
+    assert error.value.status_code == 400
+    assert db.query(Job).count() == 0
+
+
+def test_failing_handler_stores_the_error(db, seed, service, monkeypatch):
+    def broken(db, params, job_id):
+        raise RuntimeError("disk full")
+
+    spec = jobs.JOB_TYPES["shipments_export"]
+    monkeypatch.setitem(jobs.JOB_TYPES, "shipments_export", spec._replace(handler=broken))
+    job = service.submit_job("shipments_export", {}, seed.admin_id, db)
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "RuntimeError: disk full"
+    assert job.attempts == 1
+
+
+def test_only_queued_jobs_cancel(db, seed, service, monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_EAGER", False)
+    queued = []
+
+    class Broker:
+        def send_task(self, name, args, queue):
+            queued.append(args[0])
+
+    monkeypatch.setattr(jobs, "_celery_app", Broker())
+    job = service.submit_job("shipments_export", {}, seed.admin_id, db)
+    assert job.status == JobStatus.QUEUED and queued == [job.id]
+
+    assert service.cancel_job(job.id, db).status == JobStatus.CANCELLED
+    jobs.execute_job(job.id)  # A late delivery finds the row cancelled
+    db.refresh(job)
+    assert job.status == JobStatus.CANCELLED
+    with pytest.raises(HTTPException) as error:
+        service.cancel_job(job.id, db)
+    assert error.value.status_code == 409
+
+
+def test_unreachable_broker_fails_the_job(db, seed, service, monkeypatch):
+    monkeypatch.setattr(settings, "JOBS_EAGER", False)
+
+    class DownBroker:
+        def send_task(self, name, args, queue):
+            raise ConnectionError("broker down")
+
+    monkeypatch.setattr(jobs, "_celery_app", DownBroker())
+    with pytest.raises(HTTPException) as error:
+        service.submit_job("shipments_export", {}, seed.admin_id, db)
+    assert error.value.status_code == 503
+    assert db.query(Job).one().status == JobStatus.FAILED
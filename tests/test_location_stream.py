@@ -0,0 +1,135 @@
+"""Driver location WebSocket: handshake auth, frame formats, rate limit, backpressure, batched writes"""
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from backend.driver_backend.controllers import location_stream_controller
+from backend.driver_backend.services.driver_service import DriverService
+from backend.driver_backend.services.location_stream_service import (
+    BINARY_POINT, FrameError, LocationStreamSession, parse_location_frame
+)
+from backend.shared.config import settings
+from backend.shared.models import TrackingData
+from backend.shared.utils import create_access_token
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(location_stream_controller.router)
+    return TestClient(app)
+
+
+def _token(seed, role="driver"):
+    return create_access_token({"sub": "driver@example.com", "role": role, "id": seed.driver_id})
+
+
+def _receive_acks(ws, points):
+    written = 0
+    while written < points:
+        message = ws.receive_json()
+        assert message["type"] == "ack"
+        written += message["written"]
+    return written
+
+
+@pytest.mark.parametrize("query", ["", "?token=not-a-jwt"])
+def test_handshake_without_a_valid_token_is_refused(client, db, query):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(f"/ws/location{query}"):
+            pass
+    assert closed.value.code == 1008
+
+
+def test_handshake_with_a_customer_token_is_refused(client, seed):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect(f"/ws/location?token={_token(seed, role='customer')}"):
+            pass
+    assert closed.value.code == 1008
+
+
+def test_json_and_binary_frames_are_stored(client, db, seed):
+    shipment_id = seed.shipment_ids[0]
+    headers = {"Authorization": f"Bearer {_token(seed)}"}
+    with client.websocket_connect("/ws/location", headers=headers) as ws:
+        ws.send_text(json.dumps({"s": shipment_id, "lat": 19.07, "lng": 72.87, "n": "Andheri"}))
+        assert _receive_acks(ws, 1) == 1
+        ws.send_bytes(BINARY_POINT.pack(shipment_id, 19.1, 72.9) + BINARY_POINT.pack(shipment_id, 19.2, 73.0))
+        assert _receive_acks(ws, 2) == 2
+
+    rows = db.query(TrackingData).filter(TrackingData.shipment_id == shipment_id).order_by(TrackingData.id).all()
+    assert [(row.latitude, row.location_name) for row in rows] == [(19.07, "Andheri"), (19.1, None), (19.2, None)]
+
+
+def test_points_over_the_rate_limit_are_rejected(client, db, seed, monkeypatch):
+    monkeypatch.setattr(settings, "WS_LOCATION_BURST", 2)
+    monkeypatch.setattr(settings, "WS_LOCATION_MAX_RATE", 0.001)
+    point = {"s": seed.shipment_ids[0], "lat": 19.0, "lng": 72.0}
+    with client.websocket_connect(f"/ws/location?token={_token(seed)}") as ws:
+        ws.send_text(json.dumps([point] * 5))
+        messages = [ws.receive_json(), ws.receive_json()]
+
+    rejected = [m for m in messages if m["type"] == "rejected"]
+    assert rejected == [{"type": "rejected", "reasons": ["rate_limited"]}]
+    assert db.query(TrackingData).count() == 2
+
+
+def test_malformed_frames_raise_frame_error():
+    with pytest.raises(FrameError):
+        parse_location_frame(data=b"\x00" * (BINARY_POINT.size - 1))
+    with pytest.raises(FrameError):
+        parse_location_frame(text='{"s": 1, "lat": 91, "lng": 0}')
+
+
+@pytest.mark.anyio
+async def test_full_queue_blocks_the_reader(monkeypatch):
+    monkeypatch.setattr(settings, "WS_LOCATION_QUEUE_SIZE", 1)
+    session = LocationStreamSession(driver_id=1)
+    session.allowed_shipments = {7}
+    point = {"shipment_id": 7, "latitude": 1.0, "longitude": 2.0, "location_name": None}
+
+    assert await session.enqueue([point]) == []
+    reader = asyncio.ensure_future(session.enqueue([point]))
+    await asyncio.sleep(0.05)
+    assert not reader.done()  # Nothing drains the queue: the socket reader waits
+
+    session.queue.get_nowait()
+    assert await asyncio.wait_for(reader, 1) == []
+
+
+@pytest.mark.anyio
+async def test_writer_flushes_batches_through_driver_service(db, seed, monkeypatch):
+    monkeypatch.setattr(settings, "WS_LOCATION_BATCH_SIZE", 2)
+    batches = []
+    write = DriverService.update_locations_batch
+
+    def recording(self, driver_id, points):
+        batches.append((driver_id, len(points)))
+        return write(self, driver_id, points)
+
+    monkeypatch.setattr(DriverService, "update_locations_batch", recording)
+    session = LocationStreamSession(seed.driver_id)
+    for index in range(3):
+        session.queue.put_nowait({
+            "shipment_id": seed.shipment_ids[0], "latitude": 1.0 + index, "longitude": 2.0, "location_name": None
+        })
+
+    flushed = []
+
+    async def on_flush(written):
+        flushed.append(written)
+
+    writer = asyncio.ensure_future(session.run_writer(on_flush=on_flush))
+    while sum(flushed) < 3:
+        await asyncio.sleep(0.01)
+    writer.cancel()
+    await asyncio.gather(writer, return_exceptions=True)
+
+    assert batches == [(seed.driver_id, 2), (seed.driver_id, 1)]
+    assert session.accepted == 3
+    db.expire_all()
+    assert db.query(TrackingData).count() == 3
@@ -0,0 +1,75 @@
+"""Event-loop watchdog: heartbeat lag, stall stacks, strict mode for SQL on the loop thread"""
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import event, text
+from starlette.concurrency import run_in_threadpool
+
+from backend.shared.database import SessionLocal, engine
+from backend.shared.loop_watchdog import (
+    LOOP_LAG, LOOP_STALLS, BlockingCallError, LoopWatchdog, _reject_sql_on_loop, enable_strict_mode
+)
+
+
+def _lag_total() -> float:
+    return LOOP_LAG.snapshot().get((), [0.0, 0])[-2]
+
+
+def _block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.fixture
+def strict_mode():
+    enable_strict_mode()
+    yield
+    event.remove(engine, "before_cursor_execute", _reject_sql_on_loop)
+
+
+@pytest.mark.anyio
+async def test_blocking_call_shows_up_as_lag_and_a_stall_stack():
+    watchdog = LoopWatchdog(heartbeat_ms=20, threshold_ms=50)
+    lag_before, stalls_before = _lag_total(), LOOP_STALLS.snapshot().get((), 0)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await watchdog.stop()
+
+    assert _lag_total() - lag_before >= 0.2
+    assert LOOP_STALLS.snapshot()[()] == stalls_before + 1  # One report per stall, however long
+    stall = watchdog.recent_stalls[-1]
+    assert stall["stalled_ms"] > 50
+    assert "_block_the_loop" in stall["stack"]
+
+
+@pytest.mark.anyio
+async def test_quiet_loop_reports_no_stall():
+    watchdog = LoopWatchdog(heartbeat_ms=20, threshold_ms=200)
+    watchdog.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        await watchdog.stop()
+    assert not watchdog.recent_stalls
+
+
+@pytest.mark.anyio
+async def test_strict_mode_rejects_sql_on_the_loop_thread(db, strict_mode):
+    with pytest.raises(BlockingCallError):
+        db.execute(text("SELECT 1"))
+
+
+@pytest.mark.anyio
+async def test_strict_mode_allows_sql_in_the_threadpool(strict_mode):
+    def query():
+        session = SessionLocal()
+        try:
+            return session.execute(text("SELECT 1")).scalar()
+        finally:
+            session.close()
+
+    assert await run_in_threadpool(query) == 1
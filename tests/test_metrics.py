@@ -0,0 +1,50 @@
+"""Metrics: one /metrics merges every preforked worker's values"""
+import json
+
+from backend.shared import metrics
+from backend.shared.config import settings
+
+DEAD_PID = 2 ** 22 + 12345  # Above the default pid_max: never a live process
+
+
+def _sample(text, line_prefix):
+    return [float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(line_prefix)]
+
+
+def test_scrape_merges_worker_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    requests = metrics.counter("test_requests_total", "Requests", ("route",))
+    latency = metrics.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    in_flight = metrics.up_down_counter("test_in_flight", "In flight")
+    metrics.gauge("test_backlog", "Table-wide backlog", lambda: 40, multiprocess_mode="max")
+    metrics.gauge("test_pool", "Per-process pool size", lambda: 5)
+
+    requests.inc("/a", amount=3)
+    latency.observe(0.05)
+    in_flight.inc()
+    # An exited worker's last export, and the file of a live one (this process stands in for it)
+    (tmp_path / f"{DEAD_PID}.json").write_text(json.dumps({
+        "test_requests_total": [[["/a"], 7]],
+        "test_latency_seconds": [[[], [0, 2, 0, 1.5, 2]]],
+        "test_in_flight": [[[], 4]],
+        "test_backlog": [[[], 90]],
+        "test_pool": [[[], 5]],
+    }))
+
+    text = metrics.REGISTRY.render()
+    assert _sample(text, 'test_requests_total{route="/a"}') == [10]  # Exited workers still count
+    assert _sample(text, 'test_latency_seconds_count') == [3]
+    assert _sample(text, 'test_latency_seconds_bucket{le="0.1"}') == [1]
+    assert _sample(text, 'test_in_flight ') == [1]  # Live workers only
+    assert _sample(text, 'test_backlog ') == [40]
+    assert _sample(text, 'test_pool ') == [5]
+
+    requests.inc("/a")
+    assert _sample(metrics.REGISTRY.render(), 'test_requests_total{route="/a"}') == [11]
+
+
+def test_single_process_scrape_needs_no_directory(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    hits = metrics.counter("test_single_total", "Single process")
+    hits.inc()
+    assert _sample(metrics.REGISTRY.render(), "test_single_total ") == [1]
@@ -0,0 +1,84 @@
+"""Notification dispatcher: fed by the outbox relay, once per event, nothing lost on a failed lookup"""
+import asyncio
+import json
+
+import pytest
+
+from backend.driver_backend.services.notification_service import LogChannel, NotificationDispatcher
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.event_bus import InProcessEventBus
+from backend.shared.models import Shipment
+from backend.shared.outbox import OutboxRelay, record_shipment_status
+
+pytestmark = pytest.mark.anyio
+
+
+def _sent(path):
+    return [json.loads(line) for line in path.read_text().splitlines()] if path.exists() else []
+
+
+def _change_status(db, shipment_id, new_status):
+    shipment = db.get(Shipment, shipment_id)
+    shipment.status = new_status
+    record_shipment_status(db, shipment)
+    db.commit()
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)  # Let call_soon_threadsafe callbacks run
+
+
+async def test_each_status_change_is_sent_once_across_relays(db, seed, tmp_path):
+    path = tmp_path / "notifications.jsonl"
+    bus = InProcessEventBus()  # Shared, like Redis: every worker hears every event
+    workers = [OutboxRelay(bus=bus), OutboxRelay(bus=bus)]  # Two processes' relays, one database
+    dispatchers = [NotificationDispatcher(channels=[LogChannel(str(path))], coalesce_seconds=0) for _ in workers]
+    for relay, dispatcher in zip(workers, dispatchers):
+        dispatcher.start(relay)
+
+    _change_status(db, seed.shipment_ids[0], ShipmentStatus.PICKED_UP)
+    assert sum(relay.relay_batch() for relay in workers) == 1
+    await _settle()
+    for dispatcher in dispatchers:
+        await dispatcher.stop()
+
+    sent = _sent(path)
+    assert len(sent) == 1
+    assert sent[0]["customer_id"] == seed.customer_id
+    assert "SHP0000 is now Picked Up" in sent[0]["body"]
+
+
+async def test_redelivered_event_id_is_dropped(db, seed, tmp_path):
+    path = tmp_path / "notifications.jsonl"
+    dispatcher = NotificationDispatcher(channels=[LogChannel(str(path))], coalesce_seconds=0)
+    dispatcher.start(OutboxRelay(bus=InProcessEventBus()))
+    event = {"type": "status", "event_id": 41, "shipment_id": seed.shipment_ids[0],
+             "customer_id": seed.customer_id, "status": "DELIVERED"}
+    dispatcher._on_event(event)
+    await _settle()
+    await dispatcher.flush(force=True)
+    dispatcher._on_event(dict(event))
+    await _settle()
+    await dispatcher.stop()
+    assert len(_sent(path)) == 1
+
+
+async def test_failed_contact_lookup_keeps_notifications_pending(db, seed, tmp_path, monkeypatch):
+    path = tmp_path / "notifications.jsonl"
+    dispatcher = NotificationDispatcher(channels=[LogChannel(str(path))], coalesce_seconds=0)
+    dispatcher.start(OutboxRelay(bus=InProcessEventBus()))
+    dispatcher.submit(seed.customer_id, seed.shipment_ids[0], "IN_TRANSIT")
+    await _settle()
+
+    def database_down(due):
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(dispatcher, "_load_contacts", database_down)
+    with pytest.raises(ConnectionError):
+        await dispatcher.flush(force=True)
+    assert dispatcher.queue_depth == 1
+
+    monkeypatch.undo()
+    await dispatcher.stop()
+    assert [n["customer_id"] for n in _sent(path)] == [seed.customer_id]
@@ -0,0 +1,103 @@
+"""Outbox relay: ordering, commit-then-deliver, counted transitions and the real backlog"""
+import asyncio
+
+import pytest
+
+from backend.admin_backend.services.admin_shipment_service import AdminShipmentService
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.database import SessionLocal
+from backend.shared.event_bus import InProcessEventBus
+from backend.shared.metrics import SHIPMENT_TRANSITIONS
+from backend.shared.models import OutboxEvent, Shipment
+from backend.shared.outbox import OutboxRelay, record_shipment_status
+
+
+def _stage_events(db, shipment_id, count):
+    shipment = db.get(Shipment, shipment_id)
+    for _ in range(count):
+        record_shipment_status(db, shipment)
+    db.commit()
+
+
+def test_relay_publishes_in_order_with_event_ids(db, seed):
+    bus = InProcessEventBus()
+    received = []
+    bus.subscribe("shipment:*", lambda channel, event: received.append(event["event_id"]))
+    _stage_events(db, seed.shipment_ids[0], 3)
+    assert OutboxRelay(bus=bus).relay_batch() == 3
+    assert received == sorted(received) and len(received) == 3
+
+
+def test_consumers_run_after_the_batch_is_committed(db, seed):
+    seen = []
+
+    def consumer(event):
+        check = SessionLocal()
+        try:
+            seen.append(check.get(OutboxEvent, event["event_id"]).published_at is not None)
+        finally:
+            check.close()
+
+    relay = OutboxRelay(bus=InProcessEventBus())
+    relay.add_consumer(consumer)
+    _stage_events(db, seed.shipment_ids[0], 2)
+    assert relay.relay_batch() == 2
+    assert seen == [True, True]
+
+
+def test_transitions_are_counted_only_once_committed(db, seed):
+    def assigned():
+        return SHIPMENT_TRANSITIONS.snapshot().get((ShipmentStatus.ASSIGNED.value,), 0)
+
+    before = assigned()
+    shipment = db.get(Shipment, seed.shipment_ids[0])
+    record_shipment_status(db, shipment)
+    assert assigned() == before
+    db.rollback()
+    assert assigned() == before
+
+    record_shipment_status(db, shipment)
+    db.commit()
+    assert assigned() == before + 1
+
+
+def test_reassigning_a_driver_records_no_status_event(db, seed):
+    service = AdminShipmentService()
+    shipment_id = seed.shipment_ids[3]  # PENDING
+
+    service.assign_driver_to_shipment(shipment_id, seed.driver_id, db)
+    service.assign_driver_to_shipment(shipment_id, seed.driver_id, db)
+
+    assert db.query(OutboxEvent).filter(OutboxEvent.aggregate_id == shipment_id).count() == 1
+
+
+@pytest.mark.anyio
+async def test_backlog_counts_every_unpublished_row_not_one_batch(db, seed):
+    _stage_events(db, seed.shipment_ids[0], 25)
+    relay = OutboxRelay(bus=InProcessEventBus(), batch_size=10)
+    assert relay.count_pending() == 25
+
+    async def one_pass():
+        task = asyncio.create_task(relay.run(poll_seconds=60))
+        while relay.backlog is None and not task.done():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    await asyncio.wait_for(one_pass(), timeout=5)
+    # One full batch went out before the count: the other 15 are still pending
+    assert relay.backlog == 15
+
+
+def test_readiness_fails_on_a_large_outbox_backlog(monkeypatch):
+    from backend.shared import health
+    from backend.shared.config import settings
+    from backend.shared.outbox import outbox_relay
+
+    monkeypatch.setattr(outbox_relay, "backlog", None)
+    assert "outbox" not in health.queue_status()  # This process does not run the relay
+
+    monkeypatch.setattr(outbox_relay, "backlog", settings.HEALTH_MAX_OUTBOX_BACKLOG + 1)
+    assert health.queue_status()["outbox"]["ok"] is False
+    monkeypatch.setattr(outbox_relay, "backlog", settings.HEALTH_MAX_QUEUE_DEPTH + 1)
+    assert health.queue_status()["outbox"]["ok"] is True  # Table-wide count has its own limit
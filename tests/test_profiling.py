@@ -0,0 +1,71 @@
+"""Request profiling samples the profiled request's work, not the rest of the process"""
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.shared.config import settings
+from backend.shared.profiling import ProfileStore, ProfilingMiddleware
+
+
+def spin_in_handler(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def spin_elsewhere(stop):
+    while not stop.is_set():
+        pass
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_MS", 2.0)
+    store = ProfileStore(str(tmp_path))
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, service="tests", store=store)
+
+    @app.get("/sync")
+    def sync_handler():
+        spin_in_handler(0.3)
+        return {}
+
+    @app.get("/async")
+    async def async_handler():
+        spin_in_handler(0.3)
+        return {}
+
+    return TestClient(app), store
+
+
+@pytest.fixture
+def busy_neighbour():
+    """Another thread burning CPU, like a concurrent request would"""
+    stop = threading.Event()
+    thread = threading.Thread(target=spin_elsewhere, args=(stop,), daemon=True)
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+@pytest.mark.parametrize("path, root", [("/sync", "[thread]"), ("/async", "[event loop]")])
+def test_profile_holds_only_the_request(client, busy_neighbour, path, root):
+    http, store = client
+    response = http.get(path, headers={"X-Profile": "secret"})
+    profile = store.get(response.headers["x-profile-id"])
+
+    assert profile["scope"] == "request" and profile["samples"] > 0
+    stacks = profile["stacks"]
+    assert any("spin_in_handler" in stack and stack.startswith(root) for stack in stacks)
+    assert not any("spin_elsewhere" in stack for stack in stacks)
+
+
+def test_unselected_requests_are_not_profiled(client):
+    http, store = client
+    assert "x-profile-id" not in http.get("/sync", headers={"X-Profile": "wrong"}).headers
+    assert store.list() == []
@@ -0,0 +1,30 @@
+"""projection() and fast JSON rendering"""
+from collections import namedtuple
+from datetime import datetime
+from enum import Enum
+
+import pytest
+
+from backend.shared.serialization import dumps, enum_value, projection
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def test_projection_reads_and_converts_fields():
+    Row = namedtuple("Row", "id color name")
+    project = projection("id", "name", color=enum_value)
+
+    assert project(Row(1, Color.RED, "a")) == {"id": 1, "name": "a", "color": "red"}
+    assert project(Row(2, None, "b"))["color"] is None
+    assert project.fields == ("id", "name", "color")
+
+
+def test_projection_rejects_field_names_that_are_not_attributes():
+    with pytest.raises(ValueError):
+        projection("id", "name); import os; (x")
+
+
+def test_dumps_renders_dates_and_enums():
+    assert dumps({"at": datetime(2024, 1, 2, 3, 4, 5), "c": Color.RED}) == b'{"at":"2024-01-02T03:04:05","c":"red"}'
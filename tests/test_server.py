@@ -0,0 +1,67 @@
+"""Launcher CLI: arguments and settings turn into serve() / uvicorn.Config keyword arguments"""
+import logging
+
+import pytest
+
+from backend.shared import server
+from backend.shared.config import settings
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """main() without binding or forking: record what it would serve"""
+    calls = []
+    monkeypatch.setattr(logging, "basicConfig", lambda **kwargs: None)
+    monkeypatch.setattr(server, "serve", lambda app, **kwargs: calls.append((app, kwargs)))
+    return calls
+
+
+def test_defaults_come_from_settings(served, monkeypatch):
+    monkeypatch.setattr(settings, "WEB_WORKERS", 3)
+    server.main(["driver"])
+
+    app, kwargs = served[0]
+    assert app == "backend.driver_backend.main:app"
+    assert kwargs == {
+        "host": settings.API_HOST,
+        "port": settings.API_PORT_DRIVER,
+        "workers": 3,
+        "timeout_keep_alive": settings.WEB_KEEPALIVE_SECONDS,
+        "backlog": settings.WEB_BACKLOG,
+        "limit_concurrency": settings.WEB_LIMIT_CONCURRENCY or None,
+        "timeout_graceful_shutdown": settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+        "log_level": "info",
+    }
+
+
+def test_flags_override_settings(served):
+    server.main([
+        "gateway", "--host", "127.0.0.1", "--port", "9000", "--workers", "0", "--keep-alive", "75",
+        "--backlog", "4096", "--limit-concurrency", "200", "--graceful-timeout", "5", "--log-level", "warning"
+    ])
+
+    app, kwargs = served[0]
+    assert app == "backend.gateway.main:app"
+    assert kwargs == {
+        "host": "127.0.0.1", "port": 9000, "workers": 1,  # At least one worker
+        "timeout_keep_alive": 75, "backlog": 4096, "limit_concurrency": 200,
+        "timeout_graceful_shutdown": 5, "log_level": "warning",
+    }
+
+
+def test_zero_concurrency_limit_means_no_limit(served):
+    server.main(["user", "--limit-concurrency", "0"])
+    assert served[0][1]["limit_concurrency"] is None
+
+
+def test_an_imported_app_is_served_as_is(served):
+    app = object()
+    server.main(["admin"], app=app)
+    assert served[0][0] is app
+    assert served[0][1]["port"] == settings.API_PORT_ADMIN
+
+
+def test_unknown_target_is_refused(served):
+    with pytest.raises(SystemExit):
+        server.main(["billing"])
+    assert not served
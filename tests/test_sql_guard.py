@@ -0,0 +1,41 @@
+"""SQL statement guard (SQL_GUARD_MODE=raise in tests) and per-request DB stats"""
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.driver_backend.repositories.shipment_repository import ShipmentRepository
+from backend.shared.database import get_db
+from backend.shared.db_instrumentation import DBInstrumentationMiddleware, QueryBudgetExceeded
+from backend.shared.models import Shipment
+
+
+@pytest.fixture
+def client(db, seed):
+    app = FastAPI()
+    app.add_middleware(DBInstrumentationMiddleware, guard_mode="raise", statement_limit=1)
+
+    @app.get("/lazy")
+    def lazy(session=Depends(get_db)):
+        # A lazy load per customer: the N+1 the guard exists for
+        return [s.customer.full_name for s in session.query(Shipment).all()]
+
+    @app.get("/detail/{shipment_id}")
+    def detail(shipment_id: int, session=Depends(get_db)):
+        # LOAD_DETAIL joins the customer into the same SELECT
+        shipment = ShipmentRepository(session).get_shipment_detail(shipment_id)
+        return {"number": shipment.shipment_number, "customer": shipment.customer.full_name}
+
+    return TestClient(app)
+
+
+def test_joined_detail_stays_within_a_one_statement_budget(client, seed):
+    response = client.get(f"/detail/{seed.shipment_ids[0]}")
+    assert response.status_code == 200
+    assert response.json() == {"number": "SHP0000", "customer": "Customer"}
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+
+
+def test_n_plus_one_fails_the_request(client):
+    with pytest.raises(QueryBudgetExceeded, match="GET /lazy issued"):
+        client.get("/lazy")
+
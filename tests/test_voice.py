@@ -0,0 +1,126 @@
+"""Voice assistant on the stub provider: fallbacks, concurrency slots and the TTS cache"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.driver_backend.controllers import voice_controller
+from backend.driver_backend.services import tts_cache as tts_cache_module
+from backend.driver_backend.services import voice_assistant_service
+from backend.driver_backend.services.voice_assistant_service import VoiceAssistantService, get_voice_service
+from backend.driver_backend.services.voice_providers import ResilientVoiceProvider, StubVoiceProvider
+from backend.driver_backend.utils.enums import ShipmentStatus
+from backend.shared.config import settings
+from backend.shared.models import Shipment
+from backend.shared.utils import create_access_token
+
+
+class BrokenSpeech(StubVoiceProvider):
+    """A primary whose TTS is down"""
+
+    name = "openai"
+
+    async def stream_speech(self, text, voice="nova"):
+        raise ConnectionError("tts down")
+        yield b""
+
+
+class Primary(StubVoiceProvider):
+    name = "openai"
+
+
+@pytest.fixture
+def one_slot(monkeypatch):
+    """VOICE_MAX_CONCURRENCY=1 on a fresh semaphore"""
+    slots = asyncio.Semaphore(1)
+    monkeypatch.setattr(voice_assistant_service, "_provider_slots", slots)
+    return slots
+
+
+@pytest.fixture
+def tts_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TTS_CACHE_ENABLED", True)
+    monkeypatch.setattr(tts_cache_module.tts_cache, "directory", tmp_path)
+    return tmp_path
+
+
+async def _speak(provider, text="Pickup confirmed"):
+    response = await voice_controller._speech_response(text, "nova", None, VoiceAssistantService(provider))
+    body = b""
+    if hasattr(response, "body_iterator"):
+        async for chunk in response.body_iterator:
+            body += chunk
+    return response.headers["x-cache"], body
+
+
+@pytest.mark.anyio
+async def test_primary_speech_is_cached(tts_dir):
+    provider = ResilientVoiceProvider([Primary(), StubVoiceProvider()])
+
+    assert (await _speak(provider))[0] == "MISS"
+    assert (await _speak(provider))[0] == "HIT"
+    assert len(list(tts_dir.rglob("*.mp3"))) == 1
+
+
+@pytest.mark.anyio
+async def test_fallback_speech_is_served_but_not_cached(tts_dir):
+    provider = ResilientVoiceProvider([BrokenSpeech(), StubVoiceProvider()])
+
+    cache, body = await _speak(provider)
+    assert cache == "BYPASS" and body
+    assert list(tts_dir.rglob("*.mp3")) == []
+
+    # Once the primary is back, its own voice is what gets cached
+    healthy = ResilientVoiceProvider([Primary(), StubVoiceProvider()])
+    assert (await _speak(healthy))[0] == "MISS"
+
+
+@pytest.mark.anyio
+async def test_stub_transcribes_text_uploads():
+    service = VoiceAssistantService(StubVoiceProvider())
+    assert await service.transcribe_audio(b"Delivered SHP42", "command.txt") == "Delivered SHP42"
+
+
+@pytest.mark.anyio
+async def test_stream_holds_its_slot_until_the_last_chunk(one_slot):
+    service = VoiceAssistantService(StubVoiceProvider())
+    stream = await service.stream_speech("Pickup confirmed")
+    assert one_slot.locked()
+
+    # Another provider call waits for the stream
+    waiting = asyncio.ensure_future(service.analyze_intent("hmm, something odd"))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    chunks = [chunk async for chunk in stream]
+    assert len(chunks) == 8
+    assert (await asyncio.wait_for(waiting, 10))["source"] == "llm"
+    assert not one_slot.locked()
+
+
+@pytest.mark.anyio
+async def test_abandoned_stream_gives_its_slot_back(one_slot):
+    service = VoiceAssistantService(StubVoiceProvider())
+    stream = await service.stream_speech("Pickup confirmed")
+    await stream.aclose()  # Client went away before the body was sent
+    assert not one_slot.locked()
+
+
+def test_spoken_pickup_marks_the_shipment_picked_up(db, seed, monkeypatch):
+    monkeypatch.setattr(settings, "VOICE_PREPROCESS_ENABLED", False)
+    app = FastAPI()
+    app.include_router(voice_controller.router)
+    app.dependency_overrides[get_voice_service] = lambda: VoiceAssistantService(StubVoiceProvider())
+    token = create_access_token({"sub": "driver@example.com", "role": "driver", "id": seed.driver_id})
+
+    response = TestClient(app).post(
+        "/voice/command",
+        files={"audio_file": ("command.txt", b"Picked up SHP0001", "text/plain")},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["intent"] == "confirm_pickup"
+    db.expire_all()
+    assert db.get(Shipment, seed.shipment_ids[1]).status == ShipmentStatus.PICKED_UP
@@ -0,0 +1,166 @@
+"""ResilientVoiceProvider (failover, hedging, circuit breakers) and the ollama provider"""
+import asyncio
+import json
+import sys
+
+import pytest
+
+from backend.driver_backend.services import voice_providers
+from backend.driver_backend.services.voice_providers import (
+    OllamaVoiceProvider, ResilientVoiceProvider, StubVoiceProvider, VoiceProviderError, build_voice_provider
+)
+from backend.shared.circuit_breaker import OPEN
+from backend.shared.config import settings
+
+MESSAGES = [{"role": "user", "content": "Driver said: picked up SHP7"}]
+
+
+class Flaky(StubVoiceProvider):
+    """Fails its first `failures` chat calls, optionally slow on the first one"""
+
+    name = "openai"
+
+    def __init__(self, failures=0, first_delay=0.0):
+        super().__init__()
+        self.failures = failures
+        self.first_delay = first_delay
+
+    async def chat(self, messages, temperature=0.3):
+        call = self.calls["chat"]
+        self.calls["chat"] += 1
+        if call == 0 and self.first_delay:
+            await asyncio.sleep(self.first_delay)
+        if call < self.failures:
+            raise ConnectionError("openai down")
+        return json.dumps({"intent": "confirm_pickup", "entities": {}, "confidence": 0.9, "from": self.name})
+
+
+class FakeOllamaClient:
+    """Stands in for ollama.AsyncClient: records requests, answers like the /api/chat endpoint"""
+
+    def __init__(self):
+        self.requests = []
+
+    async def chat(self, **request):
+        self.requests.append(request)
+        return {"message": {"role": "assistant", "content": '{"intent": "confirm_pickup"}'}}
+
+
+@pytest.fixture(autouse=True)
+def fast_voice_settings(monkeypatch):
+    monkeypatch.setattr(settings, "VOICE_HEDGE_AFTER_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "VOICE_ATTEMPT_TIMEOUT_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "VOICE_BREAKER_FAILURES", 2)
+    monkeypatch.setattr(settings, "VOICE_BREAKER_RESET_SECONDS", 60.0)
+
+
+@pytest.mark.anyio
+async def test_failing_primary_falls_over_then_opens_its_circuit():
+    primary, fallback = Flaky(failures=100), StubVoiceProvider()
+    provider = ResilientVoiceProvider([primary, fallback])
+
+    for _ in range(3):
+        assert json.loads(await provider.chat(MESSAGES))["intent"] == "confirm_pickup"
+
+    assert primary.calls["chat"] == 2  # Third call skipped: circuit open
+    assert fallback.calls["chat"] == 3
+    assert provider.breakers["openai"].state == OPEN
+
+
+@pytest.mark.anyio
+async def test_slow_attempt_is_hedged(monkeypatch):
+    monkeypatch.setattr(settings, "VOICE_HEDGE_AFTER_SECONDS", 0.05)
+    primary = Flaky(first_delay=1.0)
+    provider = ResilientVoiceProvider([primary])
+
+    started = asyncio.get_running_loop().time()
+    assert json.loads(await provider.chat(MESSAGES))["from"] == "openai"
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert primary.calls["chat"] == 2
+
+
+@pytest.mark.anyio
+async def test_every_provider_down_is_a_provider_error():
+    provider = ResilientVoiceProvider([Flaky(failures=100)])
+    with pytest.raises(VoiceProviderError):
+        await provider.chat(MESSAGES)
+
+
+@pytest.mark.anyio
+async def test_ollama_answers_the_intent_prompt_as_json():
+    ollama = OllamaVoiceProvider(host="http://ollama.test", model="tiny")
+    ollama._client = FakeOllamaClient()
+
+    assert json.loads(await ollama.chat(MESSAGES, temperature=0.1)) == {"intent": "confirm_pickup"}
+    request = ollama._client.requests[0]
+    assert request["model"] == "tiny" and request["format"] == "json"
+    assert request["options"] == {"temperature": 0.1}
+    with pytest.raises(VoiceProviderError):
+        await ollama.transcribe(b"...")
+
+
+@pytest.mark.anyio
+async def test_speech_skips_ollama_without_tripping_its_breaker():
+    ollama = OllamaVoiceProvider()
+    ollama._client = FakeOllamaClient()
+    provider = ResilientVoiceProvider([ollama, StubVoiceProvider()])
+
+    for _ in range(3):
+        assert await provider.speech("Pickup confirmed")
+    assert provider.breakers["ollama"].state != OPEN
+
+
+@pytest.mark.anyio
+async def test_ollama_without_its_package_is_skipped(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ollama", None)  # import ollama -> ImportError
+    provider = ResilientVoiceProvider([OllamaVoiceProvider(), StubVoiceProvider()])
+    assert json.loads(await provider.chat(MESSAGES))["intent"] == "confirm_pickup"
+
+
+def test_provider_chain_follows_settings(monkeypatch):
+    monkeypatch.setattr(settings, "VOICE_PROVIDER", "openai")
+    monkeypatch.setattr(settings, "VOICE_FALLBACK_PROVIDERS", "ollama, stub, ollama")
+    chain = build_voice_provider()
+    assert [p.name for p in chain.providers] == ["openai", "ollama", "stub"]
+    assert chain.name == "openai"
+
+    monkeypatch.setattr(settings, "VOICE_FALLBACK_PROVIDERS", "")
+    assert isinstance(build_voice_provider(), voice_providers.OpenAIVoiceProvider)
+
+
+@pytest.mark.anyio
+async def test_unsupported_half_open_trial_releases_the_breaker():
+    ollama = OllamaVoiceProvider()
+    ollama._client = FakeOllamaClient()
+    provider = ResilientVoiceProvider([ollama, StubVoiceProvider()])
+    breaker = provider.breakers["ollama"]
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker._opened_at -= settings.VOICE_BREAKER_RESET_SECONDS  # Reset window over: next call is the trial
+
+    assert await provider.speech("Pickup confirmed")  # Trial: ollama has no TTS, the stub answers
+    assert breaker.state == "closed"
+    assert json.loads(await provider.chat(MESSAGES)) == {"intent": "confirm_pickup"}  # Ollama is called again
+    assert len(ollama._client.requests) == 1
+
+
+@pytest.mark.anyio
+async def test_cancelled_call_counts_against_the_provider_it_cancelled(monkeypatch):
+    entered = asyncio.Event()
+
+    class Hanging(StubVoiceProvider):
+        name = "openai"
+
+        async def chat(self, messages, temperature=0.3):
+            entered.set()
+            await asyncio.sleep(10)
+
+    monkeypatch.setitem(sys.modules, "ollama", None)  # Ollama is "not configured": VoiceProviderError
+    provider = ResilientVoiceProvider([OllamaVoiceProvider(), Hanging()])
+    call = asyncio.ensure_future(provider.chat(MESSAGES))  # Ollama unavailable, then openai hangs
+    await asyncio.wait_for(entered.wait(), 5)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    assert provider.breakers["openai"]._failures == 1
+    assert provider.breakers["ollama"]._failures == 0